@@ -1,21 +1,24 @@
 import asyncio
 import os
 import sys
+import time
+
+_import_started = time.perf_counter()
 
 if __name__ == "__main__" and "." not in sys.path:
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from contextlib import asynccontextmanager
 
-from alembic import command
-from alembic.config import Config
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
+from backend.database import DATABASE_DIR, DATABASE_URL, engine
 from backend.exceptions.directory_exception import (
     DirectoryAccessDenied,
     DirectoryNotFound,
 )
+from backend.exceptions.job_exception import JobTraceNotFound
 from backend.exceptions.preset_rule_exception import (
     PresetRuleAlreadyExists,
     PresetRuleNotFound,
@@ -25,34 +28,94 @@ from backend.exceptions.tag_exception import (
     TagAlreadyExists,
     TagNotFound,
 )
-from backend.exceptions.task_exception import TaskAlreadyExists, TaskNotFound
-from backend.middlewares import setup_cors, setup_gzip
+from backend.exceptions.task_exception import (
+    InvalidTaskInclude,
+    TaskAlreadyExists,
+    TaskNotFound,
+)
+from backend.middlewares import setup_cors, setup_gzip, setup_profiling
 from backend.routers import (
+    backlog,
     directory,
+    events,
+    job,
     log,
+    metrics,
+    plan,
     preset_rule,
     preview,
+    profiling,
     setting,
     tag,
     task,
     webhook,
 )
+from backend.utils.env_config import (
+    get_backlog_scan_on_startup,
+    get_profiling_enabled,
+    get_watcher_enabled,
+)
 from backend.utils.logger import logger
+from backend.utils.migration import is_schema_at_head
+from backend.utils.process_lock import ProcessLock
+from backend.worker.backlog import start_backlog_scan_thread
+from backend.worker.dedup import webhook_deduplicator
+from backend.worker.job_queue import download_queue
 
 from . import __version__
 
 
-def _run_alembic_upgrade():
-    """同步執行 Alembic 遷移"""
-    alembic_cfg = Config("alembic.ini")
-    command.upgrade(alembic_cfg, "head")
+migration_lock = ProcessLock(DATABASE_DIR / ".migration.lock")
+background_lock = ProcessLock(DATABASE_DIR / ".background.lock")
+
+
+def _run_alembic_upgrade() -> bool:
+    """同步執行 Alembic 遷移，回傳是否實際呼叫了 Alembic。
+
+    結構已是最新版本時直接略過，不載入 Alembic；
+    多個 worker 行程同時啟動時依序取得鎖，取得鎖後再檢查一次，只有第一個會實際遷移。
+    """
+    if is_schema_at_head(engine):
+        return False
+    with migration_lock:
+        if is_schema_at_head(engine):
+            return False
+        from alembic import command
+        from alembic.config import Config
+
+        alembic_cfg = Config("alembic.ini")
+        # 遷移與應用程式使用同一個資料庫（SQLITE_PATH）
+        alembic_cfg.set_main_option("sqlalchemy.url", DATABASE_URL)
+        command.upgrade(alembic_cfg, "head")
+        return True
+
+
+def start_background_jobs():
+    """僅由取得背景鎖的行程啟動檔案監看與積壓掃描，回傳啟動的監看器。
+
+    Why: 多 worker 部署時每個行程都會執行 lifespan，
+    若每個行程都監看來源目錄，同一個檔案會被分派多次。
+    """
+    if not background_lock.acquire(blocking=False):
+        logger.info("其他行程已負責檔案監看與積壓掃描，本行程僅處理 API 請求")
+        return None
+    if get_backlog_scan_on_startup():
+        start_backlog_scan_thread()
+    if not get_watcher_enabled():
+        return None
+    # 監看器依賴 ctypes，未啟用時不載入
+    from backend.worker.watcher import start_source_watcher
+
+    return start_source_watcher()
 
 
 async def run_migrations():
     try:
-        logger.info("開始資料庫遷移...")
-        await asyncio.to_thread(_run_alembic_upgrade)
-        logger.info("資料庫遷移完成")
+        upgraded = await asyncio.to_thread(_run_alembic_upgrade)
+        if upgraded:
+            logger.info("資料庫遷移完成")
+        else:
+            logger.info("資料庫結構已是最新版本，略過遷移")
     except Exception as e:
         logger.info(f"遷移失敗: {e}")
         raise
@@ -61,10 +124,27 @@ async def run_migrations():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Load
+    timings: dict[str, float] = {"應用程式載入": time.perf_counter() - _import_started}
+    started = time.perf_counter()
     await run_migrations()
+    timings["資料庫遷移"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await asyncio.to_thread(webhook_deduplicator.load)
+    timings["去重紀錄"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    watcher = start_background_jobs()
+    timings["背景工作"] = time.perf_counter() - started
+
+    breakdown = "、".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in timings.items())
+    logger.info(f"啟動完成：{breakdown}")
     yield
     # Clean up
-    pass
+    if watcher is not None:
+        watcher.stop()
+    download_queue.stop()
+    background_lock.release()
 
 
 app = FastAPI(
@@ -89,6 +169,11 @@ async def task_already_exists_handler(request: Request, exc: TaskAlreadyExists):
     return JSONResponse(status_code=409, content={"detail": str(exc)})
 
 
+@app.exception_handler(InvalidTaskInclude)
+async def invalid_task_include_handler(request: Request, exc: InvalidTaskInclude):
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
+
+
 @app.exception_handler(TagNotFound)
 async def tag_not_found_handler(request: Request, exc: TagNotFound):
     return JSONResponse(status_code=404, content={"detail": str(exc)})
@@ -114,6 +199,11 @@ async def directory_access_denied_handler(request: Request, exc: DirectoryAccess
     return JSONResponse(status_code=403, content={"detail": str(exc)})
 
 
+@app.exception_handler(JobTraceNotFound)
+async def job_trace_not_found_handler(request: Request, exc: JobTraceNotFound):
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+
 @app.exception_handler(PresetRuleNotFound)
 async def preset_rule_not_found_handler(request: Request, exc: PresetRuleNotFound):
     return JSONResponse(status_code=404, content={"detail": str(exc)})
@@ -129,6 +219,8 @@ async def preset_rule_already_exists_handler(
 # Middlewares
 setup_cors(app)
 setup_gzip(app)
+if get_profiling_enabled():
+    setup_profiling(app)
 
 
 app.include_router(task.router)
@@ -136,9 +228,16 @@ app.include_router(tag.router)
 app.include_router(preset_rule.router)
 app.include_router(setting.router)
 app.include_router(log.router)
+app.include_router(events.router)
+app.include_router(job.router)
 app.include_router(preview.router)
+app.include_router(plan.router)
 app.include_router(webhook.router)
 app.include_router(directory.router)
+app.include_router(backlog.router)
+app.include_router(metrics.router)
+if get_profiling_enabled():
+    app.include_router(profiling.router)
 
 if __name__ == "__main__":
     import uvicorn
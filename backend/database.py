@@ -1,14 +1,23 @@
 import os
+from pathlib import Path
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from backend.utils.metrics import DB_POOL_CHECKOUTS, registry
+
 sqlite_path = os.getenv("SQLITE_PATH", "./database/database.db")
 
 DATABASE_URL = f"sqlite:///{sqlite_path}"
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# 跨行程鎖定檔與資料庫放在同一目錄，讓共用同一資料庫的 worker 行程互相協調
+DATABASE_DIR = Path(sqlite_path).resolve().parent
+
+# 多個 worker 行程共用同一個資料庫檔案，寫入衝突時等待而非立即失敗
+engine = create_engine(
+    DATABASE_URL, connect_args={"check_same_thread": False, "timeout": 30}
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -17,4 +26,21 @@ Base = declarative_base()
 # 監聽資料庫連線事件，並啟用外鍵約束
 @event.listens_for(Engine, "connect")
 def _fk_pragma_on_connect(dbapi_con, con_record):
-    dbapi_con.execute("PRAGMA foreign_keys=ON")
\ No newline at end of file
+    dbapi_con.execute("PRAGMA foreign_keys=ON")
+
+
+# WAL 模式讓讀取不會被其他行程的寫入阻擋，適合多 worker 行程部署
+@event.listens_for(engine, "connect")
+def _wal_pragma_on_connect(dbapi_con, con_record):
+    dbapi_con.execute("PRAGMA journal_mode=WAL")
+
+
+@event.listens_for(engine, "checkout")
+def _count_pool_checkout(dbapi_con, con_record, con_proxy):
+    DB_POOL_CHECKOUTS.inc()
+
+
+# 已取出未歸還的連線數；工作結束後應回到 0，持續上升代表有 session 未關閉
+registry.gauge(
+    "movera_db_pool_checked_out", "目前自連線池取出未歸還的連線數", lambda: engine.pool.checkedout()
+)
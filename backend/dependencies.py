@@ -4,13 +4,16 @@ from fastapi import Depends
 from sqlalchemy.orm import Session
 
 from backend.database import SessionLocal
+from backend.repositories.job_trace import JobTraceRepository
 from backend.repositories.log import LogRepository
 from backend.repositories.preset_rule import PresetRuleRepository
 from backend.repositories.setting import SettingRepository
 from backend.repositories.tag import TagRepository
 from backend.repositories.task import TaskRepository
+from backend.services.job_trace_service import JobTraceService
 from backend.services.log_service import LogService
 from backend.services.directory_service import DirectoryService
+from backend.services.planner_service import PlannerService
 from backend.services.preset_rule_service import PresetRuleService
 from backend.services.preview_service import ParsePreviewService, RegexPreviewService
 from backend.services.setting_service import SettingService
@@ -65,6 +68,14 @@ def depends_directory_service(
     return DirectoryService(setting_service=setting_service)
 
 
+def depends_planner_service(
+    task_service: TaskService = Depends(depends_task_service),
+    setting_service: SettingService = Depends(depends_setting_service),
+) -> PlannerService:
+    """Dependency to get a PlannerService instance."""
+    return PlannerService(task_service=task_service, setting_service=setting_service)
+
+
 def depends_parse_preview_service() -> ParsePreviewService:
     """Dependency to get a ParsePreviewService instance."""
     return ParsePreviewService()
@@ -115,3 +126,17 @@ def depends_log_service(
 ) -> LogService:
     """Dependency to get a LogService instance."""
     return LogService(repository=repository)
+
+
+def depends_job_trace_repository(
+    db: Session = Depends(get_db),
+) -> JobTraceRepository:
+    """Dependency to get a JobTraceRepository instance."""
+    return JobTraceRepository(db=db)
+
+
+def depends_job_trace_service(
+    repository: JobTraceRepository = Depends(depends_job_trace_repository),
+) -> JobTraceService:
+    """Dependency to get a JobTraceService instance."""
+    return JobTraceService(repository=repository)
@@ -0,0 +1,6 @@
+class JobTraceNotFound(Exception):
+    """工作的階段追蹤不存在（未被取樣或 id 錯誤）時引發的例外。"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        super().__init__(f"Job trace Id: '{job_id}' not found")
@@ -16,3 +16,14 @@ class TaskNotFound(Exception):
     def __init__(self, task_id: str):
         self.task_id = task_id
         super().__init__(f"Task Id: '{task_id}' not found")
+
+
+class InvalidTaskInclude(Exception):
+    """
+    任務套用更新後的 include 無法編譯時引發的例外。
+    """
+
+    def __init__(self, task_id: str, reason: str):
+        self.task_id = task_id
+        self.reason = reason
+        super().__init__(f"Task Id: '{task_id}' has invalid include: {reason}")
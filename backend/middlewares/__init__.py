@@ -1,2 +1,3 @@
 from .cors import setup_cors
-from .gzip import setup_gzip
\ No newline at end of file
+from .gzip import setup_gzip
+from .profiling import setup_profiling
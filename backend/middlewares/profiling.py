@@ -0,0 +1,36 @@
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.utils.profiler import profiler
+
+PROFILING_PATH = "/api/v1/admin/profiling"
+
+
+class ProfilingMiddleware:
+    """剖析 HTTP 請求；只有以 target=requests 開始剖析時才有作用。
+
+    Why: 以純 ASGI 中介軟體實作，未剖析時只多一次屬性檢查，
+    也不會像 BaseHTTPMiddleware 一樣改變串流回應（SSE）的行為。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # 開關剖析的請求本身不計入
+        if (
+            scope["type"] != "http"
+            or profiler.session is None
+            or scope["path"] == PROFILING_PATH
+        ):
+            await self.app(scope, receive, send)
+            return
+        with profiler.profile("requests", f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send)
+
+
+def setup_profiling(app: FastAPI):
+    """
+    設定 FastAPI 應用程式的請求剖析中介軟體。
+    """
+    app.add_middleware(ProfilingMiddleware)
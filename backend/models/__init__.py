@@ -1,6 +1,10 @@
 # api/models/__init__.py
+from .backlog_scan_state import BacklogScanState
+from .cache_version import CacheVersion
+from .job_trace import JobTrace
 from .log import Log
 from .preset_rule import PresetRule
+from .processed_path import ProcessedPath
 from .setting import Setting
 from .tag import Tag, task_tags
 from .task import Task
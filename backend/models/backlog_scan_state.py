@@ -0,0 +1,42 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from backend.database import Base
+
+
+class BacklogScanState(Base):
+    __tablename__ = "backlog_scan_state"
+
+    name = Column(
+        String,
+        primary_key=True,
+        comment="掃描狀態名稱",
+    )
+    watermark_mtime_ns = Column(
+        Integer,
+        nullable=False,
+        comment="水位線的修改時間（奈秒）",
+    )
+    watermark_inode = Column(
+        Integer,
+        nullable=False,
+        comment="水位線的 inode",
+    )
+    fingerprint = Column(
+        String,
+        nullable=False,
+        comment="產生水位線時啟用任務與來源目錄的指紋，兩者變更後水位線失效",
+    )
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+        comment="最後更新時間",
+    )
+
+    def __repr__(self):
+        return (
+            f"<BacklogScanState(name={self.name}, "
+            f"watermark=({self.watermark_mtime_ns}, {self.watermark_inode}))>"
+        )
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String
+
+from backend.database import Base
+
+
+class CacheVersion(Base):
+    __tablename__ = "cache_version"
+
+    name = Column(
+        String,
+        primary_key=True,
+        comment="快取名稱（例如 setting）",
+    )
+    version = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="每次相關資料寫入時遞增的版本號",
+    )
+
+    def __repr__(self):
+        return f"<CacheVersion(name={self.name}, version={self.version})>"
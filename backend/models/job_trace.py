@@ -0,0 +1,49 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, String
+
+from backend.database import Base
+
+
+class JobTrace(Base):
+    __tablename__ = "job_trace"
+
+    id = Column(
+        String,
+        primary_key=True,
+        comment="工作的 trace id",
+    )
+    task_id = Column(
+        String,
+        ForeignKey("task.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+        comment="匹配的任務 ID，未匹配任何任務時為空",
+    )
+    filepath = Column(
+        String,
+        nullable=False,
+        comment="工作處理的檔案路徑",
+    )
+    status = Column(
+        String,
+        nullable=False,
+        comment="工作結果（skipped／completed／failed）",
+    )
+    started_at = Column(
+        DateTime,
+        nullable=False,
+        index=True,
+        comment="工作開始時間",
+    )
+    duration_ms = Column(
+        Float,
+        nullable=False,
+        comment="工作總耗時（毫秒）",
+    )
+    spans = Column(
+        String,
+        nullable=False,
+        comment="以 JSON 陣列儲存的 [名稱, 起點毫秒, 耗時毫秒] 時間區段",
+    )
+
+    def __repr__(self):
+        return f"<JobTrace(id={self.id}, status={self.status}, duration_ms={self.duration_ms})>"
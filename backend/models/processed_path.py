@@ -0,0 +1,37 @@
+from sqlalchemy import Column, DateTime, Integer, String
+
+from backend.database import Base
+
+
+class ProcessedPath(Base):
+    __tablename__ = "processed_path"
+
+    filepath = Column(
+        String,
+        primary_key=True,
+        comment="已接受處理的下載路徑",
+    )
+    size = Column(
+        Integer,
+        nullable=True,
+        comment="接受當下的檔案大小",
+    )
+    mtime_ns = Column(
+        Integer,
+        nullable=True,
+        comment="接受當下的修改時間（奈秒）",
+    )
+    inode = Column(
+        Integer,
+        nullable=True,
+        comment="接受當下的 inode",
+    )
+    expires_at = Column(
+        DateTime,
+        nullable=False,
+        index=True,
+        comment="去重紀錄的到期時間",
+    )
+
+    def __repr__(self):
+        return f"<ProcessedPath(filepath={self.filepath}, expires_at={self.expires_at})>"
@@ -2,7 +2,7 @@
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Table, func
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Table, func
 
 from backend.database import Base
 
@@ -19,6 +19,8 @@ task_tags = Table(
         server_default=func.now(),
         comment="標籤加入任務的時刻",
     ),
+    # 主鍵 (task_id, tag_id) 無法依標籤反查任務；此索引涵蓋依標籤篩選任務與各標籤計數的查詢
+    Index("ix_task_tags_tag_id_task_id", "tag_id", "task_id"),
 )
 
 
@@ -1,7 +1,7 @@
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from backend.models.tag import task_tags
@@ -11,6 +11,8 @@ from backend.database import Base
 
 class Task(Base):
     __tablename__ = "task"
+    # Worker 每次比對都以「啟用中、依優先順序排列」查詢任務
+    __table_args__ = (Index("ix_task_enabled_priority", "enabled", "priority"),)
 
     id = Column(
         String,
@@ -30,6 +32,24 @@ class Task(Base):
         String,
         nullable=False,
     )
+    include_type = Column(
+        String,
+        default="substring",
+        nullable=False,
+        comment="include 的比對方式：substring、regex 或 glob",
+    )
+    match_categories = Column(
+        String,
+        nullable=True,
+        default=None,
+        comment="限定的下載器類別，以逗號分隔",
+    )
+    match_tags = Column(
+        String,
+        nullable=True,
+        default=None,
+        comment="需要的下載器標籤，以逗號分隔",
+    )
     move_to = Column(
         String,
         nullable=False,
@@ -76,6 +96,12 @@ class Task(Base):
         nullable=False,
         comment="是否啟用",
     )
+    priority = Column(
+        Integer,
+        default=0,
+        nullable=False,
+        comment="比對優先順序，數字越大越先比對",
+    )
     created_at = Column(
         DateTime,
         nullable=False,
@@ -0,0 +1,33 @@
+from datetime import UTC, datetime
+
+from sqlalchemy.orm import Session
+
+from backend import models
+
+# 目前只有一組來源目錄，全部掃描共用同一列狀態
+DEFAULT_STATE_NAME = "default"
+
+
+class BacklogScanStateRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, name: str = DEFAULT_STATE_NAME) -> models.BacklogScanState | None:
+        return self.db.get(models.BacklogScanState, name)
+
+    def save(
+        self,
+        watermark: tuple[int, int],
+        fingerprint: str,
+        name: str = DEFAULT_STATE_NAME,
+    ) -> models.BacklogScanState:
+        """寫入水位線與對應的指紋，資料列不存在時建立。"""
+        state = self.get(name)
+        if state is None:
+            state = models.BacklogScanState(name=name)
+            self.db.add(state)
+        state.watermark_mtime_ns, state.watermark_inode = watermark
+        state.fingerprint = fingerprint
+        state.updated_at = datetime.now(UTC)
+        self.db.commit()
+        return state
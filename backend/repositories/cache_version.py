@@ -0,0 +1,38 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from backend import models
+
+
+def bump_cache_version(connection: Connection | Session, name: str) -> None:
+    """在目前的交易中遞增 *name* 的版本號，資料列不存在時建立。
+
+    Why: 版本號與資料寫入在同一個交易中提交，
+    其他行程讀到新資料時必定也會讀到新的版本號。
+    """
+    table = models.CacheVersion.__table__
+    stmt = insert(table).values(name=name, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.name],
+        set_={"version": table.c.version + 1},
+    )
+    connection.execute(stmt)
+
+
+class CacheVersionRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, name: str) -> int:
+        """取得 *name* 目前的版本號，從未寫入過時為 0。"""
+        version = self.db.execute(
+            select(models.CacheVersion.version).where(models.CacheVersion.name == name)
+        ).scalar_one_or_none()
+        return version or 0
+
+    def bump(self, name: str) -> None:
+        """遞增版本號並提交。"""
+        bump_cache_version(self.db, name)
+        self.db.commit()
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from backend import models
+
+
+class JobTraceRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, job_id: str) -> models.JobTrace | None:
+        return self.db.get(models.JobTrace, job_id)
+
+    def create(
+        self, trace: models.JobTrace, prune_before: datetime | None = None
+    ) -> models.JobTrace:
+        """新增一筆追蹤；提供 prune_before 時在同一個交易中刪除更早開始的追蹤。"""
+        if prune_before is not None:
+            self.db.execute(
+                delete(models.JobTrace).where(models.JobTrace.started_at < prune_before)
+            )
+        self.db.add(trace)
+        self.db.commit()
+        return trace
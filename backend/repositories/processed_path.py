@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from sqlalchemy import delete, or_
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from backend import models
+
+
+class ProcessedPathRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_active(self, now: datetime) -> list[models.ProcessedPath]:
+        """取得尚未到期的去重紀錄。"""
+        return (
+            self.db.query(models.ProcessedPath)
+            .filter(models.ProcessedPath.expires_at > now)
+            .all()
+        )
+
+    def try_claim(
+        self,
+        filepath: str,
+        fingerprint: tuple[int, int, int] | None,
+        now: datetime,
+        expires_at: datetime,
+    ) -> bool:
+        """以單一 upsert 原子地認領 filepath，回傳是否由本次呼叫取得。
+
+        既有紀錄已到期，或目前指紋與紀錄不同（同路徑的新檔案）時覆寫並視為取得；
+        否則不修改資料列並回傳 False。
+
+        Why: 多個 worker 行程可能同時收到同一個事件，
+        判定與寫入必須在同一個陳述式中完成，才能保證只有一個行程處理。
+        每次認領在同一個交易中先刪除已到期的紀錄，長時間執行時資料表只保留 TTL 內的路徑。
+        """
+        self.db.execute(
+            delete(models.ProcessedPath).where(models.ProcessedPath.expires_at <= now)
+        )
+        size, mtime_ns, inode = fingerprint if fingerprint is not None else (None, None, None)
+        table = models.ProcessedPath.__table__
+        stmt = insert(table).values(
+            filepath=filepath,
+            size=size,
+            mtime_ns=mtime_ns,
+            inode=inode,
+            expires_at=expires_at,
+        )
+        reclaimable = table.c.expires_at <= now
+        if fingerprint is not None:
+            reclaimable = or_(
+                reclaimable,
+                table.c.size.is_distinct_from(stmt.excluded.size),
+                table.c.mtime_ns.is_distinct_from(stmt.excluded.mtime_ns),
+                table.c.inode.is_distinct_from(stmt.excluded.inode),
+            )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.filepath],
+            set_={
+                "size": stmt.excluded.size,
+                "mtime_ns": stmt.excluded.mtime_ns,
+                "inode": stmt.excluded.inode,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=reclaimable,
+        )
+        claimed = self.db.execute(stmt).rowcount == 1
+        self.db.commit()
+        return claimed
+
+    def delete_expired(self, now: datetime) -> int:
+        """刪除已到期的去重紀錄，回傳刪除筆數。"""
+        deleted = (
+            self.db.query(models.ProcessedPath)
+            .filter(models.ProcessedPath.expires_at <= now)
+            .delete(synchronize_session=False)
+        )
+        self.db.commit()
+        return deleted
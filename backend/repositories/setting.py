@@ -1,14 +1,31 @@
 from typing import List, Optional
 
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from backend import models
+from backend.repositories.cache_version import CacheVersionRepository, bump_cache_version
+
+# setting 表在 cache_version 中的名稱
+SETTING_CACHE_NAME = "setting"
+
+
+@event.listens_for(models.Setting, "after_insert")
+@event.listens_for(models.Setting, "after_update")
+@event.listens_for(models.Setting, "after_delete")
+def _bump_setting_version(mapper, connection, target) -> None:
+    """任何 Setting 寫入都在同一交易中遞增版本號，讓各行程的設定快照失效。"""
+    bump_cache_version(connection, SETTING_CACHE_NAME)
 
 
 class SettingRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def get_version(self) -> int:
+        """取得設定目前的版本號，用於判斷設定快照是否仍有效。"""
+        return CacheVersionRepository(self.db).get(SETTING_CACHE_NAME)
+
     def get_all(self) -> List[models.Setting]:
         """
         獲取所有設定項目。
@@ -1,3 +1,4 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from backend import models
@@ -17,6 +18,17 @@ class TagRepository:
     def get_all(self) -> list[models.Tag]:
         return self.db.query(models.Tag).order_by(models.Tag.created_at.asc()).all()
 
+    def get_task_counts(self) -> list[tuple[str, int]]:
+        """以單一彙總查詢取得每個標籤的任務數，沒有任務的標籤為 0。"""
+        rows = (
+            self.db.query(models.Tag.id, func.count(models.task_tags.c.task_id))
+            .outerjoin(models.task_tags, models.task_tags.c.tag_id == models.Tag.id)
+            .group_by(models.Tag.id)
+            .order_by(models.Tag.created_at.asc())
+            .all()
+        )
+        return [(tag_id, count) for tag_id, count in rows]
+
     def create(self, tag: TagCreate) -> models.Tag:
         db_tag = models.Tag(**tag.model_dump())
         self.db.add(db_tag)
@@ -1,17 +1,33 @@
-from typing import Sequence
+from typing import Literal, Sequence
 
-from sqlalchemy import func
+from sqlalchemy import event, func, select
 from sqlalchemy.orm import Session
 
 from backend import models
 from backend.exceptions.task_exception import TaskAlreadyExists, TaskNotFound
+from backend.repositories.cache_version import CacheVersionRepository, bump_cache_version
 from backend.schemas import Task, TaskBatchUpdateItem, TaskCreate, TaskStats, TaskUpdate
 
+# task 表在 cache_version 中的名稱
+TASK_CACHE_NAME = "task"
+
+
+@event.listens_for(models.Task, "after_insert")
+@event.listens_for(models.Task, "after_update")
+@event.listens_for(models.Task, "after_delete")
+def _bump_task_version(mapper, connection, target) -> None:
+    """任何 Task 寫入都在同一交易中遞增版本號，讓各行程快取的任務比對器失效。"""
+    bump_cache_version(connection, TASK_CACHE_NAME)
+
 
 class TaskRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def get_version(self) -> int:
+        """取得任務目前的版本號，用於判斷快取的任務比對器是否仍有效。"""
+        return CacheVersionRepository(self.db).get(TASK_CACHE_NAME)
+
     def get_by_id(self, task_id: str) -> models.Task | None:
         """取得指定 id 的任務
 
@@ -23,6 +39,19 @@ class TaskRepository:
         """
         return self.db.query(models.Task).filter(models.Task.id == task_id).first()
 
+    def get_by_ids(self, task_ids: list[str]) -> list[models.Task]:
+        """取得多個指定 id 的任務（不存在的 id 會被略過）
+
+        Args:
+            task_ids (list[str]): 任務的 id 清單
+
+        Returns:
+            list[models.Task]: 找到的任務清單
+        """
+        if not task_ids:
+            return []
+        return self.db.query(models.Task).filter(models.Task.id.in_(task_ids)).all()
+
     def get_by_name(self, name: str) -> models.Task | None:
         """取得指定名稱的任務
 
@@ -34,13 +63,35 @@ class TaskRepository:
         """
         return self.db.query(models.Task).filter(models.Task.name == name).first()
 
-    def get_all(self) -> list[models.Task]:
-        """取得所有任務
+    def get_all(
+        self,
+        tag_ids: list[str] | None = None,
+        tag_match: Literal["any", "all"] = "any",
+    ) -> list[models.Task]:
+        """取得所有任務，可依標籤篩選
+
+        Why: 篩選在資料庫中以 task_tags 的 (tag_id, task_id) 索引完成，
+        不必下載全部任務與標籤再由瀏覽器過濾。
+
+        Args:
+            tag_ids (list[str] | None): 篩選的標籤 id，未提供時回傳全部任務
+            tag_match (str): any 為包含任一標籤，all 為包含全部標籤
 
         Returns:
-            list[models.Task]: 所有任務清單
+            list[models.Task]: 任務清單
         """
-        return self.db.query(models.Task).all()
+        query = self.db.query(models.Task)
+        if tag_ids:
+            tag_ids = list(dict.fromkeys(tag_ids))
+            matched = select(models.task_tags.c.task_id).where(
+                models.task_tags.c.tag_id.in_(tag_ids)
+            )
+            if tag_match == "all":
+                matched = matched.group_by(models.task_tags.c.task_id).having(
+                    func.count(models.task_tags.c.tag_id) == len(tag_ids)
+                )
+            query = query.filter(models.Task.id.in_(matched))
+        return query.all()
 
     def create(self, task: TaskCreate) -> models.Task:
         """新增一個任務
@@ -119,12 +170,20 @@ class TaskRepository:
         return stats
 
     def get_enabled_tasks(self) -> list[Task]:
-        """取得所有已啟用的任務
+        """取得所有已啟用的任務，依比對優先順序排列
+
+        Why: 未指定排序時 SQLite 的回傳順序不固定，include 重疊的任務比對結果會不一致；
+        同優先順序再依名稱排序，讓順序完全確定。
 
         Returns:
             list[schemas.Task]: 已啟用的任務清單
         """
-        return self.db.query(models.Task).filter(models.Task.enabled.is_(True)).all()
+        return (
+            self.db.query(models.Task)
+            .filter(models.Task.enabled.is_(True))
+            .order_by(models.Task.priority.desc(), models.Task.name)
+            .all()
+        )
 
     # --- Batch operations ---
 
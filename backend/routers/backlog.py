@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from backend.worker.backlog import (
+    get_last_backlog_scan_result,
+    is_backlog_scan_running,
+    start_backlog_scan_thread,
+)
+
+router = APIRouter(prefix="/api/v1", tags=["Backlog"])
+
+
+@router.post(
+    "/backlog/scan",
+    status_code=202,
+    summary="觸發積壓檔案掃描",
+    response_description="掃描已在背景開始",
+)
+def trigger_backlog_scan(
+    full: bool = Query(False, description="忽略掃描水位線，重新掃描所有檔案"),
+):
+    """
+    掃描允許的來源目錄中已存在的檔案，並將符合任務的檔案交給 Worker 處理。
+
+    掃描在背景執行，同一時間只允許一次掃描；進行中時回傳 409。
+    """
+    if is_backlog_scan_running():
+        raise HTTPException(status_code=409, detail="積壓掃描已在執行中")
+    start_backlog_scan_thread(full=full)
+    return {"status": "accepted", "full": full}
+
+
+@router.get(
+    "/backlog/status",
+    summary="取得積壓掃描狀態",
+)
+def get_backlog_scan_status():
+    """回傳掃描是否進行中，以及最近一次完成的掃描統計。"""
+    return {
+        "running": is_backlog_scan_running(),
+        "last_result": get_last_backlog_scan_result(),
+    }
@@ -8,6 +8,9 @@ from backend.services.directory_service import DirectoryService
 
 router = APIRouter(prefix="/api/v1", tags=["Directories"])
 
+# 單頁最多可要求的目錄數
+DIRECTORY_PAGE_MAX_LIMIT = 1000
+
 
 @router.get(
     "/directories",
@@ -17,12 +20,18 @@ router = APIRouter(prefix="/api/v1", tags=["Directories"])
 )
 def list_directories(
     path: Optional[str] = Query(None, description="要瀏覽的目錄路徑，未提供時回傳允許的根目錄"),
+    q: Optional[str] = Query(None, max_length=255, description="以不分大小寫的子字串過濾目錄名稱"),
+    cursor: Optional[str] = Query(None, description="上一頁回應中的 next_cursor"),
+    limit: Optional[int] = Query(
+        None, ge=1, le=DIRECTORY_PAGE_MAX_LIMIT, description="每頁數量，未提供時回傳全部"
+    ),
     service: DirectoryService = Depends(depends_directory_service),
 ):
     """
     瀏覽伺服器上的目錄結構。
 
     僅回傳後端設定中允許的目錄範圍內的子目錄。
+    提供 `limit` 時分頁回傳，並以 `next_cursor` 取得下一頁。
     """
-    directories = service.list_directories(path)
-    return schemas.DirectoryListResponse(directories=directories)
+    page = service.list_directories_page(path, q=q, cursor=cursor, limit=limit)
+    return schemas.DirectoryListResponse(**page)
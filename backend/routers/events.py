@@ -0,0 +1,85 @@
+import asyncio
+import json
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from backend.utils.event_bus import Subscription, event_bus
+
+router = APIRouter(prefix="/api/v1", tags=["Events"])
+
+# SSE 在沒有事件時送出註解行的間隔秒數，避免反向代理因閒置而中斷連線
+SSE_HEARTBEAT_SECONDS = 15.0
+
+
+async def _sse_stream(
+    subscription: Subscription, heartbeat: float = SSE_HEARTBEAT_SECONDS
+) -> AsyncIterator[str]:
+    """將訂閱者收到的事件轉為 SSE 格式；連線中斷時由框架取消並移除訂閱。"""
+    try:
+        while True:
+            event = await subscription.get(timeout=heartbeat)
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            data = json.dumps(event, ensure_ascii=False)
+            yield f"event: {event['event']}\ndata: {data}\n\n"
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+@router.get(
+    "/events/stream",
+    summary="以 SSE 即時接收任務日誌與工作事件",
+    response_class=StreamingResponse,
+)
+async def stream_events(
+    task_id: str | None = Query(None, description="只接收此任務的事件"),
+):
+    """
+    以 Server-Sent Events 推送事件，取代輪詢 `GET /tasks/{task_id}/logs`。
+
+    事件類型：
+    - `log`: 新增的任務日誌
+    - `job`: 工作狀態變化（started／skipped／completed／failed）
+    - `overflow`: 客戶端消化過慢，已有事件被捨棄，應重新以 REST API 同步
+    """
+    subscription = event_bus.subscribe(task_id=task_id)
+    return StreamingResponse(
+        _sse_stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """持續讀取客戶端訊息，直到連線關閉。"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@router.websocket("/events/ws")
+async def websocket_events(websocket: WebSocket, task_id: str | None = None):
+    """以 WebSocket 推送與 SSE 相同的事件，可用 `?task_id=` 只接收單一任務的事件。"""
+    # 先訂閱再完成握手，確保客戶端連線建立後發布的事件不會遺漏
+    subscription = event_bus.subscribe(task_id=task_id)
+    await websocket.accept()
+    receiver = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        while True:
+            getter = asyncio.create_task(subscription.get())
+            done, _ = await asyncio.wait(
+                {getter, receiver}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if receiver in done:
+                getter.cancel()
+                break
+            await websocket.send_json(getter.result())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        event_bus.unsubscribe(subscription)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+
+from backend import schemas
+from backend.dependencies import depends_job_trace_service
+from backend.services.job_trace_service import JobTraceService
+
+router = APIRouter(prefix="/api/v1", tags=["Jobs"])
+
+
+@router.get(
+    "/jobs/{job_id}/trace",
+    response_model=schemas.JobTrace,
+    summary="獲取指定工作的階段耗時",
+)
+def get_job_trace(
+    job_id: str, service: JobTraceService = Depends(depends_job_trace_service)
+):
+    """
+    回傳單一工作各階段（白名單檢查、載入任務、比對、重新命名、移動、日誌寫入）的耗時。
+
+    job_id 由 `job` 事件的 `job_id` 欄位取得；未被 `TRACE_SAMPLE_RATE` 取樣的工作回傳 404。
+    """
+    return service.get_trace(job_id)
@@ -0,0 +1,47 @@
+import json
+from typing import Iterator
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend import schemas
+from backend.dependencies import depends_planner_service
+from backend.schemas import PLAN_MAX_ITEMS
+from backend.services.planner_service import PlannerService
+
+router = APIRouter(prefix="/api/v1", tags=["Plan"])
+
+
+def _ndjson(items: Iterator[dict]) -> Iterator[str]:
+    for item in items:
+        yield json.dumps(schemas.PlanItem(**item).model_dump(), ensure_ascii=False) + "\n"
+
+
+@router.post(
+    "/plan",
+    summary="Dry-run 規劃重新命名與移動",
+    response_description="以 NDJSON 串流回傳每個檔案的規劃結果",
+)
+def create_plan(
+    payload: schemas.PlanRequest,
+    service: PlannerService = Depends(depends_planner_service),
+):
+    """
+    計算檔案的匹配任務、目的地路徑、衝突與錯誤，不會修改檔案系統。
+
+    回應為 `application/x-ndjson`，每行一筆 `PlanItem`，順序與輸入一致；
+    提供 `directory` 時會先展開為該目錄下第一層項目，再接在 `filepaths` 之後。
+    """
+    filepaths = list(payload.filepaths)
+    if payload.directory is not None:
+        filepaths.extend(service.list_directory(payload.directory))
+    if not filepaths:
+        raise HTTPException(status_code=400, detail="filepaths or directory is required")
+    if len(filepaths) > PLAN_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"items exceeds maximum of {PLAN_MAX_ITEMS}",
+        )
+
+    items = service.iter_plan(filepaths, task_ids=payload.task_ids)
+    return StreamingResponse(_ndjson(items), media_type="application/x-ndjson")
@@ -1,6 +1,9 @@
+import re
+
 from fastapi import APIRouter, Depends, HTTPException
 
 from backend import schemas
+from backend.schemas import PREVIEW_BATCH_MAX_ITEMS
 from backend.dependencies import depends_parse_preview_service, depends_regex_preview_service
 from backend.services.preview_service import ParsePreviewService, RegexPreviewService
 
@@ -15,11 +18,14 @@ def preview_parse(
     payload: schemas.ParsePreviewRequest,
     service: ParsePreviewService = Depends(depends_parse_preview_service),
 ):
-    return service.preview(
-        src_pattern=payload.src_pattern,
-        text=payload.text,
-        dst_pattern=payload.dst_pattern,
-    )
+    try:
+        return service.preview(
+            src_pattern=payload.src_pattern,
+            text=payload.text,
+            dst_pattern=payload.dst_pattern,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post(
@@ -38,3 +44,53 @@ def preview_regex(
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+
+def _validate_batch_size(texts: list[str]) -> None:
+    if len(texts) == 0:
+        raise HTTPException(status_code=400, detail="texts must not be empty")
+    if len(texts) > PREVIEW_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"texts exceeds maximum of {PREVIEW_BATCH_MAX_ITEMS}",
+        )
+
+
+@router.post(
+    "/preview/parse/batch",
+    response_model=schemas.BatchPreviewResponse,
+    summary="Parse 批次預覽",
+)
+def preview_parse_batch(
+    payload: schemas.BatchPreviewRequest,
+    service: ParsePreviewService = Depends(depends_parse_preview_service),
+):
+    _validate_batch_size(payload.texts)
+    try:
+        return service.preview_batch(
+            src_pattern=payload.src_pattern,
+            texts=payload.texts,
+            dst_pattern=payload.dst_pattern,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post(
+    "/preview/regex/batch",
+    response_model=schemas.BatchPreviewResponse,
+    summary="Regex 批次預覽",
+)
+def preview_regex_batch(
+    payload: schemas.BatchPreviewRequest,
+    service: RegexPreviewService = Depends(depends_regex_preview_service),
+):
+    _validate_batch_size(payload.texts)
+    try:
+        return service.preview_batch(
+            src_pattern=payload.src_pattern,
+            texts=payload.texts,
+            dst_pattern=payload.dst_pattern,
+        )
+    except (ValueError, re.error) as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,57 @@
+from fastapi import APIRouter
+
+from backend import schemas
+from backend.utils.profiler import ProfilingSession, profiler
+
+router = APIRouter(prefix="/api/v1/admin", tags=["Admin"])
+
+
+def _status(session: ProfilingSession | None, active: bool) -> schemas.ProfilingStatus:
+    if session is None:
+        return schemas.ProfilingStatus(active=False)
+    return schemas.ProfilingStatus(
+        active=active,
+        target=session.target,
+        mode=session.mode,
+        count=session.count,
+        remaining=session.remaining,
+        output_dir=str(session.output_dir),
+        files=list(session.files),
+    )
+
+
+@router.post(
+    "/profiling",
+    response_model=schemas.ProfilingStatus,
+    summary="剖析接下來的 N 個工作或請求",
+)
+def start_profiling(payload: schemas.ProfilingStart):
+    """
+    開始剖析，取代尚未結束的剖析；達到數量後自動關閉。
+
+    輸出寫入 `storages/profiles/<時間>-<對象>-<模式>/`，
+    `.prof` 可用 `python -m pstats` 或 snakeviz 檢視，`.folded` 可交給 flamegraph.pl 或 speedscope。
+    """
+    session = profiler.start(payload.target, payload.count, payload.mode)
+    return _status(session, active=True)
+
+
+@router.get(
+    "/profiling",
+    response_model=schemas.ProfilingStatus,
+    summary="獲取目前的剖析狀態",
+)
+def get_profiling():
+    """回傳剖析中的工作階段；沒有進行中的剖析時 active 為 false。"""
+    session = profiler.session
+    return _status(session, active=session is not None)
+
+
+@router.delete(
+    "/profiling",
+    response_model=schemas.ProfilingStatus,
+    summary="停止剖析",
+)
+def stop_profiling():
+    """提前停止剖析，回傳被停止的工作階段；已寫入的檔案會保留。"""
+    return _status(profiler.stop(), active=False)
@@ -12,6 +12,13 @@ def get_all_tags(service: TagService = Depends(depends_tag_service)):
     return service.get_all_tags()
 
 
+@router.get(
+    "/tags/counts", response_model=list[schemas.TagTaskCount], summary="獲取各標籤的任務數"
+)
+def get_tag_task_counts(service: TagService = Depends(depends_tag_service)):
+    return service.get_task_counts()
+
+
 @router.post("/tags", response_model=schemas.Tag_, status_code=201, summary="建立標籤")
 def create_tag(tag: schemas.TagCreate, service: TagService = Depends(depends_tag_service)):
     return service.create_tag(tag)
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Body, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 
 from backend import schemas
 from backend.dependencies import depends_task_service
@@ -13,8 +15,14 @@ router = APIRouter(prefix="/api/v1", tags=["Tasks"])
     response_model=list[schemas.Task],
     summary="獲取所有任務",
 )
-def get_all_tasks(service: TaskService = Depends(depends_task_service)):
-    return service.get_all_tasks()
+def get_all_tasks(
+    tag_ids: list[str] = Query(default=[], description="篩選的標籤 ID，可重複指定"),
+    tag_match: Literal["any", "all"] = Query(
+        "any", description="any 為包含任一標籤的任務，all 為包含全部標籤的任務"
+    ),
+    service: TaskService = Depends(depends_task_service),
+):
+    return service.get_all_tasks(tag_ids=tag_ids, tag_match=tag_match)
 
 
 # --- Batch endpoints (placed before `/tasks/{task_id}` to avoid path conflict) ---
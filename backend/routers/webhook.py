@@ -1,9 +1,13 @@
+import asyncio
 from datetime import UTC, datetime
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, HTTPException
 
 from backend import __version__
 from backend.schemas import DownloaderOnCompletePayload
+from backend.utils.metrics import WEBHOOK_EVENTS
+from backend.worker.dedup import webhook_deduplicator
+from backend.worker.job_queue import download_queue
 from backend.worker.worker import process_completed_download
 
 router = APIRouter(
@@ -23,6 +27,7 @@ def webhook_status():
         "status": "ok",
         "version": __version__,  # 建議從統一的設定檔或 __version__ 變數中讀取
         "timestamp": datetime.now(UTC).isoformat(),
+        "deduplicated": webhook_deduplicator.suppressed,
         "available_webhooks": [
             {
                 "path": "/webhook/qbittorrent/on-complete",
@@ -44,9 +49,7 @@ def webhook_status():
     summary="Downloader Completion Webhook",
     response_description="Confirmation message that the webhook was received.",
 )
-async def downloader_on_complete(
-    payload: DownloaderOnCompletePayload, background_tasks: BackgroundTasks
-):
+async def downloader_on_complete(payload: DownloaderOnCompletePayload):
     """
     處理下載器下載完成 webhook 的 API。
 
@@ -55,19 +58,32 @@ async def downloader_on_complete(
 
     請依照各個下載器的說明文件，將 `./scripts` 下的對應腳本加入下載完成後的執行清單中。
 
-    事件處理器會在背景任務中執行，避免在 API 請求中 block 進一步的請求。
+    事件會送入下載處理佇列，由背景執行緒依序處理，避免在 API 請求中 block 進一步的請求。
+    `category` 與 `tags` 會用於篩選限定下載器類別或標籤的任務。
 
     回應內容:
     - `status`: always "success"
     - `code`: "200" for success, "500" for failure"
     - `filepath`: the content path of the downloaded torrent
+    - `duplicate`: 此事件是否為近期已接受過的重複事件（重複事件不會再次處理）
     """
     try:
-        background_tasks.add_task(process_completed_download, payload.filepath)
+        accepted, _ = await asyncio.to_thread(
+            webhook_deduplicator.claim, payload.filepath
+        )
+        WEBHOOK_EVENTS.inc(result="accepted" if accepted else "duplicate")
+        if accepted:
+            download_queue.submit(
+                process_completed_download,
+                payload.filepath,
+                category=payload.category,
+                tags=payload.tags,
+            )
         return {
             "status": "ok",
             "code": 200,
             "filepath": payload.filepath,
+            "duplicate": not accepted,
         }
     except Exception as e:
         raise HTTPException(
@@ -1,7 +1,11 @@
 from datetime import UTC, datetime
 from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+import re
+
+from pydantic import BaseModel, Field, model_validator
+
+from backend.utils.include_pattern import IncludeType, compile_include
 
 # --- Base Configuration ---
 
@@ -55,6 +59,14 @@ class TaskUUID(BaseModel):
     )
 
 
+def _validate_include(include_type: str, include: str) -> None:
+    """regex 與 glob 的 include 在儲存前先編譯，避免無效規則到 Worker 才失敗。"""
+    try:
+        compile_include(include_type, include)
+    except re.error as e:
+        raise ValueError(f"include 正則表達式無效：{e}") from e
+
+
 class TaskBase(BaseModel):
     name: str = Field(
         ..., max_length=255, description="任務的名稱", examples=["公爵千金的家庭教師"]
@@ -65,6 +77,21 @@ class TaskBase(BaseModel):
         description="用於匹配檔案的包含規則",
         examples=["公爵千金的家庭教師"],
     )
+    include_type: IncludeType = Field(
+        "substring", description="include 的比對方式：substring、regex 或 glob"
+    )
+    match_categories: Optional[str] = Field(
+        None,
+        max_length=255,
+        description="限定的下載器類別，以逗號分隔；未設定時不限類別",
+        examples=["anime"],
+    )
+    match_tags: Optional[str] = Field(
+        None,
+        max_length=255,
+        description="下載必須帶有的全部標籤，以逗號分隔",
+        examples=["1080p,webrip"],
+    )
     move_to: str = Field(
         ...,
         max_length=4096,
@@ -86,6 +113,14 @@ class TaskBase(BaseModel):
     )
     episode_offset_value: int = Field(0, description="episode 偏移量")
     enabled: bool = Field(True, description="任務的啟用狀態")
+    priority: int = Field(
+        0, ge=-1000, le=1000, description="比對優先順序，數字越大越先比對"
+    )
+
+    @model_validator(mode="after")
+    def check_include_pattern(self):
+        _validate_include(self.include_type, self.include)
+        return self
 
 
 class TaskCreate(TaskBase):
@@ -119,6 +154,11 @@ class TaskPatch(BaseModel):
 
     name: Optional[str] = Field(None, max_length=255, description="任務的名稱")
     include: Optional[str] = Field(None, max_length=1000, description="包含規則")
+    include_type: Optional[IncludeType] = Field(None, description="include 的比對方式")
+    match_categories: Optional[str] = Field(
+        None, max_length=255, description="限定的下載器類別，以逗號分隔"
+    )
+    match_tags: Optional[str] = Field(None, max_length=255, description="需要的下載器標籤")
     move_to: Optional[str] = Field(None, max_length=4096, description="目標目錄路徑")
     src_filename: Optional[str] = Field(None, max_length=1000, description="來源檔案名稱規則")
     dst_filename: Optional[str] = Field(None, max_length=1000, description="目標檔案名稱模板")
@@ -127,10 +167,19 @@ class TaskPatch(BaseModel):
     episode_offset_group: Optional[str] = Field(None, max_length=255, description="偏移 group 名稱")
     episode_offset_value: Optional[int] = Field(None, description="episode 偏移量")
     enabled: Optional[bool] = Field(None, description="任務的啟用狀態")
+    priority: Optional[int] = Field(
+        None, ge=-1000, le=1000, description="比對優先順序，數字越大越先比對"
+    )
     tag_ids: Optional[List[str]] = Field(None, description="關聯的標籤 ID 列表")
 
     model_config = {"extra": "forbid"}
 
+    @model_validator(mode="after")
+    def check_include_pattern(self):
+        if self.include is not None and self.include_type is not None:
+            _validate_include(self.include_type, self.include)
+        return self
+
 
 class TaskBatchCreate(BaseModel):
     """批量建立任務請求。"""
@@ -204,6 +253,11 @@ class Tag_(TagBase, OrmBaseModel):
     )
 
 
+class TagTaskCount(BaseModel):
+    tag_id: str = Field(..., description="標籤 ID")
+    task_count: int = Field(..., description="帶有此標籤的任務數")
+
+
 # --- Preset Rule Schemas ---
 
 ALLOWED_RULE_TYPES = {"parse", "regex"}
@@ -370,6 +424,45 @@ class RegexPreviewResponse(RegexPreviewRequest):
     )
 
 
+# --- Batch Preview Schemas ---
+
+PREVIEW_BATCH_MAX_ITEMS = 500
+
+
+class BatchPreviewRequest(BaseModel):
+    src_pattern: str = Field(
+        ...,
+        max_length=1000,
+        description="用於解析的模式字串（僅編譯一次）",
+        json_schema_extra={"example": "{title} - {episode}.mp4"},
+    )
+    texts: List[str] = Field(
+        ...,
+        description="要被解析的樣本文字清單",
+        json_schema_extra={"example": ["公爵千金的家庭教師 - 01.mp4"]},
+    )
+    dst_pattern: str = Field(
+        ...,
+        max_length=1000,
+        description="用於產生新字串的格式化字串",
+        json_schema_extra={"example": "{title} - S01E{episode}.mp4"},
+    )
+
+
+class BatchPreviewItem(BaseModel):
+    text: str = Field(..., description="樣本文字")
+    groups: dict = Field(default_factory=dict, description="解析後的分組結果")
+    formatted: str = Field("", description="格式化後的預覽結果")
+    error: Optional[str] = Field(None, description="此筆預覽失敗的原因")
+    timed_out: bool = Field(False, description="此筆是否因逾時而未完成")
+
+
+class BatchPreviewResponse(BaseModel):
+    src_pattern: str
+    dst_pattern: str
+    items: List[BatchPreviewItem] = Field(default_factory=list)
+
+
 # --- Directory Schemas ---
 
 
@@ -383,6 +476,11 @@ class DirectoryListResponse(BaseModel):
     directories: List[DirectoryItem] = Field(
         default_factory=list, description="目錄列表"
     )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="下一頁的游標，傳入 cursor 參數以取得下一頁；沒有下一頁時為 null",
+        examples=["/downloads/anime/show50"],
+    )
 
 
 # --- Webhook Schemas ---
@@ -394,3 +492,95 @@ class DownloaderOnCompletePayload(BaseModel):
     filepath: str = Field(..., max_length=4096, description="下載的內容路徑")
     category: Optional[str] = Field(None, max_length=255, description="種子的類別")
     tags: Optional[str] = Field(None, max_length=255, description="種子的標籤")
+
+
+# --- Plan Schemas ---
+
+PLAN_MAX_ITEMS = 10000
+
+
+class PlanRequest(BaseModel):
+    """Dry-run 規劃請求，filepaths 與 directory 至少需提供一項。"""
+
+    filepaths: List[str] = Field(
+        default_factory=list,
+        description="要規劃的檔案路徑清單",
+        examples=[["/downloads/公爵千金的家庭教師 - 01.mp4"]],
+    )
+    directory: Optional[str] = Field(
+        None,
+        max_length=4096,
+        description="要規劃的來源目錄，會展開為目錄下第一層項目",
+    )
+    task_ids: Optional[List[str]] = Field(
+        None,
+        description="僅以指定的任務進行比對（含停用任務），未提供時使用所有已啟用任務",
+    )
+
+
+class PlanItem(BaseModel):
+    """單一檔案的規劃結果。"""
+
+    filepath: str = Field(..., description="來源檔案路徑")
+    task_id: Optional[str] = Field(None, description="匹配的任務 ID")
+    task_name: Optional[str] = Field(None, description="匹配的任務名稱")
+    dst_filepath: Optional[str] = Field(None, description="重新命名並移動後的目的地路徑")
+    conflict_with: Optional[str] = Field(
+        None, description="已規劃到相同目的地的另一個來源檔案"
+    )
+    error: Optional[str] = Field(None, description="規劃失敗的原因")
+
+
+# --- Job Trace Schemas ---
+
+
+class TraceSpan(BaseModel):
+    """工作中單一階段的耗時。"""
+
+    name: str = Field(
+        ...,
+        description="階段名稱（whitelist／load_tasks／match／rename／move／log）",
+        examples=["move"],
+    )
+    start_ms: float = Field(..., description="相對於工作開始的起點（毫秒）")
+    duration_ms: float = Field(..., description="階段耗時（毫秒）")
+
+
+class JobTrace(BaseModel):
+    """單一工作的階段追蹤。"""
+
+    id: str = Field(..., description="工作的 trace id，與工作事件的 job_id 相同")
+    task_id: Optional[str] = Field(None, description="匹配的任務 ID")
+    filepath: str = Field(..., description="工作處理的檔案路徑")
+    status: Literal["skipped", "completed", "failed"] = Field(..., description="工作結果")
+    started_at: datetime = Field(..., description="工作開始時間")
+    duration_ms: float = Field(..., description="工作總耗時（毫秒）")
+    spans: List[TraceSpan] = Field(default_factory=list, description="依開始順序排列的階段")
+
+
+# --- Profiling Schemas ---
+
+
+class ProfilingStart(BaseModel):
+    """開始剖析的請求內容。"""
+
+    target: Literal["jobs", "requests"] = Field(
+        "jobs", description="剖析對象：下載完成工作（jobs）或 HTTP 請求（requests）"
+    )
+    count: int = Field(5, ge=1, le=100, description="剖析的數量，達到後自動關閉")
+    mode: Literal["cprofile", "sampling"] = Field(
+        "sampling",
+        description="cprofile 輸出 pstats（.prof）；sampling 輸出火焰圖用的 folded stacks（.folded）",
+    )
+
+
+class ProfilingStatus(BaseModel):
+    """目前的剖析狀態。"""
+
+    active: bool = Field(..., description="是否仍在剖析中")
+    target: Optional[Literal["jobs", "requests"]] = Field(None, description="剖析對象")
+    mode: Optional[Literal["cprofile", "sampling"]] = Field(None, description="剖析模式")
+    count: int = Field(0, description="預計剖析的數量")
+    remaining: int = Field(0, description="尚未開始剖析的數量")
+    output_dir: Optional[str] = Field(None, description="輸出目錄")
+    files: List[str] = Field(default_factory=list, description="已寫入的剖析檔案")
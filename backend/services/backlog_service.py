@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from backend.repositories.backlog_scan_state import BacklogScanStateRepository
+from backend.services.setting_service import SettingService
+from backend.services.task_service import TaskService
+from backend.utils.env_config import get_task_match_mode
+from backend.utils.logger import logger
+from backend.utils.safe_regex import RegexTimeoutError
+from backend.worker.matcher import TaskMatcher
+
+Watermark = tuple[int, int]
+
+
+@dataclass
+class BacklogScanResult:
+    """單次積壓掃描的統計結果。"""
+
+    scanned: int = 0
+    skipped: int = 0
+    matched: int = 0
+    dispatched: int = 0
+    failed: int = 0
+    watermark: Watermark | None = None
+
+
+class BacklogService:
+    """掃描來源目錄中已存在的檔案，將符合任務的檔案交給 Worker 處理。
+
+    Why: Movera 原本只對 Webhook 反應，停機期間下載完成、
+    或任務建立前就已存在的檔案永遠不會被處理。
+    此服務以 os.scandir 產生器逐一走訪 allowed_source_directories，
+    並以 (mtime_ns, inode) 水位線讓重複掃描只處理新檔案。
+
+    水位線與產生當下的啟用任務、來源目錄指紋一起存放在 backlog_scan_state 表；
+    任務或來源目錄變更後指紋不同，水位線失效並重新完整掃描，
+    讓任務建立前就存在、先前未符合任何任務的檔案也能被處理。
+    """
+
+    def __init__(
+        self,
+        task_service: TaskService,
+        setting_service: SettingService,
+        state_repository: BacklogScanStateRepository,
+    ):
+        self.task_service = task_service
+        self.setting_service = setting_service
+        self.state_repository = state_repository
+
+    @staticmethod
+    def fingerprint(tasks: list, roots: list[str]) -> str:
+        """以會影響掃描結果的任務欄位與來源目錄計算指紋。"""
+        payload = {
+            "tasks": sorted(
+                [
+                    task.id,
+                    task.include,
+                    getattr(task, "include_type", "substring"),
+                    os.path.abspath(task.move_to),
+                ]
+                for task in tasks
+            ),
+            "roots": sorted(roots),
+        }
+        return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode()).hexdigest()
+
+    def get_watermark(self, fingerprint: str | None = None) -> Watermark | None:
+        """取得水位線；提供 fingerprint 且與儲存時不同時視為沒有水位線。"""
+        state = self.state_repository.get()
+        if state is None:
+            return None
+        if fingerprint is not None and state.fingerprint != fingerprint:
+            return None
+        return state.watermark_mtime_ns, state.watermark_inode
+
+    def save_watermark(self, watermark: Watermark, fingerprint: str) -> None:
+        self.state_repository.save(watermark, fingerprint)
+
+    @staticmethod
+    def iter_candidates(
+        roots: list[str],
+        exclude: set[str] | None = None,
+    ) -> Iterator[tuple[str, os.stat_result]]:
+        """以 os.scandir 深度優先走訪 roots，逐一產生 (檔案路徑, stat)。
+
+        不跟隨符號連結，並略過隱藏或系統目錄（.、#、@ 開頭）與 exclude 中的目錄。
+        """
+        exclude = exclude or set()
+        stack = list(reversed(roots))
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    subdirs = []
+                    for entry in entries:
+                        if entry.name.startswith((".", "#", "@")):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.path not in exclude:
+                                subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry.path, entry.stat(follow_symlinks=False)
+                    stack.extend(sorted(subdirs, reverse=True))
+            except (PermissionError, FileNotFoundError, NotADirectoryError):
+                continue
+
+    def scan(
+        self,
+        dispatch: Callable[[str], None],
+        rate: float,
+        min_age: float,
+        full: bool = False,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> BacklogScanResult:
+        """掃描來源目錄並以 rate（檔案／秒）派送符合任務的檔案。
+
+        Why: 水位線僅在整輪掃描完成後才寫入——走訪順序與 mtime 無關，
+        中途寫入會讓尚未走訪到的較舊檔案在下次掃描時被略過。
+        修改時間距今未滿 min_age 秒的檔案視為仍在寫入，不派送也不推進水位線。
+        比對逾時或派送失敗的檔案需要重試，水位線停在其中最舊的檔案之前；
+        未符合任何任務的檔案只會在任務變更後才可能符合，由指紋失效處理。
+
+        Args:
+            dispatch: 處理單一檔案的函式（通常為 process_completed_download）
+            rate: 每秒最多派送的檔案數
+            min_age: 檔案最後修改後需經過的秒數
+            full: 忽略水位線，重新掃描所有檔案
+            sleep: 節流用的等待函式（測試可注入）
+        """
+        result = BacklogScanResult()
+        roots = self.setting_service.get_allowed_source_directories()
+        if not roots:
+            logger.info("未設定允許的來源目錄，略過積壓掃描")
+            return result
+
+        tasks = self.task_service.get_enabled_tasks()
+        matcher = TaskMatcher(tasks, get_task_match_mode())
+        fingerprint = self.fingerprint(tasks, roots)
+        watermark = None if full else self.get_watermark(fingerprint)
+        # 略過任務的目標目錄，避免剛移入的檔案在同一輪掃描中被重複派送
+        exclude = {os.path.abspath(task.move_to) for task in tasks}
+        cutoff_ns = time.time_ns() - int(min_age * 1_000_000_000)
+        interval = 1.0 / rate
+        next_dispatch = 0.0
+        new_watermark = watermark
+        # 需要重試的檔案中最小的 key，水位線不可越過
+        retry_from: Watermark | None = None
+
+        for filepath, stat in self.iter_candidates(roots, exclude):
+            result.scanned += 1
+            key = (stat.st_mtime_ns, stat.st_ino)
+            if stat.st_mtime_ns > cutoff_ns or (watermark is not None and key <= watermark):
+                result.skipped += 1
+                continue
+            if new_watermark is None or key > new_watermark:
+                new_watermark = key
+
+            try:
+                if matcher.match(filepath) is None:
+                    continue
+            except RegexTimeoutError as e:
+                logger.warning(f'積壓掃描比對檔案 "{filepath}" 失敗: {e}')
+                retry_from = min(retry_from or key, key)
+                continue
+            result.matched += 1
+
+            wait = next_dispatch - time.monotonic()
+            if wait > 0:
+                sleep(wait)
+            next_dispatch = time.monotonic() + interval
+            try:
+                dispatch(filepath)
+                result.dispatched += 1
+            except Exception as e:
+                result.failed += 1
+                retry_from = min(retry_from or key, key)
+                logger.error(f'積壓掃描派送檔案 "{filepath}" 失敗: {e}')
+
+        if retry_from is not None and new_watermark is not None:
+            # 停在最舊的待重試檔案之前：同一 mtime 下 inode 較小者才視為已處理
+            new_watermark = min(new_watermark, (retry_from[0], retry_from[1] - 1))
+        if new_watermark is not None and new_watermark != watermark:
+            self.save_watermark(new_watermark, fingerprint)
+        result.watermark = new_watermark
+        return result
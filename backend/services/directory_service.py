@@ -1,10 +1,82 @@
+import bisect
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterable
 
 from backend.exceptions.directory_exception import (
     DirectoryAccessDenied,
     DirectoryNotFound,
 )
 from backend.services.setting_service import SettingService
+from backend.utils.path_validator import get_path_matcher
+
+# 目錄列表快取的存活秒數；目錄本身的 mtime 改變時立即失效
+DIRECTORY_CACHE_TTL = 5.0
+# 快取的目錄數上限，超過時淘汰最久未使用的項目
+DIRECTORY_CACHE_MAX_ENTRIES = 1024
+# 平行探測子目錄是否還有下一層時使用的執行緒數
+CHILD_PROBE_WORKERS = 8
+
+
+class _Listing:
+    """單一目錄已排序的子目錄清單，以及已探測過的 has_children 結果。
+
+    Why: 分頁與搜尋只需要名稱即可決定回傳哪些項目，
+    較昂貴的 has_children 探測延後到項目真正出現在某一頁時才執行，並記住結果供下次使用。
+    """
+
+    def __init__(self, children: list[tuple[str, str]]):
+        self.children = children
+        self.names = [name for name, _ in children]
+        self.has_children: dict[str, bool] = {}
+
+
+class _DirectoryCache:
+    """以 (路徑, mtime) 為鍵、短暫存活的子目錄列表快取。
+
+    Why: 樹狀檢視會反覆展開與收合同一批目錄，而在網路掛載上每次掃描都很昂貴。
+    新增或刪除子目錄會改變父目錄的 mtime，因此比對 mtime 即可讓快取立即失效；
+    TTL 則限制孫目錄變動造成 has_children 過期的時間。
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[int, float, _Listing]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, mtime_ns: int) -> _Listing | None:
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is None:
+                return None
+            cached_mtime, expires_at, listing = cached
+            if cached_mtime != mtime_ns or expires_at <= time.monotonic():
+                del self._entries[path]
+                return None
+            self._entries.move_to_end(path)
+            return listing
+
+    def put(self, path: str, mtime_ns: int, listing: _Listing) -> None:
+        with self._lock:
+            self._entries[path] = (mtime_ns, time.monotonic() + self.ttl, listing)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+directory_cache = _DirectoryCache(DIRECTORY_CACHE_TTL, DIRECTORY_CACHE_MAX_ENTRIES)
+_probe_executor = ThreadPoolExecutor(
+    max_workers=CHILD_PROBE_WORKERS, thread_name_prefix="directory-probe"
+)
 
 
 class DirectoryService:
@@ -23,6 +95,26 @@ class DirectoryService:
         Why: 前端樹狀檢視需要根目錄列表（允許的目錄）和子目錄展開功能；
         此方法同時處理兩種情境，並強制執行存取控制。
 
+        Raises:
+            DirectoryNotFound: *path* 指向的目錄不存在。
+            DirectoryAccessDenied: *path* 不在任何允許的目錄範圍內。
+        """
+        return self.list_directories_page(path)["directories"]
+
+    def list_directories_page(
+        self,
+        path: str | None,
+        q: str | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> dict:
+        """分頁版本的 list_directories，回傳 {"directories", "next_cursor"}。
+
+        Why: 媒體根目錄可能有上千個影集資料夾，一次回傳全部會讓選擇器凍結。
+        q 以不分大小寫的子字串過濾名稱；cursor 為上一頁最後一個項目的 path，
+        以名稱為鍵定位下一頁，目錄在翻頁間新增或刪除項目時不會重複或跳過。
+        頁面填滿即停止，只有出現在該頁的項目會探測 has_children。
+
         Raises:
             DirectoryNotFound: *path* 指向的目錄不存在。
             DirectoryAccessDenied: *path* 不在任何允許的目錄範圍內。
@@ -30,7 +122,12 @@ class DirectoryService:
         allowed = self.setting_service.get_allowed_directories()
 
         if path is None:
-            return self._list_root_directories(allowed)
+            roots = self._root_entries(allowed)
+            start = 0
+            if cursor is not None:
+                paths = [root_path for _, root_path in roots]
+                start = paths.index(cursor) + 1 if cursor in paths else 0
+            return self._paginate(roots[start:], None, q, limit)
 
         self._validate_path_access(path, allowed)
 
@@ -38,59 +135,96 @@ class DirectoryService:
         if not resolved.is_dir():
             raise DirectoryNotFound(path)
 
-        return self._scan_directories(resolved)
-
-    def _list_root_directories(self, allowed: list[str]) -> list[dict]:
-        result = []
-        for dir_path in allowed:
-            resolved = Path(dir_path).resolve()
-            if resolved.is_dir():
-                result.append({
-                    "name": resolved.name,
-                    "path": str(resolved),
-                    "has_children": self._has_subdirectories(resolved),
-                })
-        return result
+        listing = self._get_listing(resolved)
+        start = 0
+        if cursor is not None:
+            start = bisect.bisect_right(listing.names, os.path.basename(cursor))
+        return self._paginate(listing.children[start:], listing, q, limit)
+
+    def _paginate(
+        self,
+        children: Iterable[tuple[str, str]],
+        listing: _Listing | None,
+        q: str | None,
+        limit: int | None,
+    ) -> dict:
+        needle = q.casefold() if q else None
+        page: list[tuple[str, str]] = []
+        has_more = False
+        for name, child_path in children:
+            if needle is not None and needle not in name.casefold():
+                continue
+            if limit is not None and len(page) >= limit:
+                has_more = True
+                break
+            page.append((name, child_path))
+
+        memo = listing.has_children if listing is not None else {}
+        unknown = [child_path for _, child_path in page if child_path not in memo]
+        for child_path, flag in zip(unknown, self._probe_children(unknown)):
+            memo[child_path] = flag
+
+        return {
+            "directories": [
+                {"name": name, "path": child_path, "has_children": memo[child_path]}
+                for name, child_path in page
+            ],
+            "next_cursor": page[-1][1] if has_more else None,
+        }
+
+    def _root_entries(self, allowed: list[str]) -> list[tuple[str, str]]:
+        roots = [Path(dir_path).resolve() for dir_path in allowed]
+        return [(root.name, str(root)) for root in roots if root.is_dir()]
 
     def _validate_path_access(self, path: str, allowed: list[str]) -> None:
-        resolved = Path(path).resolve()
-        for allowed_dir in allowed:
-            allowed_resolved = Path(allowed_dir).resolve()
-            if resolved == allowed_resolved or self._is_subpath(resolved, allowed_resolved):
-                return
-        raise DirectoryAccessDenied(path)
-
-    def _is_subpath(self, path: Path, parent: Path) -> bool:
-        try:
-            path.relative_to(parent)
-            return True
-        except ValueError:
-            return False
+        if not get_path_matcher(allowed).matches(path):
+            raise DirectoryAccessDenied(path)
 
     @staticmethod
     def _is_hidden_directory(name: str) -> bool:
         """檢查目錄名稱是否為隱藏或系統目錄（.、#、@ 開頭）。"""
         return name.startswith((".", "#", "@"))
 
-    def _scan_directories(self, path: Path) -> list[dict]:
-        result = []
+    def _get_listing(self, path: Path) -> _Listing:
+        """以 os.scandir 取得已排序的子目錄清單，並依 (路徑, mtime) 快取。
+
+        Why: DirEntry 直接帶有 readdir 回傳的檔案類型，不必對每個項目另外 stat，
+        讓網路掛載上數千個資料夾的目錄也能快速列出。
+        """
         try:
-            for entry in sorted(path.iterdir()):
-                if entry.is_dir() and not entry.is_symlink() and not self._is_hidden_directory(entry.name):
-                    result.append({
-                        "name": entry.name,
-                        "path": str(entry),
-                        "has_children": self._has_subdirectories(entry),
-                    })
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            return _Listing([])
+        cached = directory_cache.get(str(path), mtime_ns)
+        if cached is not None:
+            return cached
+
+        children: list[tuple[str, str]] = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False) and not self._is_hidden_directory(entry.name):
+                        children.append((entry.name, entry.path))
         except PermissionError:
-            pass
-        return result
+            return _Listing([])
+        children.sort()
 
-    def _has_subdirectories(self, path: Path) -> bool:
+        listing = _Listing(children)
+        directory_cache.put(str(path), mtime_ns, listing)
+        return listing
+
+    def _probe_children(self, paths: list[str]) -> list[bool]:
+        """平行探測每個目錄是否還有子目錄；探測找到第一個子目錄即停止。"""
+        if len(paths) <= 1:
+            return [self._has_subdirectories(path) for path in paths]
+        return list(_probe_executor.map(self._has_subdirectories, paths))
+
+    def _has_subdirectories(self, path: str | Path) -> bool:
         try:
-            for entry in path.iterdir():
-                if entry.is_dir() and not entry.is_symlink() and not self._is_hidden_directory(entry.name):
-                    return True
-        except PermissionError:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False) and not self._is_hidden_directory(entry.name):
+                        return True
+        except OSError:
             pass
         return False
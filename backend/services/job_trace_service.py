@@ -0,0 +1,62 @@
+import json
+from datetime import UTC, datetime, timedelta
+
+from backend import models, schemas
+from backend.exceptions.job_exception import JobTraceNotFound
+from backend.repositories.job_trace import JobTraceRepository
+from backend.utils.env_config import get_trace_retention_days
+from backend.utils.tracing import JobTrace
+
+
+class JobTraceService:
+    """保存與查詢工作的階段追蹤。
+
+    Why: 時間區段以精簡的 JSON 陣列存成單一資料列，一個工作只需一次寫入；
+    查詢時再展開為具名欄位，讓 API 回傳易讀的結構。
+    未匹配任何任務的工作不保存，過期的追蹤在寫入時一併刪除，讓資料表維持有界。
+    """
+
+    def __init__(self, repository: JobTraceRepository):
+        self.repository = repository
+
+    def record(self, trace: JobTrace) -> None:
+        """保存已取樣且匹配到任務的 trace，並刪除超過保留天數的追蹤。"""
+        if not trace.sampled or trace.task_id is None:
+            return
+        retention_days = get_trace_retention_days()
+        prune_before = (
+            datetime.now(UTC) - timedelta(days=retention_days) if retention_days else None
+        )
+        self.repository.create(
+            models.JobTrace(
+                id=trace.id,
+                task_id=trace.task_id,
+                filepath=trace.filepath,
+                status=trace.status or "failed",
+                started_at=trace.started_at,
+                duration_ms=trace.duration_ms,
+                spans=json.dumps(
+                    sorted(trace.spans, key=lambda span: span[1]),
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                ),
+            ),
+            prune_before=prune_before,
+        )
+
+    def get_trace(self, job_id: str) -> schemas.JobTrace:
+        trace = self.repository.get(job_id)
+        if trace is None:
+            raise JobTraceNotFound(job_id)
+        return schemas.JobTrace(
+            id=trace.id,
+            task_id=trace.task_id,
+            filepath=trace.filepath,
+            status=trace.status,
+            started_at=trace.started_at,
+            duration_ms=trace.duration_ms,
+            spans=[
+                schemas.TraceSpan(name=name, start_ms=start_ms, duration_ms=duration_ms)
+                for name, start_ms, duration_ms in json.loads(trace.spans)
+            ],
+        )
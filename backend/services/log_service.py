@@ -1,5 +1,7 @@
 from backend import models, schemas
 from backend.repositories.log import LogRepository
+from backend.utils.event_bus import event_bus
+from backend.utils.metrics import LOG_WRITE_DURATION
 
 
 class LogService:
@@ -16,4 +18,11 @@ class LogService:
         return self.repository.get_by_task_id(task_id)
 
     def create_log(self, log: schemas.LogCreate) -> models.Log:
-        return self.repository.create(log)
+        """寫入日誌，並將新日誌推送給即時事件訂閱者。"""
+        with LOG_WRITE_DURATION.time():
+            created = self.repository.create(log)
+        if event_bus.subscriber_count:
+            event_bus.publish(
+                "log", schemas.Log.model_validate(created).model_dump(mode="json")
+            )
+        return created
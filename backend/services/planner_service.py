@@ -0,0 +1,260 @@
+import os
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import parse
+
+from backend import models
+from backend.exceptions.directory_exception import (
+    DirectoryAccessDenied,
+    DirectoryNotFound,
+)
+from backend.services.setting_service import SettingService
+from backend.services.task_service import TaskService
+from backend.utils.env_config import get_task_match_mode
+from backend.utils.parse_template import compile_parse
+from backend.utils.rename import Rename
+from backend.utils.safe_format import safe_format
+from backend.utils.safe_regex import safe_compile, safe_search_many, safe_sub_many
+from backend.utils.path_validator import AllowedPathMatcher, get_path_matcher
+from backend.worker.matcher import TaskMatcher
+from backend.worker.worker import is_path_within_allowed
+
+# 每批次處理的檔案數；同一批內同任務的 regex 規則共用一個沙箱子行程
+PLAN_CHUNK_SIZE = 500
+
+
+class _CompiledTask:
+    """單一任務在一次規劃中重複使用的已編譯規則。
+
+    Why: 一次規劃可能涵蓋上千個檔名，parse 樣板與正則表達式只需編譯一次，
+    之後每個檔名只做比對與格式化。
+    """
+
+    def __init__(self, task: models.Task):
+        self.task = task
+        self.rule: Rename | None = None
+        self.parser: parse.Parser | None = None
+        self.regex = None
+        self.error: str | None = None
+
+        if task.rename_rule is None:
+            return
+        self.rule = Rename(
+            filepath="",
+            src=task.src_filename,
+            dst=task.dst_filename,
+            rule=task.rename_rule,
+            episode_offset_enabled=task.episode_offset_enabled,
+            episode_offset_group=task.episode_offset_group,
+            episode_offset_value=task.episode_offset_value,
+        )
+        try:
+            if self.rule.rule_type == "parse":
+                self.parser = compile_parse(task.src_filename)
+            elif self.rule.rule_type == "regex":
+                self.regex = safe_compile(task.src_filename)
+            else:
+                self.error = f"未知的重新命名規則類型: {self.rule.rule_type}"
+        except Exception as e:
+            self.error = f"規則編譯失敗: {e}"
+
+
+class PlannerService:
+    """計算大量檔案的重新命名／移動計畫，全程不修改檔案系統。
+
+    Why: 使用者在啟用任務前需要預覽整季或整批積壓檔案的處理結果。
+    Planner 與 Worker 共用比對與重新命名邏輯，確保預覽與實際執行一致，
+    並以批次沙箱執行正則規則，讓數千個檔名能在短時間內完成評估。
+    """
+
+    def __init__(self, task_service: TaskService, setting_service: SettingService):
+        self.task_service = task_service
+        self.setting_service = setting_service
+
+    def list_directory(self, directory: str) -> list[str]:
+        """回傳來源目錄下的第一層項目（檔案與資料夾）路徑清單。
+
+        Why: 下載器回報的 content path 可能是單一檔案或整個資料夾，
+        因此規劃對象與 Webhook 相同，為目錄的第一層項目。
+
+        Raises:
+            DirectoryAccessDenied: 目錄不在允許的來源目錄範圍內。
+            DirectoryNotFound: 目錄不存在。
+        """
+        allowed_source = self.setting_service.get_allowed_source_directories()
+        if allowed_source and not is_path_within_allowed(directory, allowed_source):
+            raise DirectoryAccessDenied(directory)
+        if not os.path.isdir(directory):
+            raise DirectoryNotFound(directory)
+        with os.scandir(directory) as entries:
+            return sorted(
+                entry.path for entry in entries if not entry.name.startswith(".")
+            )
+
+    def _load_tasks(self, task_ids: list[str] | None) -> list[models.Task]:
+        """未指定 task_ids 時使用已啟用任務；指定時依給定順序載入（含停用任務）。"""
+        if task_ids is None:
+            return self.task_service.get_enabled_tasks()
+        by_id = {t.id: t for t in self.task_service.get_tasks_by_ids(task_ids)}
+        return [by_id[task_id] for task_id in task_ids if task_id in by_id]
+
+    def iter_plan(
+        self,
+        filepaths: Iterable[str],
+        task_ids: list[str] | None = None,
+        chunk_size: int = PLAN_CHUNK_SIZE,
+    ) -> Iterator[dict]:
+        """逐筆產生規劃結果，保持輸入順序。
+
+        每筆結果包含 filepath、task_id、task_name、dst_filepath、conflict_with 與 error。
+        conflict_with 指向先前已規劃到相同目的地的來源檔案。
+
+        Why: 任務與設定在呼叫當下即載入，而非在第一次迭代時，
+        讓串流回應在資料庫 session 關閉後仍能繼續產生結果。
+        """
+        tasks = self._load_tasks(task_ids)
+        allowed_source = get_path_matcher(
+            self.setting_service.get_allowed_source_directories()
+        )
+        matcher = TaskMatcher(tasks, get_task_match_mode())
+        return self._iter_chunks(filepaths, matcher, allowed_source, chunk_size)
+
+    def _iter_chunks(
+        self,
+        filepaths: Iterable[str],
+        matcher: TaskMatcher,
+        allowed_source: AllowedPathMatcher,
+        chunk_size: int,
+    ) -> Iterator[dict]:
+        compiled: dict[str, _CompiledTask] = {}
+        destinations: dict[str, str] = {}
+
+        chunk: list[str] = []
+        for filepath in filepaths:
+            chunk.append(filepath)
+            if len(chunk) >= chunk_size:
+                yield from self._plan_chunk(chunk, matcher, compiled, allowed_source, destinations)
+                chunk = []
+        if chunk:
+            yield from self._plan_chunk(chunk, matcher, compiled, allowed_source, destinations)
+
+    def plan(self, filepaths: Iterable[str], task_ids: list[str] | None = None) -> list[dict]:
+        """一次回傳全部規劃結果。"""
+        return list(self.iter_plan(filepaths, task_ids=task_ids))
+
+    def _plan_chunk(
+        self,
+        chunk: list[str],
+        matcher: TaskMatcher,
+        compiled: dict[str, _CompiledTask],
+        allowed_source: AllowedPathMatcher,
+        destinations: dict[str, str],
+    ) -> Iterator[dict]:
+        items = [self._empty_item(filepath) for filepath in chunk]
+        parse_groups: dict[str, list[int]] = {}
+        regex_groups: dict[str, list[int]] = {}
+
+        allowed: list[int] = []
+        for index, filepath in enumerate(chunk):
+            if allowed_source and not allowed_source.matches(filepath):
+                items[index]["error"] = "檔案不在允許的來源目錄範圍內"
+            else:
+                allowed.append(index)
+
+        # regex / glob include 整個批次共用一次沙箱往返
+        matches = matcher.match_many([chunk[index] for index in allowed])
+        for index, outcome in zip(allowed, matches):
+            item = items[index]
+            filepath = chunk[index]
+            if not outcome.ok:
+                item["error"] = outcome.error
+                continue
+            task = outcome.value
+            if task is None:
+                continue
+            item["task_id"] = task.id
+            item["task_name"] = task.name
+
+            entry = compiled.get(task.id)
+            if entry is None:
+                entry = compiled[task.id] = _CompiledTask(task)
+
+            if entry.error is not None:
+                item["error"] = entry.error
+            elif entry.rule is None:
+                item["dst_filename"] = os.path.basename(filepath)
+            elif entry.parser is not None:
+                parse_groups.setdefault(task.id, []).append(index)
+            else:
+                regex_groups.setdefault(task.id, []).append(index)
+
+        for task_id, indexes in parse_groups.items():
+            self._render_parse_batch(compiled[task_id], [items[i] for i in indexes])
+        for task_id, indexes in regex_groups.items():
+            self._render_regex_batch(compiled[task_id], [items[i] for i in indexes])
+
+        for item in items:
+            dst_filename = item.pop("dst_filename")
+            if item["error"] is None and dst_filename is not None:
+                move_to = compiled[item["task_id"]].task.move_to
+                dst_filepath = str(Path(move_to).joinpath(dst_filename))
+                item["dst_filepath"] = dst_filepath
+                if dst_filepath in destinations:
+                    item["conflict_with"] = destinations[dst_filepath]
+                else:
+                    destinations[dst_filepath] = item["filepath"]
+            yield item
+
+    @staticmethod
+    def _empty_item(filepath: str) -> dict:
+        return {
+            "filepath": filepath,
+            "task_id": None,
+            "task_name": None,
+            "dst_filename": None,
+            "dst_filepath": None,
+            "conflict_with": None,
+            "error": None,
+        }
+
+    @staticmethod
+    def _render_parse_batch(entry: _CompiledTask, items: list[dict]) -> None:
+        """比對同任務的所有檔名後，一次套用 episode 偏移再格式化。"""
+        matched = []
+        groups_list = []
+        for item in items:
+            result = entry.parser.parse(os.path.basename(item["filepath"]))
+            if result is None:
+                item["error"] = "檔名不符合來源檔案名稱規則"
+                continue
+            matched.append(item)
+            groups_list.append(result.named)
+        for item, groups in zip(matched, entry.rule.offset_parse_groups_many(groups_list)):
+            item["dst_filename"] = safe_format(entry.rule.dst, groups)
+
+    @staticmethod
+    def _render_regex_batch(entry: _CompiledTask, items: list[dict]) -> None:
+        """以兩次沙箱子行程（偏移時）或一次（無偏移時）處理同任務的所有檔名。"""
+        filenames = [os.path.basename(item["filepath"]) for item in items]
+        replacements = [entry.rule.dst] * len(filenames)
+
+        if entry.rule.should_apply_offset():
+            group_dicts = []
+            for i, outcome in enumerate(safe_search_many(entry.regex, filenames)):
+                if not outcome.ok:
+                    items[i]["error"] = outcome.error
+                group_dicts.append(
+                    outcome.value.groupdict() if outcome.ok and outcome.value is not None else None
+                )
+            replacements = entry.rule.offset_regex_replacements(group_dicts)
+
+        pending = [i for i, item in enumerate(items) if item["error"] is None]
+        outcomes = safe_sub_many(
+            entry.regex, [(replacements[i], filenames[i]) for i in pending]
+        )
+        for i, outcome in zip(pending, outcomes):
+            if outcome.ok:
+                items[i]["dst_filename"] = outcome.value
+            else:
+                items[i]["error"] = outcome.error
@@ -1,9 +1,17 @@
 import datetime
+import time
 
-from parse import parse
-
+from backend.utils.parse_template import compile_parse, parse_named
 from backend.utils.safe_format import safe_format
-from backend.utils.safe_regex import safe_compile, safe_search, safe_sub
+from backend.utils.safe_regex import (
+    safe_compile,
+    safe_search,
+    safe_search_sub_many,
+    safe_sub,
+)
+
+# 批次預覽的總時間預算（秒）
+BATCH_PREVIEW_TIMEOUT = 10
 
 
 class ParsePreviewService:
@@ -24,16 +32,22 @@ class ParsePreviewService:
 
         回傳:
             dict | None: 如果解析成功，回傳包含解析後的分組 (groups) 的字典；否則回傳 None。
+
+        例外:
+            ValueError: pattern 包含無法辨識的型別。
         """
-        result = parse(pattern, text)
-        if not result:
+        groups = parse_named(pattern, text)
+        if groups is None:
             return None
 
-        groups = result.named
+        return ParsePreviewService._normalize_groups(groups)
+
+    @staticmethod
+    def _normalize_groups(groups: dict) -> dict:
+        """將 datetime 分組值轉為字串，讓結果可序列化為 JSON。"""
         for key, value in groups.items():
             if isinstance(value, datetime.datetime):
                 groups[key] = str(value)
-
         return groups
 
     @staticmethod
@@ -80,6 +94,44 @@ class ParsePreviewService:
 
         return {**response, "groups": groups, "formatted": formatted}
 
+    @staticmethod
+    def preview_batch(
+        src_pattern: str,
+        texts: list[str],
+        dst_pattern: str,
+        timeout: float = BATCH_PREVIEW_TIMEOUT,
+    ) -> dict:
+        """以同一個已編譯的 parse 樣板預覽多筆文字。
+
+        Why: 規則編輯器一次貼上上百個樣本檔名，逐筆呼叫 parse() 會重複編譯樣板；
+        超出總時間預算的項目會被逐筆標記為逾時，而不是讓整個請求失敗。
+        時間預算只在項目之間檢查，已開始的單筆解析與格式化不會被中斷；
+        單筆解析或格式化失敗只標記該筆，不影響其他項目。
+
+        Raises:
+            ValueError: src_pattern 不是有效的 parse 樣板。
+        """
+        parser = compile_parse(src_pattern)
+        deadline = time.monotonic() + timeout
+        items = []
+        for text in texts:
+            item = {"text": text, "groups": {}, "formatted": "", "error": None, "timed_out": False}
+            if time.monotonic() > deadline:
+                item["error"] = f"預覽逾時（超過 {timeout} 秒）"
+                item["timed_out"] = True
+            else:
+                try:
+                    result = parser.parse(text)
+                    if result is not None:
+                        groups = ParsePreviewService._normalize_groups(dict(result.named))
+                        item["groups"] = groups
+                        item["formatted"] = ParsePreviewService._format(dst_pattern, groups)
+                except Exception as e:
+                    item["groups"] = {}
+                    item["error"] = str(e)
+            items.append(item)
+        return {"src_pattern": src_pattern, "dst_pattern": dst_pattern, "items": items}
+
 
 class RegexPreviewService:
     """Preview the result of a regex-based rename without touching the filesystem.
@@ -145,3 +197,41 @@ class RegexPreviewService:
         )
 
         return {**response, "groups": groups, "formatted": formatted}
+
+    @staticmethod
+    def preview_batch(
+        src_pattern: str,
+        texts: list[str],
+        dst_pattern: str,
+        timeout: float = BATCH_PREVIEW_TIMEOUT,
+    ) -> dict:
+        """以單一沙箱子行程預覽多筆文字的分組與替換結果。
+
+        Why: 單筆預覽每次呼叫會啟動兩個子行程；批次預覽只編譯一次 pattern，
+        並在總時間預算內逐筆執行，失敗或逾時的項目逐筆標記。
+
+        Raises:
+            ValueError: pattern 長度超過上限。
+            re.error: pattern 語法無效。
+        """
+        compiled = safe_compile(src_pattern)
+        outcomes = safe_search_sub_many(compiled, dst_pattern, texts, timeout=timeout)
+        items = []
+        for text, outcome in zip(texts, outcomes):
+            item = {
+                "text": text,
+                "groups": {"named_group": {}, "numbered_group": []},
+                "formatted": "",
+                "error": outcome.error,
+                "timed_out": outcome.timed_out,
+            }
+            if outcome.ok:
+                match, formatted = outcome.value
+                if match is not None:
+                    item["groups"] = {
+                        "named_group": match.groupdict(),
+                        "numbered_group": list(match.groups()),
+                    }
+                item["formatted"] = formatted
+            items.append(item)
+        return {"src_pattern": src_pattern, "dst_pattern": dst_pattern, "items": items}
@@ -1,4 +1,7 @@
 import json
+import threading
+import weakref
+from dataclasses import dataclass, field
 
 from backend import models, schemas
 from backend.repositories.setting import SettingRepository
@@ -6,9 +9,34 @@ from backend.utils.env_config import (
     get_allow_webui_setting,
     get_env_allowed_directories,
     get_env_allowed_source_directories,
+    get_settings_env_key,
 )
 from backend.utils.logger import logger
-from backend.utils.path_validator import validate_allowed_directories
+from backend.utils.path_validator import (
+    clear_path_matcher_cache,
+    validate_allowed_directories,
+)
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """某一版本設定的已解析內容。
+
+    Why: Webhook 與目錄瀏覽每次請求都需要允許目錄清單，
+    快照讓這些讀取只需比對一次版本號，而不必重新查詢整張表、解析 JSON 與環境變數。
+    """
+
+    version: int
+    env_key: tuple[str | None, ...]
+    values: dict = field(default_factory=dict)
+    env_paths: dict[str, list[str]] = field(default_factory=dict)
+    merged_paths: dict[str, list[str]] = field(default_factory=dict)
+    allow_webui_setting: bool = True
+
+
+# 每個資料庫引擎各自保存最新的設定快照；引擎被回收時一併釋放
+_snapshots: "weakref.WeakKeyDictionary[object, SettingsSnapshot]" = weakref.WeakKeyDictionary()
+_snapshots_lock = threading.Lock()
 
 
 class SettingService:
@@ -52,30 +80,75 @@ class SettingService:
         frontend can consume them without extra parsing. Directory fields are
         merged with environment variables and returned as {path, source}[] format.
         """
-        settings = self.repository.get_all()
-        result: dict = {}
-        for setting in settings:
-            if setting.key in self._JSON_FIELDS:
-                try:
-                    result[setting.key] = json.loads(setting.value)
-                except (json.JSONDecodeError, TypeError):
-                    result[setting.key] = []
-            else:
-                result[setting.key] = setting.value
+        snapshot = self.get_settings_snapshot()
+        result: dict = {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in snapshot.values.items()
+        }
 
         # 合併環境變數項目，轉為 {path, source} 結構
         for key in self._JSON_FIELDS:
             db_paths = result.get(key, [])
             if not isinstance(db_paths, list):
                 db_paths = []
-            env_paths = self._get_env_paths(key)
-            result[key] = self._merge_with_env(db_paths, env_paths)
+            result[key] = self._merge_with_env(db_paths, snapshot.env_paths[key])
 
         # 加入 allow_webui_setting 旗標
-        result["allow_webui_setting"] = get_allow_webui_setting()
+        result["allow_webui_setting"] = snapshot.allow_webui_setting
 
         return result
 
+    def get_settings_snapshot(self) -> SettingsSnapshot:
+        """回傳目前的設定快照；資料庫版本號或相關環境變數改變時重新載入。
+
+        Why: 每次讀取只需查詢 cache_version 的單一資料列。
+        版本號由 Setting 的寫入在同一交易中遞增，
+        因此多個 worker 行程之間也能在下一次讀取時看到最新設定。
+        """
+        version = self.repository.get_version()
+        env_key = get_settings_env_key()
+        bind = self.repository.db.get_bind()
+        with _snapshots_lock:
+            cached = _snapshots.get(bind)
+        if cached is not None and cached.version == version and cached.env_key == env_key:
+            return cached
+
+        snapshot = self._load_snapshot(version, env_key)
+        with _snapshots_lock:
+            _snapshots[bind] = snapshot
+        return snapshot
+
+    def _load_snapshot(self, version: int, env_key: tuple) -> SettingsSnapshot:
+        values: dict = {}
+        for setting in self.repository.get_all():
+            if setting.key in self._JSON_FIELDS:
+                try:
+                    values[setting.key] = json.loads(setting.value)
+                except (json.JSONDecodeError, TypeError):
+                    values[setting.key] = []
+            else:
+                values[setting.key] = setting.value
+
+        env_paths = {key: self._get_env_paths(key) for key in self._JSON_FIELDS}
+        merged_paths = {}
+        for key in self._JSON_FIELDS:
+            db_paths = values.get(key, [])
+            if not isinstance(db_paths, list):
+                db_paths = []
+            merged = list(env_paths[key])
+            env_set = set(merged)
+            merged.extend(p for p in db_paths if p not in env_set)
+            merged_paths[key] = merged
+
+        return SettingsSnapshot(
+            version=version,
+            env_key=env_key,
+            values=values,
+            env_paths=env_paths,
+            merged_paths=merged_paths,
+            allow_webui_setting=get_allow_webui_setting(),
+        )
+
     def get_setting_by_key(self, key: str) -> models.Setting | None:
         return self.repository.get(key)
 
@@ -117,35 +190,22 @@ class SettingService:
             setting = self.repository.create_or_update(key, json_value)
             updated.append(setting)
 
+        if json_fields:
+            clear_path_matcher_cache()
         return updated
 
     def _get_json_list_setting(self, key: str) -> list[str]:
-        """從資料庫讀取 JSON 陣列設定，反序列化後回傳，預設為空陣列。
+        """回傳資料庫中 JSON 陣列設定的已解析內容，預設為空陣列。
 
         Why: allowed_directories 和 allowed_source_directories 共用相同的
-        讀取與反序列化邏輯，提取為共用方法避免重複。
+        讀取與反序列化邏輯，解析結果保存在設定快照中。
         """
-        setting = self.repository.get(key)
-        if setting is None:
-            return []
-        try:
-            dirs = json.loads(setting.value)
-            if isinstance(dirs, list):
-                return dirs
-            return []
-        except (json.JSONDecodeError, TypeError):
-            return []
+        value = self.get_settings_snapshot().values.get(key, [])
+        return list(value) if isinstance(value, list) else []
 
     def _get_merged_directories(self, key: str) -> list[str]:
         """合併資料庫與環境變數的目錄清單，回傳去重後的路徑陣列。"""
-        db_paths = self._get_json_list_setting(key)
-        env_paths = self._get_env_paths(key)
-        merged = list(env_paths)
-        env_set = set(env_paths)
-        for p in db_paths:
-            if p not in env_set:
-                merged.append(p)
-        return merged
+        return list(self.get_settings_snapshot().merged_paths[key])
 
     def get_allowed_source_directories(self) -> list[str]:
         """Return the list of allowed source directory paths, defaulting to ``[]``.
@@ -175,3 +235,4 @@ class SettingService:
         self.repository.create_or_update(
             "allowed_directories", json.dumps(directories)
         )
+        clear_path_matcher_cache()
@@ -24,6 +24,12 @@ class TagService:
     def get_all_tags(self) -> list[models.Tag]:
         return self.repository.get_all()
 
+    def get_task_counts(self) -> list[schemas.TagTaskCount]:
+        return [
+            schemas.TagTaskCount(tag_id=tag_id, task_count=count)
+            for tag_id, count in self.repository.get_task_counts()
+        ]
+
     def get_tag_by_id(self, tag_id: str) -> models.Tag | None:
         return self.repository.get_by_id(tag_id)
 
@@ -1,10 +1,24 @@
+import re
+import threading
+import weakref
+from typing import Literal
+
 from backend import models, schemas
 from backend.exceptions.task_exception import (
+    InvalidTaskInclude,
     TaskAlreadyExists,
     TaskNotFound,
 )
 from backend.repositories.task import TaskRepository
+from backend.utils.include_pattern import compile_include
 from backend.utils.logger import logger
+from backend.worker.matcher import TaskMatcher, TaskMatchMode
+
+# 每個資料庫引擎各自保存 (任務版本號, 比對模式, 比對器)；引擎被回收時一併釋放
+_matchers: "weakref.WeakKeyDictionary[object, tuple[int, TaskMatchMode, TaskMatcher]]" = (
+    weakref.WeakKeyDictionary()
+)
+_matchers_lock = threading.Lock()
 
 
 class TaskService:
@@ -35,14 +49,22 @@ class TaskService:
             raise TaskNotFound(task_id)
         return task
 
-    def get_all_tasks(self) -> list[models.Task | None]:
+    def get_all_tasks(
+        self,
+        tag_ids: list[str] | None = None,
+        tag_match: Literal["any", "all"] = "any",
+    ) -> list[models.Task | None]:
         """
-        取得所有任務
+        取得所有任務，可依標籤篩選
+
+        Args:
+            tag_ids: 篩選的標籤 id，未提供時回傳全部任務
+            tag_match: any 為包含任一標籤，all 為包含全部標籤
 
         Returns:
-            list[models.Task | None]: 所有任務清單
+            list[models.Task | None]: 任務清單
         """
-        return self.repository.get_all()
+        return self.repository.get_all(tag_ids=tag_ids, tag_match=tag_match)
 
     def get_enabled_tasks(self) -> list[models.Task | None]:
         """
@@ -53,6 +75,30 @@ class TaskService:
         """
         return self.repository.get_enabled_tasks()
 
+    def get_task_matcher(self, mode: TaskMatchMode) -> TaskMatcher:
+        """回傳已啟用任務的比對器；任務版本號或比對模式改變時才重新建立。
+
+        Why: 建立比對器需要查詢全部任務、編譯 include 並建立類別索引，
+        每個 Webhook 都重建會重複這些成本；快取後一般事件只需查詢 cache_version 的單一資料列。
+        版本號由 Task 的寫入在同一交易中遞增，因此多個 worker 行程之間也能在下一次比對時看到最新任務。
+
+        快取的任務會從 session 中移出，之後的提交不會讓它們過期，可在不同工作的 session 與執行緒間共用。
+        """
+        version = self.repository.get_version()
+        bind = self.repository.db.get_bind()
+        with _matchers_lock:
+            cached = _matchers.get(bind)
+        if cached is not None and cached[0] == version and cached[1] == mode:
+            return cached[2]
+
+        tasks = self.repository.get_enabled_tasks()
+        for task in tasks:
+            self.repository.db.expunge(task)
+        matcher = TaskMatcher(tasks, mode)
+        with _matchers_lock:
+            _matchers[bind] = (version, mode, matcher)
+        return matcher
+
     def get_task_by_id(self, task_id: str) -> models.Task | None:
         """
         取得指定 id 的任務
@@ -65,6 +111,18 @@ class TaskService:
         """
         return self.repository.get_by_id(task_id)
 
+    def get_tasks_by_ids(self, task_ids: list[str]) -> list[models.Task]:
+        """
+        取得多個指定 id 的任務
+
+        Args:
+            task_ids (list[str]): 任務的 id 清單
+
+        Returns:
+            list[models.Task]: 找到的任務清單（不存在的 id 會被略過）
+        """
+        return self.repository.get_by_ids(task_ids)
+
     def get_task_by_name(self, name: str) -> models.Task | None:
         """
         取得指定名稱的任務
@@ -174,9 +232,36 @@ class TaskService:
         Raises:
             TaskNotFound: 任一 id 不存在
             TaskAlreadyExists: 更新後名稱與其他任務重名
+            InvalidTaskInclude: 套用 patch 後的 include 無法依 include_type 編譯
         """
+        self._validate_patched_includes(items)
         return self.repository.batch_update(items)
 
+    def _validate_patched_includes(self, items: list[schemas.TaskBatchUpdateItem]) -> None:
+        """以任務合併 patch 後的 include 與 include_type 驗證規則。
+
+        Why: patch 可能只帶 include 或 include_type 其中之一，schema 無法得知另一個欄位的現值；
+        未驗證就儲存的無效 pattern 會被比對器略過，任務將不再比對任何檔案。
+        """
+        patched = [
+            item
+            for item in items
+            if item.patch.include is not None or item.patch.include_type is not None
+        ]
+        if not patched:
+            return
+        existing = {task.id: task for task in self.repository.get_by_ids([i.id for i in patched])}
+        for item in patched:
+            task = existing.get(item.id)
+            if task is None:
+                raise TaskNotFound(item.id)
+            include_type = item.patch.include_type or task.include_type
+            include = item.patch.include if item.patch.include is not None else task.include
+            try:
+                compile_include(include_type, include)
+            except (re.error, ValueError) as e:
+                raise InvalidTaskInclude(item.id, str(e)) from e
+
     def batch_delete_tasks(self, ids: list[str]) -> list[str]:
         """批量刪除任務
 
@@ -34,3 +34,150 @@ def get_allow_webui_setting() -> bool:
     預設為 True（允許）。設為 'false'（大小寫不敏感）時回傳 False。
     """
     return os.getenv("ALLOW_WEBUI_SETTING", "true").lower() != "false"
+
+
+def _get_float(env_key: str, default: float) -> float:
+    """解析浮點數環境變數，格式錯誤或非正數時回傳預設值。"""
+    try:
+        value = float(os.getenv(env_key, ""))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def get_backlog_scan_on_startup() -> bool:
+    """從環境變數 BACKLOG_SCAN_ON_STARTUP 取得是否於啟動時執行積壓檔案掃描。
+
+    預設為 False。設為 'true'（大小寫不敏感）時回傳 True。
+    """
+    return os.getenv("BACKLOG_SCAN_ON_STARTUP", "false").lower() == "true"
+
+
+def get_backlog_scan_rate() -> float:
+    """從環境變數 BACKLOG_SCAN_RATE 取得積壓掃描每秒最多派送的檔案數，預設 2。"""
+    return _get_float("BACKLOG_SCAN_RATE", 2.0)
+
+
+def get_backlog_scan_min_age() -> float:
+    """從環境變數 BACKLOG_SCAN_MIN_AGE 取得檔案最後修改後需經過的秒數，預設 60。
+
+    Why: 仍在寫入中的檔案不應被派送，僅處理已靜置一段時間的檔案。
+    """
+    return _get_float("BACKLOG_SCAN_MIN_AGE", 60.0)
+
+
+def get_watcher_enabled() -> bool:
+    """從環境變數 WATCHER_ENABLED 取得是否啟用來源目錄監看。
+
+    預設為 False。設為 'true'（大小寫不敏感）時回傳 True。
+    """
+    return os.getenv("WATCHER_ENABLED", "false").lower() == "true"
+
+
+def get_watcher_mode() -> str:
+    """從環境變數 WATCHER_MODE 取得監看模式（auto | inotify | polling），預設 auto。"""
+    mode = os.getenv("WATCHER_MODE", "auto").lower()
+    return mode if mode in ("auto", "inotify", "polling") else "auto"
+
+
+def get_watcher_settle_seconds() -> float:
+    """從環境變數 WATCHER_SETTLE_SECONDS 取得檔案大小需維持不變的秒數，預設 10。"""
+    return _get_float("WATCHER_SETTLE_SECONDS", 10.0)
+
+
+def get_watcher_poll_interval() -> float:
+    """從環境變數 WATCHER_POLL_INTERVAL 取得輪詢模式的掃描間隔秒數，預設 30。"""
+    return _get_float("WATCHER_POLL_INTERVAL", 30.0)
+
+
+def get_watcher_max_watches() -> int | None:
+    """從環境變數 WATCHER_MAX_WATCHES 取得 inotify watch 數量上限。
+
+    未設定或格式錯誤時回傳 None，由監看器依系統上限自動決定。
+    """
+    try:
+        value = int(os.getenv("WATCHER_MAX_WATCHES", ""))
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+def get_webhook_dedup_ttl() -> float:
+    """從環境變數 WEBHOOK_DEDUP_TTL 取得 Webhook 去重紀錄的保留秒數，預設 600。"""
+    return _get_float("WEBHOOK_DEDUP_TTL", 600.0)
+
+
+def get_settings_env_key() -> tuple[str | None, ...]:
+    """回傳會影響設定內容的環境變數原始值，作為設定快照的失效判斷依據。"""
+    return (
+        os.getenv("ALLOWED_DIRECTORIES"),
+        os.getenv("ALLOWED_SOURCE_DIRECTORIES"),
+        os.getenv("ALLOW_WEBUI_SETTING"),
+    )
+
+
+def get_workers() -> int:
+    """從環境變數 WORKERS 取得 uvicorn worker 行程數，預設 1。"""
+    try:
+        return max(1, int(os.getenv("WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def get_trace_sample_rate() -> float:
+    """從環境變數 TRACE_SAMPLE_RATE 取得記錄工作階段追蹤的比例（0～1），預設 0.1。
+
+    Why: 每個工作都寫入一筆追蹤會讓 job_trace 表隨下載量線性成長，
+    預設只取樣一成即足以觀察各階段耗時；排查問題時可暫時調為 1，設為 0 即停用。
+    """
+    try:
+        value = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+    except ValueError:
+        return 0.1
+    return min(max(value, 0.0), 1.0)
+
+
+def get_trace_retention_days() -> int:
+    """從環境變數 TRACE_RETENTION_DAYS 取得工作階段追蹤的保留天數，預設 7。
+
+    Why: 追蹤只用於排查近期的工作，寫入新追蹤時一併刪除過期的資料列，避免資料表無限成長；
+    設為 0 表示不清除。
+    """
+    try:
+        return max(0, int(os.getenv("TRACE_RETENTION_DAYS", "7")))
+    except ValueError:
+        return 7
+
+
+def get_download_workers() -> int:
+    """從環境變數 DOWNLOAD_WORKERS 取得下載處理佇列的背景執行緒數，預設 1。
+
+    Why: 跨裝置複製與正則沙箱會讓單一工作耗時數秒，多個執行緒可讓其他檔案不必排隊等待；
+    合適的數量可先以 `python -m benchmarks.loadtest` 依部署環境量測。
+    """
+    try:
+        return max(1, int(os.getenv("DOWNLOAD_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def get_profiling_enabled() -> bool:
+    """是否提供執行期間剖析的管理端點：ENV=development 或 PROFILING_ENABLED=true 時啟用。
+
+    Why: 剖析端點會寫入檔案並拖慢被剖析的工作，與 API 文件相同，預設只在開發環境開放；
+    正式環境需要診斷時再明確開啟。
+    """
+    return (
+        os.getenv("ENV") == "development"
+        or os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    )
+
+
+def get_task_match_mode() -> str:
+    """從環境變數 TASK_MATCH_MODE 取得任務比對模式：priority（預設）或 most_specific。
+
+    Why: 預設依任務的優先順序取第一個符合的任務；
+    most_specific 讓 include 最長的任務勝出，適合同一系列有多個季度任務的情況。
+    """
+    mode = os.getenv("TASK_MATCH_MODE", "priority").lower()
+    return mode if mode in ("priority", "most_specific") else "priority"
@@ -0,0 +1,135 @@
+"""行程內事件匯流排，將任務日誌與工作狀態即時推送給 WebSocket／SSE 訂閱者。
+
+Why: 前端原本以輪詢 GET /tasks/{id}/logs 取得日誌，每次都重新載入整份清單並查詢資料庫。
+改由日誌寫入與 Worker 狀態變化主動發布事件後，訂閱者只會收到新增的內容，
+資料庫不再承擔輪詢負載。
+
+發布端可能位於任何執行緒（佇列 Worker、監看器），訂閱端則在 asyncio event loop 中等待，
+因此每個訂閱者以加鎖的有界緩衝區接收事件，並透過 call_soon_threadsafe 喚醒。
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+# 每個訂閱者最多暫存的事件數；消化過慢時捨棄最舊的事件
+SUBSCRIBER_BUFFER_SIZE = 256
+
+
+class Subscription:
+    """單一訂閱者的有界事件緩衝區。
+
+    Why: 慢速客戶端不可拖慢發布端，也不可讓記憶體無限制成長。
+    緩衝區滿時捨棄最舊的事件，並在下一次讀取時先送出 overflow 事件，
+    讓客戶端知道需要改以 REST API 重新同步。
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        task_id: str | None = None,
+        maxsize: int = SUBSCRIBER_BUFFER_SIZE,
+    ):
+        self.task_id = task_id
+        self.dropped = 0
+        self._loop = loop
+        self._buffer: deque[dict] = deque(maxlen=maxsize)
+        self._pending_dropped = 0
+        self._lock = threading.Lock()
+        self._ready = asyncio.Event()
+
+    def matches(self, event: dict) -> bool:
+        """未指定 task_id 的訂閱者接收所有事件，否則只接收該任務的事件。"""
+        return self.task_id is None or event["payload"].get("task_id") == self.task_id
+
+    def push(self, event: dict) -> None:
+        """放入事件並喚醒等待中的讀取端，可由任何執行緒呼叫。"""
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self._pending_dropped += 1
+                self.dropped += 1
+            self._buffer.append(event)
+        try:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            # event loop 已關閉，訂閱者即將被移除
+            pass
+
+    def _pop(self) -> dict | None:
+        with self._lock:
+            if self._pending_dropped:
+                dropped, self._pending_dropped = self._pending_dropped, 0
+                return make_event("overflow", {"dropped": dropped})
+            if self._buffer:
+                return self._buffer.popleft()
+            self._ready.clear()
+            return None
+
+    async def get(self, timeout: float | None = None) -> dict | None:
+        """取得下一個事件；等待超過 timeout 秒時回傳 None。"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            event = self._pop()
+            if event is not None:
+                return event
+            if deadline is None:
+                await self._ready.wait()
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._ready.wait(), remaining)
+            except TimeoutError:
+                return None
+
+
+def make_event(event: str, payload: dict) -> dict:
+    """建立與 WebSocket 事件格式一致的事件內容（timestamp 為毫秒）。"""
+    return {
+        "event": event,
+        "payload": payload,
+        "timestamp": int(time.time() * 1000),
+    }
+
+
+class EventBus:
+    """將事件扇出給所有符合條件的訂閱者。"""
+
+    def __init__(self):
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(
+        self, task_id: str | None = None, maxsize: int = SUBSCRIBER_BUFFER_SIZE
+    ) -> Subscription:
+        """在目前執行中的 event loop 建立訂閱者。"""
+        subscription = Subscription(
+            asyncio.get_running_loop(), task_id=task_id, maxsize=maxsize
+        )
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event: str, payload: dict) -> None:
+        """發布事件；沒有訂閱者時不做任何事，因此可在熱路徑上直接呼叫。"""
+        if not self._subscribers:
+            return
+        message = make_event(event, payload)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            if subscription.matches(message):
+                subscription.push(message)
+
+
+event_bus = EventBus()
@@ -0,0 +1,38 @@
+"""任務 include 規則的編譯。
+
+Why: include 除了子字串之外也可以是正則表達式或萬用字元（glob），
+例如同時比對字幕組、標題與解析度。兩者都編譯成正則表達式，
+交由 safe_regex 的長度限制與沙箱逾時保護執行。
+"""
+
+import fnmatch
+import re
+from typing import Literal
+
+from backend.utils.safe_regex import safe_compile
+
+IncludeType = Literal["substring", "regex", "glob"]
+
+# glob 的長度上限，與 safe_compile 對正則表達式的預設上限相同
+GLOB_MAX_LENGTH = 500
+
+
+def compile_include(include_type: str, include: str) -> re.Pattern | None:
+    """將 include 編譯為正則表達式；子字串比對不需編譯，回傳 None。
+
+    regex 以 re.search 比對完整路徑；glob 需與完整路徑整段相符，`*` 也會跨越 `/`。
+    兩者皆不分大小寫，與重新命名的 regex 規則一致。
+    Worker 經由 TaskService 快取的 TaskMatcher 編譯，每個任務在任務變更前只編譯一次。
+
+    Raises:
+        ValueError: include 長度超過上限。
+        re.error: 正則表達式語法無效。
+    """
+    if include_type == "regex":
+        return safe_compile(include)
+    if include_type == "glob":
+        # 以原始 glob 檢查長度，translate 後的正則表達式會比原字串長
+        if len(include) > GLOB_MAX_LENGTH:
+            raise ValueError(f"萬用字元長度超過上限 {GLOB_MAX_LENGTH} 字元")
+        return re.compile(r"\A" + fnmatch.translate(include), re.IGNORECASE)
+    return None
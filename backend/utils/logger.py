@@ -21,6 +21,7 @@ logger.add(
     level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format="{time:YYYY-MM-DDTHH:mm:ss.SSSSZ} | {level: <8} | {name}:{function}:{line} - {message} | {extra}",
     rotation="00:00",  # Rotate daily at midnight
+    delay=True,  # 第一次寫入時才建立檔案，不在 import 時開檔
     enqueue=True,
     encoding="utf-8",
     colorize=True,
@@ -31,6 +32,7 @@ logger.add(
     level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format="{time:YYYY-MM-DDTHH:mm:ss.SSSSZ} | {level: <8} | {name}:{function}:{line} - {message} | {extra}",
     rotation="00:00",  # Rotate daily at midnight
+    delay=True,  # 第一次寫入時才建立檔案，不在 import 時開檔
     enqueue=True,
     encoding="utf-8",
     colorize=True,
@@ -0,0 +1,234 @@
+"""輕量的行程內指標登錄表，輸出 Prometheus 文字格式。
+
+Why: 需要觀察 Worker 各階段（比對、重新命名、正則沙箱、移動、日誌寫入）的耗時與失敗，
+但不想為此引入額外相依套件。記錄時只做一次加鎖的累加，
+輸出格式只在 /metrics 被抓取時才組合，沒有人抓取時幾乎沒有額外成本。
+"""
+
+import abc
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+# 預設的耗時分桶（秒），涵蓋毫秒級的比對到數十秒的跨裝置複製
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    @abc.abstractmethod
+    def _samples(self) -> list[str]:
+        """回傳此指標的樣本行。"""
+
+
+class Counter(_Metric):
+    """只增不減的計數器。"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """於抓取時呼叫回呼函式取得目前值的量測值。"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def _samples(self) -> list[str]:
+        return [f"{self.name} {_format_value(self.callback())}"]
+
+
+class Histogram(_Metric):
+    """分桶統計的分佈，用於耗時與位元組數。"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 每組標籤：[各分桶的非累積計數..., +Inf 計數, 總和]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """以 with 區塊量測耗時（秒），區塊拋出例外時仍會記錄。"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return int(sum(state[:-1])) if state else 0
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        lines = []
+        for key, state in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} "
+                    f"{_format_value(cumulative)}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """收集所有指標並輸出 Prometheus 文字格式。"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name: str, documentation: str, callback: Callable[[], float]) -> Gauge:
+        return self._register(Gauge(name, documentation, callback))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# --- Worker 流程指標 ---
+
+WEBHOOK_EVENTS = registry.counter(
+    "movera_webhook_events_total", "Webhook 完成事件數，依是否接受處理區分", ("result",)
+)
+JOBS = registry.counter(
+    "movera_jobs_total", "處理完成的工作數，依結果區分", ("status",)
+)
+JOB_FAILURES = registry.counter(
+    "movera_job_failures_total", "各任務的處理失敗次數", ("task_id", "stage")
+)
+MATCH_DURATION = registry.histogram(
+    "movera_match_duration_seconds", "檔案與任務比對的耗時"
+)
+RENAME_DURATION = registry.histogram(
+    "movera_rename_duration_seconds", "重新命名的耗時，依規則類型區分", ("rule",)
+)
+REGEX_SANDBOX_SPAWN = registry.histogram(
+    "movera_regex_sandbox_spawn_seconds", "啟動正則沙箱子行程的耗時"
+)
+REGEX_SANDBOX_EXEC = registry.histogram(
+    "movera_regex_sandbox_exec_seconds", "正則沙箱自啟動到取得結果的耗時", ("op",)
+)
+MOVE_DURATION = registry.histogram(
+    "movera_move_duration_seconds", "移動檔案的耗時，依是否跨裝置區分", ("device",)
+)
+MOVE_BYTES = registry.counter(
+    "movera_move_bytes_total", "移動的檔案位元組數，依是否跨裝置區分", ("device",)
+)
+LOG_WRITE_DURATION = registry.histogram(
+    "movera_log_write_duration_seconds", "寫入任務日誌的耗時"
+)
+DB_POOL_CHECKOUTS = registry.counter(
+    "movera_db_pool_checkouts_total", "自資料庫連線池取出連線的次數"
+)
+DB_POOL_WAIT = registry.histogram(
+    "movera_db_pool_wait_seconds", "Worker 工作開始時自連線池取得資料庫連線的等待時間"
+)
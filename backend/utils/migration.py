@@ -0,0 +1,28 @@
+"""資料庫結構版本檢查。
+
+Why: 每次啟動都呼叫 Alembic upgrade 需要載入 Alembic、執行 env.py、
+掃描所有遷移檔並開啟資料庫，在容器重新啟動時佔了大部分的啟動時間。
+結構已是最新版本時，只需讀取 alembic_version 的一列並與建置時的 head 比對即可略過。
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+# 最新遷移的 revision；新增遷移檔時必須同步更新（tests/backend/test_migration.py 會檢查）
+MIGRATION_HEAD = "e1f2a3b4c5d6"
+
+
+def get_current_revisions(engine: Engine) -> set[str]:
+    """讀取資料庫目前的 revision；尚未遷移過時回傳空集合。"""
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(text("SELECT version_num FROM alembic_version"))
+            return {row[0] for row in rows}
+    except OperationalError:
+        return set()
+
+
+def is_schema_at_head(engine: Engine) -> bool:
+    """資料庫結構是否已是建置時的最新版本。"""
+    return get_current_revisions(engine) == {MIGRATION_HEAD}
@@ -1,6 +1,10 @@
 import shutil
+import stat
+import time
 from pathlib import Path
 
+from backend.utils.metrics import MOVE_BYTES, MOVE_DURATION
+
 
 def move(filepath: str | Path, dst_path: str | Path) -> None:
     """
@@ -19,4 +23,12 @@ def move(filepath: str | Path, dst_path: str | Path) -> None:
         dst_path = Path(dst_path)
     if dst_path.is_dir() is False:
         dst_path.mkdir(parents=True, exist_ok=True)
+
+    # 同裝置只需 rename，跨裝置則是完整複製，兩者耗時差距極大，因此分開統計
+    src_stat = filepath.stat()
+    device = "same" if src_stat.st_dev == dst_path.stat().st_dev else "cross"
+    started = time.perf_counter()
     shutil.move(filepath, dst_path)
+    MOVE_DURATION.observe(time.perf_counter() - started, device=device)
+    if stat.S_ISREG(src_stat.st_mode):
+        MOVE_BYTES.inc(src_stat.st_size, device=device)
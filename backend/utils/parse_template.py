@@ -0,0 +1,36 @@
+"""parse 樣板的編譯快取與比對。
+
+Why: parse.parse() 每次呼叫都會把樣板重新轉換並編譯成正則表達式，
+Worker、預覽與 Planner 對同一個任務樣板反覆比對上千個檔名，編譯結果應重複使用。
+"""
+
+from functools import lru_cache
+
+import parse
+
+# 快取的樣板數量上限；每個任務一個樣板，預覽時使用者輸入的樣板也會佔用名額
+PARSE_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def compile_parse(pattern: str) -> parse.Parser:
+    """回傳已編譯的 parse 樣板，相同樣板只編譯一次。
+
+    Raises:
+        ValueError: 樣板包含無法辨識的型別（如 `{episode:zz}`）。
+    """
+    return parse.compile(pattern)
+
+
+def parse_named(pattern: str, text: str) -> dict | None:
+    """以已編譯的樣板比對整段文字，回傳具名欄位；不符合時回傳 None。
+
+    型別欄位會轉換為對應型別，例如 `{episode:d}` 取得 int、`{version:f}` 取得 float。
+
+    Raises:
+        ValueError: 樣板包含無法辨識的型別。
+    """
+    result = compile_parse(pattern).parse(text)
+    if result is None:
+        return None
+    return dict(result.named)
@@ -4,7 +4,9 @@ Why: 路徑驗證邏輯被 SettingService 和 DirectoryService 共用，
 提取為獨立模組避免重複且確保驗證行為一致。
 """
 
-from pathlib import PurePosixPath, PureWindowsPath
+from functools import lru_cache
+from pathlib import Path, PurePosixPath, PureWindowsPath
+from typing import Iterable
 
 
 def is_absolute_path(path: str) -> bool:
@@ -23,3 +25,62 @@ def validate_allowed_directories(directories: list[str]) -> list[str]:
         無效路徑列表（非絕對路徑）
     """
     return [d for d in directories if not is_absolute_path(d)]
+
+
+class AllowedPathMatcher:
+    """將允許目錄預先 resolve 並編譯為前綴樹的白名單比對器。
+
+    Why: 每次檢查都對每個允許目錄呼叫 Path.resolve() 是一連串的檔案系統呼叫，
+    Worker 與目錄瀏覽在每個請求、每個檔案上都會執行白名單檢查。
+    預先編譯後，每次檢查只需 resolve 待檢查的路徑一次，再沿路徑各層查詢前綴樹。
+    """
+
+    _TERMINAL = ""
+
+    def __init__(self, directories: Iterable[str]):
+        self._trie: dict = {}
+        self.roots: list[Path] = []
+        for directory in directories:
+            resolved = Path(directory).resolve()
+            self.roots.append(resolved)
+            node = self._trie
+            for part in resolved.parts:
+                node = node.setdefault(part, {})
+            node[self._TERMINAL] = True
+
+    def __bool__(self) -> bool:
+        return bool(self.roots)
+
+    def matches(self, path: str | Path) -> bool:
+        """*path* resolve 後等於或位於任一允許目錄之下時回傳 True。"""
+        return self.matches_resolved(Path(path).resolve())
+
+    def matches_resolved(self, resolved: Path) -> bool:
+        """比對已 resolve 的路徑，不再存取檔案系統。"""
+        node = self._trie
+        for part in resolved.parts:
+            node = node.get(part)
+            if node is None:
+                return False
+            if self._TERMINAL in node:
+                return True
+        return False
+
+
+@lru_cache(maxsize=32)
+def _compile_matcher(directories: tuple[str, ...]) -> AllowedPathMatcher:
+    return AllowedPathMatcher(directories)
+
+
+def get_path_matcher(directories: Iterable[str]) -> AllowedPathMatcher:
+    """取得允許目錄清單對應的已編譯比對器。
+
+    以目錄清單內容作為快取鍵，因此資料庫設定或環境變數變動時自然產生新的比對器；
+    設定寫入時另呼叫 clear_path_matcher_cache()，讓符號連結的新目標重新 resolve。
+    """
+    return _compile_matcher(tuple(directories))
+
+
+def clear_path_matcher_cache() -> None:
+    """清除已編譯的比對器，於允許目錄設定更新時呼叫。"""
+    _compile_matcher.cache_clear()
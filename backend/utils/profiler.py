@@ -0,0 +1,192 @@
+"""執行期間可開關的效能剖析。
+
+Why: 特定規則組合讓 Worker 吞吐量下降時，過去只能加上自訂程式碼重新啟動才能剖析。
+管理端點開啟剖析後，接下來的 N 個工作或請求會被剖析並寫入 storages/profiles，
+達到數量後自動關閉；未開啟時每次呼叫只多一次屬性檢查。
+
+- cprofile：以 cProfile 記錄完整呼叫，輸出 pstats 格式（.prof），可用 snakeviz 等工具檢視。
+- sampling：每隔數毫秒擷取該執行緒的呼叫堆疊，輸出 folded stacks 格式（.folded），
+  可直接交給 flamegraph.pl 或 speedscope 繪製火焰圖，額外負擔比 cProfile 小。
+"""
+
+import cProfile
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Literal
+
+from backend.utils.logger import PROJECT_ROOT, logger
+
+PROFILE_DIR = PROJECT_ROOT.joinpath("storages", "profiles")
+# sampling 模式的取樣間隔秒數
+SAMPLE_INTERVAL = 0.005
+
+ProfileTarget = Literal["jobs", "requests"]
+ProfileMode = Literal["cprofile", "sampling"]
+
+
+class _CProfileRecorder:
+    suffix = ".prof"
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> None:
+        self._profile.disable()
+
+    def write(self, path: Path) -> None:
+        self._profile.dump_stats(path)
+
+
+class _StackSampler:
+    """在背景執行緒定期擷取目標執行緒的呼叫堆疊；thread_id 為 None 時擷取所有執行緒。"""
+
+    suffix = ".folded"
+
+    def __init__(self, thread_id: int | None, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            current = sys._current_frames()
+            if self.thread_id is not None:
+                current = {self.thread_id: current.get(self.thread_id)}
+            for thread_id, frame in current.items():
+                if thread_id == own:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if frames:
+                    self.stacks[";".join(reversed(frames))] += 1
+
+    def write(self, path: Path) -> None:
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@dataclass
+class ProfilingSession:
+    target: ProfileTarget
+    mode: ProfileMode
+    count: int
+    output_dir: Path
+    started_at: datetime = field(default_factory=datetime.now)
+    claimed: int = 0
+    files: list[str] = field(default_factory=list)
+
+    @property
+    def remaining(self) -> int:
+        return self.count - self.claimed
+
+
+def _slug(label: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", label).strip("_")[:80] or "item"
+
+
+class Profiler:
+    """管理目前的剖析工作階段，並剖析被選中的工作或請求。
+
+    Why: Python 同一時間只能有一個 cProfile 在執行（3.12 起會直接拋出例外），
+    因此同時進行的工作只有取得鎖的那一個會被剖析，其餘照常執行而不計入次數。
+
+    cProfile 只記錄呼叫 profile() 的執行緒；同步的 API 端點在執行緒池中執行，
+    剖析請求時建議使用 sampling 模式，它會擷取所有執行緒的堆疊。
+    """
+
+    def __init__(self, base_dir: Path = PROFILE_DIR):
+        self.base_dir = base_dir
+        self._session: ProfilingSession | None = None
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+
+    @property
+    def session(self) -> ProfilingSession | None:
+        return self._session
+
+    def start(self, target: ProfileTarget, count: int, mode: ProfileMode) -> ProfilingSession:
+        """開始新的剖析工作階段，取代尚未結束的工作階段。"""
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output_dir = self.base_dir / f"{stamp}-{target}-{mode}"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        session = ProfilingSession(target=target, mode=mode, count=count, output_dir=output_dir)
+        with self._lock:
+            self._session = session
+        logger.info(f"開始剖析接下來的 {count} 個{'工作' if target == 'jobs' else '請求'}，輸出至 {output_dir}")
+        return session
+
+    def stop(self) -> ProfilingSession | None:
+        with self._lock:
+            session, self._session = self._session, None
+        return session
+
+    def _claim(self, target: ProfileTarget) -> tuple[ProfilingSession, int] | None:
+        session = self._session
+        if session is None or session.target != target:
+            return None
+        if not self._busy.acquire(blocking=False):
+            return None
+        with self._lock:
+            if self._session is not session or session.remaining <= 0:
+                self._busy.release()
+                return None
+            session.claimed += 1
+            return session, session.claimed
+
+    @contextmanager
+    def profile(self, target: ProfileTarget, label: str) -> Iterator[None]:
+        """剖析 with 區塊；目前沒有對應的工作階段時不做任何事。"""
+        claimed = self._claim(target) if self._session is not None else None
+        if claimed is None:
+            yield
+            return
+
+        session, index = claimed
+        recorder = (
+            _CProfileRecorder()
+            if session.mode == "cprofile"
+            else _StackSampler(threading.get_ident() if target == "jobs" else None)
+        )
+        path = session.output_dir / f"{target[:-1]}-{index:03d}-{_slug(label)}{recorder.suffix}"
+        try:
+            recorder.start()
+            try:
+                yield
+            finally:
+                recorder.stop()
+                recorder.write(path)
+        finally:
+            self._busy.release()
+            self._finish_one(session, path.name)
+
+    def _finish_one(self, session: ProfilingSession, filename: str) -> None:
+        with self._lock:
+            session.files.append(filename)
+            if len(session.files) >= session.count and self._session is session:
+                self._session = None
+                logger.info(f"剖析完成，共 {len(session.files)} 個檔案：{session.output_dir}")
+
+
+profiler = Profiler()
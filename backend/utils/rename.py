@@ -1,9 +1,11 @@
+import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Sequence
 
-import parse
 from loguru import logger
 
+from backend.utils.parse_template import parse_named
 from backend.utils.safe_format import safe_format
 from backend.utils.safe_regex import safe_compile, safe_search, safe_sub
 
@@ -17,59 +19,131 @@ def _ensure_path(filepath: str | Path) -> Path:
     return Path(filepath) if isinstance(filepath, str) else filepath
 
 
-def apply_episode_offset(value: str, offset: int) -> str:
-    """對 episode 數值字串套用偏移量。
+class ParseMismatchError(ValueError):
+    """檔名不符合 parse 樣板。
+
+    Why: 繼承 ValueError 讓 Worker 既有的重新命名錯誤處理可以自然捕獲，
+    而不是在存取不存在的比對結果時拋出 AttributeError。
+    """
+
+    def __init__(self, pattern: str, filename: str):
+        super().__init__(f'檔名 "{filename}" 不符合來源檔案名稱規則 "{pattern}"')
+        self.pattern = pattern
+        self.filename = filename
+
+
+# 集數字串：整數部分與可選的小數部分（如 "07"、"07.5"）。
+# 與 int() 相同，整數部分可帶正負號與前後空白（如 " 07"、"+3"），補零寬度以原字串長度計算
+_EPISODE_NUMBER = re.compile(r"(\s*[+-]?\d+\s*)(\..*)?", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class OffsetRange:
+    """套用在原始集數整數部分落於 [start, end] 之間的偏移量；未指定的邊界視為不限。"""
+
+    offset: int
+    start: int | None = None
+    end: int | None = None
+
+    def contains(self, number: int) -> bool:
+        return (self.start is None or number >= self.start) and (
+            self.end is None or number <= self.end
+        )
+
+
+@dataclass(frozen=True)
+class EpisodeOffset:
+    """單一分組的偏移規則，依序使用第一個包含原始集數的範圍，沒有符合的範圍時不偏移。
+
+    例如第 1～12 集不變、第 13 集起減 12：
+    `EpisodeOffset("episode", (OffsetRange(0, 1, 12), OffsetRange(-12, 13)))`
+    """
+
+    group: str
+    ranges: tuple[OffsetRange, ...]
+
+    @classmethod
+    def constant(cls, group: str, offset: int) -> "EpisodeOffset":
+        return cls(group, (OffsetRange(offset),))
+
+    def offset_for(self, number: int) -> int:
+        for offset_range in self.ranges:
+            if offset_range.contains(number):
+                return offset_range.offset
+        return 0
+
+
+def apply_episode_offsets(
+    values: Sequence[str], offset: int | EpisodeOffset
+) -> list[str]:
+    """對一批 episode 數值字串套用偏移量，保留原始零填充與小數部分。
+
+    Why: 整季或整批積壓檔案重新編號時，逐筆呼叫會重複切割字串與輸出警告；
+    批次版本以預先編譯的正則一次解析整數與小數部分，無法轉換的值只彙總警告一次。
+
+    Args:
+        values: 原始 episode 數值字串
+        offset: 固定偏移量，或依集數範圍決定偏移量的 EpisodeOffset
+
+    Returns:
+        與輸入順序相同的偏移後字串；非數字的值原樣回傳
+    """
+    if isinstance(offset, int):
+        if offset == 0:
+            return list(values)
+        offset = EpisodeOffset.constant("", offset)
+
+    results = []
+    skipped = []
+    fullmatch = _EPISODE_NUMBER.fullmatch
+    for value in values:
+        match = fullmatch(value)
+        if match is None:
+            skipped.append(value)
+            results.append(value)
+            continue
+        integer, decimal = match.groups()
+        number = int(integer)
+        delta = offset.offset_for(number)
+        if delta == 0:
+            results.append(value)
+        else:
+            results.append(f"{number + delta:0{len(integer)}d}{decimal or ''}")
+
+    if skipped:
+        logger.warning(
+            f"Episode 偏移：{len(skipped)} 個群組值無法轉換為數字，跳過偏移（如 '{skipped[0]}'）"
+        )
+    return results
+
+
+def apply_episode_offset(value: str, offset: int | EpisodeOffset) -> str:
+    """對單一 episode 數值字串套用偏移量。
 
     支援整數（如 "01"）與小數（如 "07.5"）格式。
     偏移後保留原始零填充與小數部分。
 
     Args:
         value: 原始 episode 數值字串
-        offset: 偏移量（整數）
+        offset: 固定偏移量，或依集數範圍決定偏移量的 EpisodeOffset
 
     Returns:
         偏移後的數值字串，保留原始格式；若非數字則回傳原始值
     """
-    if offset == 0:
-        return value
-
-    # 處理小數情況（如 "07.5"）
-    if "." in value:
-        parts = value.split(".", 1)
-        int_part_str = parts[0]
-        decimal_part = parts[1]
-
-        try:
-            int_val = int(int_part_str)
-        except ValueError:
-            logger.warning(
-                f"Episode 偏移：群組值 '{value}' 的整數部分無法轉換為數字，跳過偏移"
-            )
-            return value
-
-        new_int_val = int_val + offset
-        # 保留零填充：取原始整數部分的位數
-        original_width = len(int_part_str)
-        new_int_str = str(new_int_val).zfill(original_width)
-        return f"{new_int_str}.{decimal_part}"
-
-    # 處理整數情況（如 "01"、"003"）
-    try:
-        int_val = int(value)
-    except ValueError:
-        logger.warning(f"Episode 偏移：群組值 '{value}' 無法轉換為數字，跳過偏移")
-        return value
-
-    new_val = int_val + offset
-    original_width = len(value)
-    return str(new_val).zfill(original_width)
+    return apply_episode_offsets([value], offset)[0]
+
+
+def _offset_number(value: int | float, rule: EpisodeOffset) -> int | float:
+    """對 parse 型別欄位取得的數值套用偏移，保留原本的型別。"""
+    return value + rule.offset_for(int(value))
 
 
 class ParseRenameRule:
     """使用 parse 函式庫的字串樣板規則重新命名檔案。
 
     Why: 提供比正則表達式更直覺的命名模式語法（如 `{title} - {episode}`），
-    適合非技術使用者定義重命名規則。
+    適合非技術使用者定義重命名規則。src 可使用型別欄位（如 `{episode:d}`），
+    dst 可使用格式規格（如 `{episode:02d}`）輸出補零的集數。
     """
 
     def __init__(self, filepath: str | Path, src: str, dst: str):
@@ -77,11 +151,23 @@ class ParseRenameRule:
         self.src = src
         self.dst = dst
 
+    def parse_groups(self, filename: str) -> dict | None:
+        """以已編譯的 src 樣板比對檔名，回傳具名欄位；不符合時回傳 None。"""
+        return parse_named(self.src, filename)
+
+    def render(self, filename: str) -> str:
+        """計算重新命名後的檔名，不觸碰檔案系統。
+
+        :raises ParseMismatchError: 檔名不符合 src 樣板時拋出
+        """
+        groups = ParseRenameRule.parse_groups(self, filename)
+        if groups is None:
+            raise ParseMismatchError(self.src, filename)
+        return safe_format(self.dst, groups)
+
     def rename(self) -> Path:
         filepath = _ensure_path(self.filepath)
-        filename = filepath.name
-        template = parse.parse(self.src, filename)
-        renamed = safe_format(self.dst, template.named)
+        renamed = ParseRenameRule.render(self, filepath.name)
         dst_path = filepath.parent.joinpath(renamed)
         return Path.rename(filepath, dst_path)
 
@@ -98,11 +184,14 @@ class RegexRenameRule:
         self.src = src
         self.dst = dst
 
+    def render(self, filename: str) -> str:
+        """計算重新命名後的檔名，不觸碰檔案系統。"""
+        src_filename_regex = safe_compile(self.src)
+        return safe_sub(src_filename_regex, self.dst, filename)
+
     def rename(self) -> Path:
         filepath = _ensure_path(self.filepath)
-        filename = filepath.name
-        src_filename_regex = safe_compile(self.src)
-        renamed = safe_sub(src_filename_regex, self.dst, filename)
+        renamed = RegexRenameRule.render(self, filepath.name)
         dst_path = filepath.parent.joinpath(renamed)
         return Path.rename(filepath, dst_path)
 
@@ -123,6 +212,7 @@ class Rename(RegexRenameRule, ParseRenameRule):
         episode_offset_enabled: bool = False,
         episode_offset_group: str | None = None,
         episode_offset_value: int = 0,
+        episode_offsets: Sequence[EpisodeOffset] | None = None,
     ):
         """初始化重新命名處理程序。
 
@@ -133,76 +223,120 @@ class Rename(RegexRenameRule, ParseRenameRule):
         :param episode_offset_enabled: 是否啟用 episode 偏移
         :param episode_offset_group: 偏移目標的 group 名稱
         :param episode_offset_value: episode 偏移量
+        :param episode_offsets: 多個分組或依集數範圍的偏移規則，指定時取代上述三個參數
         """
         super().__init__(filepath=filepath, src=src, dst=dst)
         self.rule_type = rule.lower()
         self.episode_offset_enabled = episode_offset_enabled
         self.episode_offset_group = episode_offset_group
         self.episode_offset_value = episode_offset_value
-
-    def _should_apply_offset(self) -> bool:
-        """判斷是否需要套用 episode 偏移。"""
-        return (
+        self._episode_offsets = tuple(episode_offsets) if episode_offsets is not None else None
+
+    @property
+    def episode_offsets(self) -> tuple[EpisodeOffset, ...]:
+        """實際套用的偏移規則；未指定 episode_offsets 時由單一分組的任務設定轉換而來。"""
+        if self._episode_offsets is not None:
+            return self._episode_offsets
+        if (
             self.episode_offset_enabled
             and self.episode_offset_group is not None
             and self.episode_offset_value != 0
-        )
+        ):
+            return (EpisodeOffset.constant(self.episode_offset_group, self.episode_offset_value),)
+        return ()
 
-    def _execute_parse_rename(self) -> Path:
-        """Parse 模式重新命名，支援 episode 偏移。"""
-        filepath = _ensure_path(self.filepath)
-        filename = filepath.name
-        template = parse.parse(self.src, filename)
-        groups = dict(template.named)
-
-        if self._should_apply_offset():
-            group = self.episode_offset_group
-            if group in groups:
-                groups[group] = apply_episode_offset(
-                    str(groups[group]), self.episode_offset_value
-                )
-
-        renamed = safe_format(self.dst, groups)
-        dst_path = filepath.parent.joinpath(renamed)
-        return Path.rename(filepath, dst_path)
+    def should_apply_offset(self) -> bool:
+        """判斷是否需要套用 episode 偏移。"""
+        return bool(self.episode_offsets)
 
-    def _execute_regex_rename(self) -> Path:
-        """Regex 模式重新命名，支援 episode 偏移。"""
-        filepath = _ensure_path(self.filepath)
-        filename = filepath.name
-        dst = self.dst
+    def offset_parse_groups(self, groups: dict) -> dict:
+        """回傳套用 episode 偏移後的 parse 分組結果（未啟用時原樣回傳）。"""
+        return self.offset_parse_groups_many([groups])[0]
 
-        if self._should_apply_offset():
-            src_regex = safe_compile(self.src)
-            match = safe_search(src_regex, filename)
-            if match:
-                group_dict = match.groupdict()
-                group = self.episode_offset_group
-                if group in group_dict and group_dict[group] is not None:
-                    offset_val = apply_episode_offset(
-                        group_dict[group], self.episode_offset_value
-                    )
-                    # 將 dst 中的 named backreference 替換為偏移後的字面值
-                    dst = dst.replace(f"\\g<{group}>", offset_val)
+    def offset_parse_groups_many(self, groups_list: Sequence[dict]) -> list[dict]:
+        """對多筆 parse 分組結果套用 episode 偏移，每個偏移分組只批次處理一次。
 
+        型別欄位（如 `{episode:d}`）直接以數值相加並保留型別，讓 dst 的格式規格仍然適用。
+        """
+        rows = [dict(groups) for groups in groups_list]
+        for rule in self.episode_offsets:
+            indexes = []
+            for i, row in enumerate(rows):
+                value = row.get(rule.group)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    row[rule.group] = _offset_number(value, rule)
+                elif rule.group in row:
+                    indexes.append(i)
+            values = apply_episode_offsets([str(rows[i][rule.group]) for i in indexes], rule)
+            for i, value in zip(indexes, values):
+                rows[i][rule.group] = value
+        return rows
+
+    def offset_regex_replacement(self, group_dict: dict) -> str:
+        """回傳套用 episode 偏移後的 regex 替換字串（未啟用時回傳原始 dst）。
+
+        Why: 偏移值需先由 search 取得，再以字面值取代 dst 中的 named backreference，
+        Planner 的批次路徑與單檔重新命名共用此邏輯。
+        """
+        return self.offset_regex_replacements([group_dict])[0]
+
+    def offset_regex_replacements(self, group_dicts: Sequence[dict | None]) -> list[str]:
+        """對多筆 search 結果計算替換字串；group_dict 為 None（未匹配）時使用原始 dst。"""
+        replacements = [self.dst] * len(group_dicts)
+        for rule in self.episode_offsets:
+            indexes = [
+                i
+                for i, group_dict in enumerate(group_dicts)
+                if group_dict is not None and group_dict.get(rule.group) is not None
+            ]
+            values = apply_episode_offsets([group_dicts[i][rule.group] for i in indexes], rule)
+            # 將 dst 中的 named backreference 替換為偏移後的字面值
+            backreference = f"\\g<{rule.group}>"
+            for i, value in zip(indexes, values):
+                replacements[i] = replacements[i].replace(backreference, value)
+        return replacements
+
+    def _render_parse(self, filename: str) -> str:
+        """Parse 模式計算新檔名，支援 episode 偏移。"""
+        groups = self.parse_groups(filename)
+        if groups is None:
+            raise ParseMismatchError(self.src, filename)
+        return safe_format(self.dst, self.offset_parse_groups(groups))
+
+    def _render_regex(self, filename: str) -> str:
+        """Regex 模式計算新檔名，支援 episode 偏移。"""
         src_regex = safe_compile(self.src)
-        renamed = safe_sub(src_regex, dst, filename)
-        dst_path = filepath.parent.joinpath(renamed)
-        return Path.rename(filepath, dst_path)
+        dst = self.dst
+        if self.should_apply_offset():
+            match = safe_search(src_regex, filename)
+            if match:
+                dst = self.offset_regex_replacement(match.groupdict())
+        return safe_sub(src_regex, dst, filename)
 
-    def execute_rename(self) -> Path:
-        """根據 rule_type 分派至對應的重新命名方法。
+    def render(self, filename: str) -> str:
+        """根據 rule_type 計算重新命名後的檔名，不觸碰檔案系統。
 
-        :return: 重新命名後的檔案路徑
+        :param filename: 原始檔名
+        :return: 重新命名後的檔名
         :raises ValueError: rule_type 不是 `regex` 或 `parse` 時拋出
         """
         if self.rule_type == "regex":
-            if self._should_apply_offset():
-                return self._execute_regex_rename()
-            return RegexRenameRule.rename(self)
+            if self.should_apply_offset():
+                return self._render_regex(filename)
+            return RegexRenameRule.render(self, filename)
         elif self.rule_type == "parse":
-            if self._should_apply_offset():
-                return self._execute_parse_rename()
-            return ParseRenameRule.rename(self)
+            if self.should_apply_offset():
+                return self._render_parse(filename)
+            return ParseRenameRule.render(self, filename)
         else:
             raise ValueError(f"未知的重新命名規則類型: {self.rule_type}")
+
+    def execute_rename(self) -> Path:
+        """根據 rule_type 分派至對應的重新命名方法。
+
+        :return: 重新命名後的檔案路徑
+        :raises ValueError: rule_type 不是 `regex` 或 `parse` 時拋出
+        """
+        filepath = _ensure_path(self.filepath)
+        dst_path = filepath.parent.joinpath(self.render(filepath.name))
+        return Path.rename(filepath, dst_path)
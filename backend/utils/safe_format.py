@@ -1,25 +1,62 @@
 """安全格式字串替換工具。
 
 Why: Python 的 str.format() 可透過 {key.__class__} 等語法存取物件屬性，
-造成資訊洩漏風險。此模組僅支援 {key} 簡單替換，禁止屬性存取和索引存取。
+造成資訊洩漏風險。此模組僅支援 {key} 與 {key:spec} 替換，禁止屬性存取和索引存取。
 """
 
 import re
 
-# 匹配簡單的 {key}（key 僅由字母、數字、底線組成，不含 .、[、!、: 等）
-_SIMPLE_PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+# 匹配 {key} 或 {key:spec}（key 僅由字母、數字、底線組成，不含 .、[、! 等）
+_PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)(?::([^{}]*))?\}")
+# 允許的格式規格：填充與對齊、正負號、零填充、寬度、千分位、精確度與型別；
+# 寬度與精確度限制為三位數，避免 {key:999999999} 產生巨大字串
+_FORMAT_SPEC = re.compile(
+    r"(?:.?[<>=^])?[+\- ]?#?0?(?:\d{1,3})?[,_]?(?:\.\d{1,3})?[bcdeEfFgGnosxX%]?"
+)
+_INTEGER_TYPES = set("bcdoxXn")
+
+
+def _coerce_number(value: str, spec: str):
+    """將數字字串轉為 int 或 float；非數字時回傳原字串。"""
+    converters = (int,) if spec[-1:] in _INTEGER_TYPES else (int, float)
+    for converter in converters:
+        try:
+            return converter(value)
+        except ValueError:
+            continue
+    return value
+
+
+def _format_value(value, spec: str) -> str | None:
+    """依格式規格格式化單一值，無法格式化時回傳 None。
+
+    Why: 未指定型別的 parse 欄位與 regex 分組都是字串，數字字串需先轉為數字，
+    `{episode:02d}` 與 `{episode:03}` 才會補零，而不是格式錯誤或向右填充。
+    """
+    if isinstance(value, str) and not spec.endswith("s"):
+        value = _coerce_number(value, spec)
+    try:
+        return format(value, spec)
+    except (TypeError, ValueError):
+        return None
 
 
 def safe_format(template: str, mapping: dict) -> str:
-    """安全的格式字串替換，僅支援 {key} 簡單佔位符。
+    """安全的格式字串替換，支援 {key} 與 {key:spec} 佔位符。
 
-    不支援 {key.attr}、{key[0]}、{key!r}、{key:format} 等進階語法。
-    未匹配的 key 保留原始佔位符。
+    spec 僅接受標準格式規格（如 `02d`、`>3`、`.1f`），
+    不支援 {key.attr}、{key[0]}、{key!r} 與巢狀欄位等進階語法。
+    未匹配的 key 或無法套用的 spec 保留原始佔位符。
     """
     def replacer(match: re.Match) -> str:
-        key = match.group(1)
-        if key in mapping:
+        key, spec = match.group(1), match.group(2)
+        if key not in mapping:
+            return match.group(0)
+        if not spec:
             return str(mapping[key])
-        return match.group(0)
+        if not _FORMAT_SPEC.fullmatch(spec):
+            return match.group(0)
+        formatted = _format_value(mapping[key], spec)
+        return match.group(0) if formatted is None else formatted
 
-    return _SIMPLE_PLACEHOLDER.sub(replacer, template)
+    return _PLACEHOLDER.sub(replacer, template)
@@ -7,6 +7,11 @@ Why: 使用者提供的正則表達式可能包含惡意 pattern（如 `(a+)+b`
 
 import multiprocessing
 import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from backend.utils.metrics import REGEX_SANDBOX_EXEC, REGEX_SANDBOX_SPAWN
 
 _DEFAULT_MAX_LENGTH = 500
 _DEFAULT_TIMEOUT = 3  # 秒
@@ -66,6 +71,65 @@ def _worker_sub(pattern_str: str, flags: int, repl: str, string: str, conn):
         conn.close()
 
 
+def _send_each(items: list, handle: Callable[[object], tuple], conn) -> None:
+    """逐筆執行 handle，每完成一筆即回傳 (索引, 結果)；單筆的例外以 error 回傳。"""
+    try:
+        for index, item in enumerate(items):
+            try:
+                payload = handle(item)
+            except Exception as e:
+                payload = ("error", str(e))
+            conn.send((index, payload))
+    finally:
+        conn.close()
+
+
+def _worker_batch(pattern_str: str, flags: int, op: str, items: list, conn):
+    """子行程中逐筆執行 search、sub 或 search_sub，每完成一筆即回傳一次結果。
+
+    Why: 批次作業只需編譯一次 pattern、啟動一個子行程；逐筆回傳讓父行程
+    在逾時時仍能保留已完成的結果，只把卡住的項目標記為逾時。
+    """
+    try:
+        compiled = re.compile(pattern_str, flags)
+    except Exception as e:
+        conn.send(("fatal", str(e)))
+        conn.close()
+        return
+
+    def handle(item) -> tuple:
+        if op == "search":
+            match = compiled.search(item)
+            if match:
+                return ("match", match.group(0), match.groups(), match.groupdict(), match.start(), match.end())
+            return ("none",)
+        repl, string = item
+        if op == "search_sub":
+            match = compiled.search(string)
+            result = compiled.sub(repl, string) if match else string
+            if match:
+                return ("search_sub", (match.group(0), match.groups(), match.groupdict(), match.start(), match.end()), result)
+            return ("search_sub", None, result)
+        return ("result", compiled.sub(repl, string))
+
+    _send_each(items, handle, conn)
+
+
+def _worker_first(patterns: list[re.Pattern], items: list[str], conn):
+    """子行程中逐筆找出第一個符合的 pattern 索引，沒有符合時為 None。
+
+    patterns 為父行程已編譯的 pattern 清單，fork 時直接沿用編譯結果。
+    """
+    _send_each(
+        items,
+        lambda item: (
+            "first",
+            next((i for i, pattern in enumerate(patterns) if pattern.search(item)), None),
+        ),
+        conn,
+    )
+
+
 class _MatchProxy:
     """模擬 re.Match 的最小介面，讓呼叫端無需修改。"""
 
@@ -96,6 +160,14 @@ class _MatchProxy:
         return self._end
 
 
+def _start_sandbox(proc) -> float:
+    """啟動沙箱子行程並記錄啟動耗時，回傳啟動時間點供計算執行耗時。"""
+    started = time.perf_counter()
+    proc.start()
+    REGEX_SANDBOX_SPAWN.observe(time.perf_counter() - started)
+    return started
+
+
 def safe_search(
     pattern: re.Pattern,
     string: str,
@@ -114,8 +186,9 @@ def safe_search(
         target=_worker_search,
         args=(pattern.pattern, pattern.flags, string, child_conn),
     )
-    proc.start()
+    started = _start_sandbox(proc)
     proc.join(timeout=timeout)
+    REGEX_SANDBOX_EXEC.observe(time.perf_counter() - started, op="search")
 
     if proc.is_alive():
         proc.kill()
@@ -152,8 +225,9 @@ def safe_sub(
         target=_worker_sub,
         args=(pattern.pattern, pattern.flags, repl, string, child_conn),
     )
-    proc.start()
+    started = _start_sandbox(proc)
     proc.join(timeout=timeout)
+    REGEX_SANDBOX_EXEC.observe(time.perf_counter() - started, op="sub")
 
     if proc.is_alive():
         proc.kill()
@@ -168,3 +242,229 @@ def safe_sub(
             raise re.error(data[1])
 
     return string
+
+
+@dataclass
+class BatchOutcome:
+    """批次正則表達式執行的單筆結果。
+
+    Why: 批次中的單一項目失敗或逾時不應影響其他項目，
+    因此以結果物件逐筆標記，而非整批拋出例外。
+
+    Attributes:
+        value: search 為 _MatchProxy 或 None；sub 為替換後字串
+        error: 執行錯誤訊息（含逾時）
+        timed_out: 是否因逾時而未完成
+    """
+
+    value: object = None
+    error: str | None = None
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _run_batch(
+    pattern: re.Pattern | Sequence[re.Pattern],
+    op: str,
+    items: list,
+    timeout: float,
+    item_timeout: float,
+) -> list[BatchOutcome]:
+    """在子行程中批次執行 search/sub，套用總時間預算與單筆逾時。
+
+    單筆超過 item_timeout 時終止子行程、將該筆標記為逾時，
+    並為剩餘項目重新啟動子行程；總時間預算用盡後剩餘項目一律標記為逾時。
+    """
+    outcomes: list[BatchOutcome | None] = [None] * len(items)
+    deadline = time.monotonic() + timeout
+    start = 0
+    if op == "first":
+        target, pattern_args = _worker_first, (list(pattern),)
+    else:
+        target, pattern_args = _worker_batch, (pattern.pattern, pattern.flags, op)
+
+    while start < len(items):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+
+        parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+        proc = multiprocessing.Process(
+            target=target,
+            args=(*pattern_args, items[start:], child_conn),
+        )
+        started = _start_sandbox(proc)
+        child_conn.close()
+
+        next_index = start
+        while next_index < len(items):
+            wait = min(item_timeout, deadline - time.monotonic())
+            if wait <= 0 or not parent_conn.poll(wait):
+                break
+            try:
+                message = parent_conn.recv()
+            except EOFError:
+                break
+            if message[0] == "fatal":
+                proc.join()
+                raise re.error(message[1])
+            index, payload = message
+            outcomes[start + index] = _to_outcome(payload)
+            next_index = start + index + 1
+
+        if proc.is_alive():
+            proc.kill()
+        proc.join()
+        parent_conn.close()
+        REGEX_SANDBOX_EXEC.observe(time.perf_counter() - started, op=f"batch_{op}")
+
+        if next_index < len(items):
+            outcomes[next_index] = BatchOutcome(
+                error=str(RegexTimeoutError(item_timeout)), timed_out=True
+            )
+            next_index += 1
+        start = next_index
+
+    return [
+        outcome
+        if outcome is not None
+        else BatchOutcome(error=str(RegexTimeoutError(timeout)), timed_out=True)
+        for outcome in outcomes
+    ]
+
+
+def _to_outcome(payload: tuple) -> BatchOutcome:
+    """將子行程回傳的 payload 轉為 BatchOutcome。"""
+    kind = payload[0]
+    if kind == "match":
+        _, full_match, groups, groupdict, start, end = payload
+        return BatchOutcome(value=_MatchProxy(full_match, groups, groupdict, start, end))
+    if kind == "none":
+        return BatchOutcome(value=None)
+    if kind in ("result", "first"):
+        return BatchOutcome(value=payload[1])
+    if kind == "search_sub":
+        _, match_data, result = payload
+        match = _MatchProxy(*match_data) if match_data is not None else None
+        return BatchOutcome(value=(match, result))
+    return BatchOutcome(error=payload[1])
+
+
+def safe_search_many(
+    pattern: re.Pattern,
+    strings: list[str],
+    timeout: float = _DEFAULT_TIMEOUT,
+    item_timeout: float | None = None,
+) -> list[BatchOutcome]:
+    """在單一子行程中對多個字串執行 re.search。
+
+    Args:
+        pattern: 已透過 safe_compile 編譯的 pattern
+        strings: 要比對的字串清單
+        timeout: 整批的總時間預算（秒）
+        item_timeout: 單筆逾時（秒），預設與 timeout 相同
+
+    Returns:
+        與 strings 順序一致的 BatchOutcome 清單，value 為 _MatchProxy 或 None
+
+    Raises:
+        re.error: pattern 語法無效。
+    """
+    if not strings:
+        return []
+    return _run_batch(pattern, "search", list(strings), timeout, item_timeout or timeout)
+
+
+def safe_sub_many(
+    pattern: re.Pattern,
+    items: list[tuple[str, str]],
+    timeout: float = _DEFAULT_TIMEOUT,
+    item_timeout: float | None = None,
+) -> list[BatchOutcome]:
+    """在單一子行程中對多個 (repl, string) 執行 re.sub。
+
+    Why: 每筆各自帶 repl，讓 episode 偏移等逐筆改寫替換字串的情境
+    也能共用同一個子行程。
+
+    Returns:
+        與 items 順序一致的 BatchOutcome 清單，value 為替換後字串
+
+    Raises:
+        re.error: pattern 語法無效。
+    """
+    if not items:
+        return []
+    return _run_batch(pattern, "sub", list(items), timeout, item_timeout or timeout)
+
+
+def safe_search_sub_many(
+    pattern: re.Pattern,
+    repl: str,
+    strings: list[str],
+    timeout: float = _DEFAULT_TIMEOUT,
+    item_timeout: float | None = None,
+) -> list[BatchOutcome]:
+    """在單一子行程中對多個字串同時執行 re.search 與 re.sub。
+
+    Why: 預覽需要同時取得分組與替換結果，合併為一次執行
+    可避免每筆樣本各啟動兩個子行程。
+
+    Returns:
+        與 strings 順序一致的 BatchOutcome 清單，value 為 (_MatchProxy | None, 替換後字串)
+
+    Raises:
+        re.error: pattern 語法無效。
+    """
+    if not strings:
+        return []
+    items = [(repl, string) for string in strings]
+    return _run_batch(pattern, "search_sub", items, timeout, item_timeout or timeout)
+
+
+def safe_search_first_many(
+    patterns: Sequence[re.Pattern],
+    strings: list[str],
+    timeout: float = _DEFAULT_TIMEOUT,
+    item_timeout: float | None = None,
+) -> list[BatchOutcome]:
+    """在單一子行程中，對每個字串依序以多個 pattern 執行 re.search，找出第一個符合者。
+
+    Why: 上千個任務的 include 正則若逐一送進沙箱，每個 pattern 都要啟動一次子行程；
+    改為整組 pattern 在同一個子行程內依序比對，每個字串只需一次沙箱往返，
+    仍受相同的總時間預算與單筆逾時保護。Python 的 re 不會最佳化大型 alternation，
+    合併成單一 pattern 反而比依序比對慢，因此保留各自編譯的 pattern。
+
+    Args:
+        patterns: 已透過 safe_compile 編譯的 pattern，依比對優先順序排列
+        strings: 要比對的字串清單
+
+    Returns:
+        與 strings 順序一致的 BatchOutcome 清單，value 為第一個符合的 pattern 索引或 None
+    """
+    if not strings:
+        return []
+    if not patterns:
+        return [BatchOutcome(value=None) for _ in strings]
+    return _run_batch(list(patterns), "first", list(strings), timeout, item_timeout or timeout)
+
+
+def safe_search_first(
+    patterns: Sequence[re.Pattern],
+    string: str,
+    timeout: float = _DEFAULT_TIMEOUT,
+) -> int | None:
+    """在逾時保護下找出第一個與 string 符合的 pattern 索引，沒有符合時回傳 None。
+
+    Raises:
+        RegexTimeoutError: 執行逾時。
+        re.error: pattern 語法無效。
+    """
+    outcome = safe_search_first_many(patterns, [string], timeout=timeout)[0]
+    if outcome.timed_out:
+        raise RegexTimeoutError(timeout)
+    if not outcome.ok:
+        raise re.error(outcome.error)
+    return outcome.value
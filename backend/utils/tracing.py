@@ -0,0 +1,87 @@
+"""單一工作（一次 process_completed_download）的階段追蹤。
+
+Why: 檔案處理耗時 30 秒時，必須能分辨是資料庫、正則逾時還是跨裝置複製造成的。
+每個工作帶有一個 trace id，依序記錄白名單檢查、載入任務、比對、重新命名、移動與日誌寫入的時間區段。
+區段只在記憶體中累積 (名稱, 起點, 耗時)，工作結束時才一次寫入資料庫；
+未被取樣的工作只建立 id，span() 直接回傳空的 context manager，幾乎沒有額外成本。
+"""
+
+import random
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from typing import ContextManager, Iterator
+
+from backend.utils.env_config import get_trace_sample_rate
+
+
+class JobTrace:
+    """一個工作的 trace id 與已記錄的時間區段（毫秒，相對於工作開始）。"""
+
+    def __init__(self, filepath: str, sampled: bool = True):
+        self.id = uuid.uuid4().hex
+        self.filepath = filepath
+        self.sampled = sampled
+        self.task_id: str | None = None
+        self.status: str | None = None
+        self.started_at = datetime.now(UTC)
+        self.spans: list[tuple[str, float, float]] = []
+        self._started = time.perf_counter()
+
+    def span(self, name: str) -> ContextManager[None]:
+        """以 with 區塊記錄一個時間區段；區塊拋出例外時仍會記錄。"""
+        if not self.sampled:
+            return nullcontext()
+        return self._record(name)
+
+    @contextmanager
+    def _record(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            self.spans.append(
+                (
+                    name,
+                    round((started - self._started) * 1000, 3),
+                    round((ended - started) * 1000, 3),
+                )
+            )
+
+    @property
+    def duration_ms(self) -> float:
+        return round((time.perf_counter() - self._started) * 1000, 3)
+
+
+def start_trace(filepath: str, sample_rate: float | None = None) -> JobTrace:
+    """建立工作的 trace，依取樣率決定是否記錄時間區段。"""
+    if sample_rate is None:
+        sample_rate = get_trace_sample_rate()
+    return JobTrace(filepath, sampled=random.random() < sample_rate)
+
+
+# 目前執行緒正在處理的工作，讓深層的日誌寫入不必層層傳遞 trace 即可記錄區段
+_current_trace: ContextVar[JobTrace | None] = ContextVar("current_trace", default=None)
+
+
+def current_trace() -> JobTrace | None:
+    return _current_trace.get()
+
+
+@contextmanager
+def use_trace(trace: JobTrace) -> Iterator[JobTrace]:
+    """在 with 區塊內將 trace 設為目前的工作。"""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def trace_span(name: str) -> ContextManager[None]:
+    """在目前的工作 trace 上記錄區段；沒有進行中的工作時不做任何事。"""
+    trace = _current_trace.get()
+    return trace.span(name) if trace is not None else nullcontext()
@@ -0,0 +1,87 @@
+"""積壓檔案掃描的執行入口。
+
+Why: 掃描可由 API 或啟動時觸發，兩者都在背景執行緒中執行；
+此模組負責 session 生命週期與同一時間只允許一次掃描（跨 worker 行程亦同）。
+"""
+
+import threading
+from dataclasses import asdict
+
+from backend.database import DATABASE_DIR
+from backend.repositories.backlog_scan_state import BacklogScanStateRepository
+from backend.services.backlog_service import BacklogScanResult, BacklogService
+from backend.utils.env_config import get_backlog_scan_min_age, get_backlog_scan_rate
+from backend.utils.logger import logger
+from backend.utils.process_lock import ProcessLock
+from backend.worker.worker import (
+    create_worker_services,
+    process_completed_download,
+    worker_session,
+)
+
+_scan_lock = threading.Lock()
+_scan_process_lock = ProcessLock(DATABASE_DIR / ".backlog_scan.lock")
+_last_result: dict = {}
+
+
+def is_backlog_scan_running() -> bool:
+    """回傳目前是否有積壓掃描正在執行。"""
+    return _scan_lock.locked()
+
+
+def get_last_backlog_scan_result() -> dict | None:
+    """回傳最近一次完成的積壓掃描統計，尚未掃描過時回傳 None。"""
+    return dict(_last_result) or None
+
+
+def run_backlog_scan(full: bool = False) -> BacklogScanResult | None:
+    """執行一次積壓掃描；已有掃描進行中時直接返回 None。
+
+    Args:
+        full: 忽略水位線，重新掃描所有檔案
+    """
+    if not _scan_lock.acquire(blocking=False):
+        logger.info("積壓掃描已在執行中，略過本次觸發")
+        return None
+    if not _scan_process_lock.acquire(blocking=False):
+        _scan_lock.release()
+        logger.info("其他行程正在執行積壓掃描，略過本次觸發")
+        return None
+
+    try:
+        with worker_session() as db:
+            services = create_worker_services(db)
+            backlog = BacklogService(
+                services.task_service,
+                services.setting_service,
+                BacklogScanStateRepository(db),
+            )
+            logger.info("開始積壓掃描...")
+            result = backlog.scan(
+                dispatch=lambda filepath: process_completed_download(filepath, services),
+                rate=get_backlog_scan_rate(),
+                min_age=get_backlog_scan_min_age(),
+                full=full,
+            )
+        logger.info(
+            f"積壓掃描完成：掃描 {result.scanned} 個檔案，"
+            f"符合 {result.matched} 個，派送 {result.dispatched} 個，失敗 {result.failed} 個"
+        )
+        _last_result.clear()
+        _last_result.update(asdict(result))
+        return result
+    finally:
+        _scan_process_lock.release()
+        _scan_lock.release()
+
+
+def start_backlog_scan_thread(full: bool = False) -> threading.Thread:
+    """在背景 daemon 執行緒中啟動積壓掃描。"""
+    thread = threading.Thread(
+        target=run_backlog_scan,
+        kwargs={"full": full},
+        name="backlog-scan",
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,132 @@
+"""Webhook 重複事件去重。
+
+Why: 部分下載器（rTorrent、aria2 腳本）會對同一項目多次觸發完成事件，
+重新校驗也會再次觸發。重複事件會重跑比對、重新命名與移動，
+並因檔案已被移走而留下錯誤日誌。此模組以 (path, size, mtime, inode)
+指紋與 TTL 快取辨識重複事件，讓 Webhook 直接確認而不再排入佇列。
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import UTC, datetime
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal
+from backend.repositories.processed_path import ProcessedPathRepository
+from backend.utils.env_config import get_webhook_dedup_ttl
+from backend.utils.logger import logger
+
+Fingerprint = tuple[int, int, int]
+
+_DEFAULT_TTL = 600.0  # 秒
+_DEFAULT_MAX_ENTRIES = 10000
+
+
+def fingerprint(filepath: str) -> Fingerprint | None:
+    """回傳 (size, mtime_ns, inode)，路徑不存在時回傳 None。"""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+def _to_naive_utc(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, UTC).replace(tzinfo=None)
+
+
+class WebhookDeduplicator:
+    """以 TTL 記憶體快取為主、processed_path 表為後援的去重器。
+
+    判定規則：同一路徑在 TTL 內已被接受，且目前檔案不存在（已被移走）
+    或指紋與當時相同，即視為重複事件；同路徑出現不同指紋的新檔案則照常處理。
+
+    Why: 記憶體快取讓同一行程內的重複事件不需存取資料庫即可判定；
+    通過記憶體判定的事件再以資料表原子地認領，
+    讓多個 worker 行程與重新啟動後都只會處理一次。
+    未呼叫 load() 前不會存取資料庫。
+    """
+
+    def __init__(
+        self,
+        ttl: float = _DEFAULT_TTL,
+        max_entries: int = _DEFAULT_MAX_ENTRIES,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.session_factory = session_factory
+        self.suppressed = 0
+        self._entries: OrderedDict[str, tuple[Fingerprint | None, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._persistent = False
+
+    def load(self) -> None:
+        """自資料表載入尚未到期的紀錄，並啟用資料表寫入。"""
+        db = self.session_factory()
+        try:
+            repository = ProcessedPathRepository(db=db)
+            now = time.time()
+            repository.delete_expired(_to_naive_utc(now))
+            records = repository.get_active(_to_naive_utc(now))
+        finally:
+            db.close()
+
+        with self._lock:
+            for record in sorted(records, key=lambda r: r.expires_at):
+                fp = None
+                if record.size is not None:
+                    fp = (record.size, record.mtime_ns, record.inode)
+                expires = record.expires_at.replace(tzinfo=UTC).timestamp()
+                self._entries[record.filepath] = (fp, expires)
+            self._trim()
+            self._persistent = True
+
+    def claim(self, filepath: str) -> tuple[bool, Fingerprint | None]:
+        """判定 filepath 是否為新事件；是則記錄並回傳 (True, 指紋)。
+
+        重複事件（含已由其他行程認領的事件）回傳 (False, 指紋) 並累加 suppressed 計數。
+        load() 之後會寫入資料庫，應於執行緒中呼叫。
+        """
+        fp = fingerprint(filepath)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(filepath)
+            if entry is not None:
+                recorded_fp, expires = entry
+                if expires > now and (fp is None or fp == recorded_fp):
+                    self.suppressed += 1
+                    return False, fp
+            self._entries[filepath] = (fp, now + self.ttl)
+            self._entries.move_to_end(filepath)
+            self._trim()
+
+        if self._persistent and not self._claim_shared(filepath, fp, now):
+            with self._lock:
+                self.suppressed += 1
+            return False, fp
+        return True, fp
+
+    def _claim_shared(self, filepath: str, fp: Fingerprint | None, now: float) -> bool:
+        """在資料表中認領事件；資料庫錯誤時退回僅以記憶體判定。"""
+        db = self.session_factory()
+        try:
+            return ProcessedPathRepository(db=db).try_claim(
+                filepath, fp, _to_naive_utc(now), _to_naive_utc(now + self.ttl)
+            )
+        except Exception as e:
+            logger.warning(f'寫入 Webhook 去重紀錄 "{filepath}" 失敗: {e}')
+            return True
+        finally:
+            db.close()
+
+    def _trim(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+webhook_deduplicator = WebhookDeduplicator(ttl=get_webhook_dedup_ttl())
@@ -0,0 +1,84 @@
+"""下載完成事件的處理佇列。
+
+Why: Webhook、積壓掃描與檔案系統監看等多個觸發來源都需要交由 Worker 處理檔案。
+統一送入同一個佇列，由固定數量的背景執行緒依序消化，
+避免突發事件同時啟動大量處理流程並爭用 SQLite 寫入鎖。
+"""
+
+import queue
+import threading
+from typing import Callable
+
+from backend.utils.env_config import get_download_workers
+from backend.utils.logger import logger
+from backend.utils.metrics import registry
+
+_STOP = object()
+
+
+class JobQueue:
+    """以背景執行緒消化的 FIFO 工作佇列。
+
+    Why: 第一次提交工作時才啟動執行緒，讓未經 lifespan 啟動的情境（如測試）也能使用。
+    """
+
+    def __init__(self, name: str, workers: int = 1):
+        self.name = name
+        self.workers = workers
+        self._queue: queue.Queue = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._run,
+                    name=f"{self.name}-worker-{len(self._threads)}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, func: Callable, *args, **kwargs) -> None:
+        """將 func(*args, **kwargs) 放入佇列，稍後由背景執行緒執行。"""
+        self.start()
+        self._queue.put((func, args, kwargs))
+
+    def qsize(self) -> int:
+        """目前等待中的工作數量。"""
+        return self._queue.qsize()
+
+    def join(self) -> None:
+        """等待佇列中所有工作完成。"""
+        self._queue.join()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """通知背景執行緒在處理完既有工作後結束。"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(_STOP)
+        for thread in threads:
+            thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                func, args, kwargs = job
+                try:
+                    func(*args, **kwargs)
+                except Exception as e:
+                    logger.exception(f"佇列 {self.name} 執行工作失敗: {e}")
+            finally:
+                self._queue.task_done()
+
+
+download_queue = JobQueue("download", workers=get_download_workers())
+registry.gauge(
+    "movera_download_queue_depth", "下載處理佇列中等待的工作數", download_queue.qsize
+)
@@ -0,0 +1,194 @@
+"""下載檔案與任務的比對。
+
+Why: include 字串可能互相重疊（如「影集」與「影集 第二季」），比對順序必須明確且固定。
+任務在建立比對器時依優先順序排序一次，之後每個檔案只需依序找出第一個符合的任務。
+
+include 為 regex 或 glob 的任務在建立比對器時各自編譯一次，
+比對時整組 pattern 在同一個沙箱子行程中依序執行，每個檔案只需一次沙箱往返。
+
+任務可限定下載器的類別（match_categories）與標籤（match_tags）。比對器依類別建立索引，
+帶有類別的事件只需比對該類別與未限定類別的任務，也避免不同類別的檔案誤配。
+
+Worker 使用的比對器由 TaskService 依任務版本號快取，類別索引與各路由的候選任務在事件之間共用；
+多個執行緒同時建立同一路由時只會重複建立相同的結果。
+"""
+
+import functools
+import heapq
+import re
+from bisect import bisect_left
+from typing import Literal, Sequence
+
+from backend import schemas
+from backend.utils.include_pattern import compile_include
+from backend.utils.logger import logger
+from backend.utils.safe_regex import BatchOutcome, safe_search_first, safe_search_first_many
+
+TaskMatchMode = Literal["priority", "most_specific"]
+
+# (排序位置, 任務, 編譯後的 include；子字串為 None)
+_Entry = tuple[int, schemas.Task, re.Pattern | None]
+
+# 各比對器保留的路由結果上限，以最近最少使用淘汰
+_ROUTE_CACHE_SIZE = 128
+
+
+def parse_labels(value: str | None) -> frozenset[str]:
+    """將逗號分隔的類別或標籤轉為不分大小寫的集合，與 qBittorrent 的標籤格式相同。"""
+    if not isinstance(value, str):
+        return frozenset()
+    return frozenset(label.strip().casefold() for label in value.split(",") if label.strip())
+
+
+class _TaskSet:
+    """已排序的候選任務，子字串任務直接比對，regex / glob 任務交由沙箱比對。"""
+
+    def __init__(self, entries: Sequence[_Entry], mode: TaskMatchMode):
+        self.mode = mode
+        self._literals: list[tuple[int, schemas.Task]] = []
+        self._pattern_positions: list[int] = []
+        self._pattern_tasks: list[schemas.Task] = []
+        self._patterns: list[re.Pattern] = []
+        for position, task, pattern in entries:
+            if pattern is None:
+                self._literals.append((position, task))
+            else:
+                self._pattern_positions.append(position)
+                self._pattern_tasks.append(task)
+                self._patterns.append(pattern)
+        self._negative_lengths = [-len(task.include) for _, task in self._literals]
+
+    def _match_literal(self, filepath: str) -> tuple[int, schemas.Task] | None:
+        start = 0
+        if self.mode == "most_specific":
+            # include 比路徑還長的任務排在最前面，以二分搜尋一次略過
+            start = bisect_left(self._negative_lengths, -len(filepath))
+        for position, task in self._literals[start:]:
+            if task.include in filepath:
+                return position, task
+        return None
+
+    def _candidates(self, filepath: str) -> tuple[schemas.Task | None, int]:
+        """回傳符合的子字串任務，以及排序在它之前、仍需比對的 pattern 數量。"""
+        literal = self._match_literal(filepath)
+        if literal is None:
+            return None, len(self._patterns)
+        return literal[1], bisect_left(self._pattern_positions, literal[0])
+
+    def match(self, filepath: str) -> schemas.Task | None:
+        literal, count = self._candidates(filepath)
+        if count:
+            index = safe_search_first(self._patterns[:count], filepath)
+            if index is not None:
+                return self._pattern_tasks[index]
+        return literal
+
+    def match_many(self, filepaths: list[str]) -> list[BatchOutcome]:
+        candidates = [self._candidates(filepath) for filepath in filepaths]
+        pending = [i for i, (_, count) in enumerate(candidates) if count]
+        outcomes = [BatchOutcome(value=literal) for literal, _ in candidates]
+        if not pending:
+            return outcomes
+
+        # 每個檔案需比對的 pattern 數量不同，統一比對全部 pattern 後再依位置取捨
+        results = safe_search_first_many(self._patterns, [filepaths[i] for i in pending])
+        for i, result in zip(pending, results):
+            count = candidates[i][1]
+            if not result.ok:
+                outcomes[i] = result
+            elif result.value is not None and result.value < count:
+                outcomes[i] = BatchOutcome(value=self._pattern_tasks[result.value])
+        return outcomes
+
+
+class TaskMatcher:
+    """依比對模式預先排序任務的比對器。
+
+    - priority：依 priority 由大到小比對，同優先順序維持傳入順序（資料庫已依名稱排序）。
+    - most_specific：include 最長的任務優先，長度相同時再依 priority；
+      任務依 include 長度由長到短排列，第一個符合的即為最具體的任務，
+      且 include 比路徑還長的子字串任務會直接略過。
+
+    子字串任務直接以 `in` 比對；regex 與 glob 任務只在排序位置早於
+    第一個符合的子字串任務時才需要執行，並交由 safe_regex 的逾時保護。
+    無法編譯的 pattern 會記錄警告並略過該任務。
+
+    match 傳入 category 或 tags 時套用路由條件：限定類別的任務只在類別相符時比對，
+    限定標籤的任務需要事件帶有全部標籤。兩者皆未提供（例如積壓掃描與 Planner）時不套用路由條件。
+    """
+
+    def __init__(self, tasks: Sequence[schemas.Task], mode: TaskMatchMode = "priority"):
+        self.mode = mode
+        if mode == "most_specific":
+            self.tasks = sorted(tasks, key=lambda task: (-len(task.include), -task.priority))
+        else:
+            self.tasks = sorted(tasks, key=lambda task: -task.priority)
+
+        entries: list[_Entry] = []
+        for position, task in enumerate(self.tasks):
+            try:
+                pattern = compile_include(getattr(task, "include_type", "substring"), task.include)
+            except (re.error, ValueError) as e:
+                logger.warning(f"任務 [{task.name}] 的 include 無法編譯，已略過：{e}")
+                continue
+            entries.append((position, task, pattern))
+
+        # 類別 → 候選任務的索引；未限定類別的任務是所有類別共用的候選
+        self._by_category: dict[str, list[_Entry]] = {}
+        self._uncategorized: list[_Entry] = []
+        for entry in entries:
+            categories = parse_labels(getattr(entry[1], "match_categories", None))
+            for category in categories:
+                self._by_category.setdefault(category, []).append(entry)
+            if not categories:
+                self._uncategorized.append(entry)
+
+        # 任務實際要求的標籤；事件帶的其他標籤不影響候選任務
+        self._task_tags = frozenset().union(
+            *(parse_labels(getattr(entry[1], "match_tags", None)) for entry in entries)
+        )
+
+        self._all = _TaskSet(entries, mode)
+        self._routed = functools.lru_cache(maxsize=_ROUTE_CACHE_SIZE)(self._build_route)
+
+    def _route(self, category: str | None, tags: str | None) -> _TaskSet:
+        if category is None and tags is None:
+            return self._all
+        # 快取鍵只保留任務用到的類別與標籤，下載器每個項目各自的標籤不會讓快取持續成長
+        category_key = (category or "").strip().casefold()
+        if category_key not in self._by_category:
+            category_key = ""
+        return self._routed(category_key, parse_labels(tags) & self._task_tags)
+
+    def _build_route(self, category: str, tags: frozenset[str]) -> _TaskSet:
+        bucket = self._by_category.get(category, []) if category else []
+        candidates = [
+            entry
+            for entry in heapq.merge(bucket, self._uncategorized)
+            if parse_labels(getattr(entry[1], "match_tags", None)) <= tags
+        ]
+        return _TaskSet(candidates, self.mode)
+
+    def match(
+        self, filepath: str, category: str | None = None, tags: str | None = None
+    ) -> schemas.Task | None:
+        """回傳第一個 include 與 filepath 符合的任務，沒有符合時回傳 None。
+
+        Args:
+            filepath: 檔案的絕對路徑
+            category: 下載器回報的類別
+            tags: 下載器回報的標籤，以逗號分隔
+
+        Raises:
+            RegexTimeoutError: pattern 比對逾時。
+        """
+        return self._route(category, tags).match(filepath)
+
+    def match_many(self, filepaths: list[str]) -> list[BatchOutcome]:
+        """批次比對多個檔案，所有 pattern 比對在同一個沙箱子行程中完成。
+
+        Returns:
+            與 filepaths 順序一致的 BatchOutcome 清單，value 為符合的任務或 None；
+            pattern 比對逾時的檔案 ok 為 False。
+        """
+        return self._all.match_many(filepaths)
@@ -0,0 +1,357 @@
+"""來源目錄監看器：以 inotify（或輪詢）偵測下載完成的檔案。
+
+Why: 部分下載器無法執行外部腳本呼叫 Webhook，
+由 Movera 自行監看 allowed_source_directories 作為替代觸發來源。
+inotify 每個子目錄需要一個 watch descriptor，超過上限的子樹改以輪詢涵蓋，
+避免在數萬個子目錄的媒體庫中耗盡系統資源。
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from backend.services.backlog_service import BacklogService
+from backend.utils.logger import logger
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+_EVENT_HEADER = struct.Struct("iIII")
+
+# 下載器寫入中的暫存檔副檔名，不會被派送
+_TEMP_SUFFIXES = (".part", ".!qb", ".aria2", ".tmp", ".crdownload", ".!ut")
+
+
+class _Inotify:
+    """透過 ctypes 呼叫 libc 的最小 inotify 封裝。"""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.fd = fd
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), ctypes.c_uint32(mask))
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def read_events(self, timeout: float) -> list[tuple[int, int, str]]:
+        """等待最多 timeout 秒，回傳 (wd, mask, name) 事件清單。"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _default_max_watches() -> int:
+    """預設使用系統 max_user_watches 的一半，保留給同一使用者的其他程式。"""
+    try:
+        with open("/proc/sys/fs/inotify/max_user_watches") as f:
+            return max(int(f.read().strip()) // 2, 1)
+    except (OSError, ValueError):
+        return 4096
+
+
+class _StabilityTracker:
+    """追蹤候選檔案，直到檔案大小在 settle 秒內維持不變才視為寫入完成。
+
+    Why: IN_CLOSE_WRITE 不代表下載完成——BT 客戶端會反覆開關檔案寫入區塊。
+    """
+
+    def __init__(self, settle: float):
+        self.settle = settle
+        self._pending: dict[str, tuple[int, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def observe(self, path: str, now: float) -> None:
+        if path.lower().endswith(_TEMP_SUFFIXES):
+            return
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            self._pending.pop(path, None)
+            return
+        self._pending[path] = (size, now)
+
+    def pop_stable(self, now: float) -> list[str]:
+        ready = []
+        for path, (size, since) in list(self._pending.items()):
+            if now - since < self.settle:
+                continue
+            try:
+                current = os.stat(path).st_size
+            except OSError:
+                del self._pending[path]
+                continue
+            if current == size:
+                ready.append(path)
+                del self._pending[path]
+            else:
+                self._pending[path] = (current, now)
+        return ready
+
+
+class DirectoryWatcher:
+    """在背景執行緒中監看多個根目錄，將寫入完成的檔案交給 on_ready。
+
+    Args:
+        roots: 要監看的根目錄
+        on_ready: 檔案寫入完成時呼叫的函式
+        mode: auto（inotify 不可用時改為輪詢）、inotify 或 polling
+        settle: 檔案大小需維持不變的秒數
+        poll_interval: 輪詢掃描間隔秒數
+        max_watches: inotify watch 數量上限，None 時依系統上限自動決定
+    """
+
+    def __init__(
+        self,
+        roots: list[str],
+        on_ready: Callable[[str], None],
+        mode: str = "auto",
+        settle: float = 10.0,
+        poll_interval: float = 30.0,
+        max_watches: int | None = None,
+    ):
+        self.roots = [os.path.abspath(r) for r in roots]
+        self.on_ready = on_ready
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.max_watches = max_watches or _default_max_watches()
+        self.active_mode: str | None = None
+        self._tracker = _StabilityTracker(settle)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._wd_to_dir: dict[int, str] = {}
+        self._polled_dirs: set[str] = set()
+        self._snapshot: dict[str, tuple[int, int]] | None = None
+
+    @property
+    def watch_count(self) -> int:
+        return len(self._wd_to_dir)
+
+    @property
+    def polled_directories(self) -> set[str]:
+        return set(self._polled_dirs)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="source-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        inotify = None
+        if self.mode != "polling":
+            try:
+                inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.warning(f"無法啟用 inotify（{e}），改用輪詢模式監看來源目錄")
+        try:
+            if inotify is not None:
+                self.active_mode = "inotify"
+                self._run_inotify(inotify)
+            else:
+                self.active_mode = "polling"
+                self._polled_dirs = set(self.roots)
+                self._run_polling()
+        except Exception as e:
+            logger.exception(f"來源目錄監看器發生錯誤並停止: {e}")
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _dispatch_stable(self) -> None:
+        for path in self._tracker.pop_stable(time.monotonic()):
+            try:
+                self.on_ready(path)
+            except Exception as e:
+                logger.error(f'監看器派送檔案 "{path}" 失敗: {e}')
+
+    # --- polling ---
+
+    def _poll(self) -> None:
+        """掃描輪詢範圍內的目錄，與上一次快照比對新增或變動的檔案。
+
+        第一次掃描僅建立基準，既有檔案交由積壓掃描處理。
+        """
+        current = {
+            path: (stat.st_size, stat.st_mtime_ns)
+            for path, stat in BacklogService.iter_candidates(sorted(self._polled_dirs))
+        }
+        if self._snapshot is not None:
+            now = time.monotonic()
+            for path, signature in current.items():
+                if self._snapshot.get(path) != signature:
+                    self._tracker.observe(path, now)
+        self._snapshot = current
+
+    def _run_polling(self) -> None:
+        next_poll = 0.0
+        while not self._stop.is_set():
+            if time.monotonic() >= next_poll:
+                self._poll()
+                next_poll = time.monotonic() + self.poll_interval
+            self._dispatch_stable()
+            self._stop.wait(min(1.0, self.poll_interval))
+
+    # --- inotify ---
+
+    def _watch_tree(self, inotify: _Inotify, top: str, observe_files: bool = False) -> None:
+        """以廣度優先為 top 及其子目錄加入 watch；超過上限的子樹改由輪詢涵蓋。"""
+        pending = deque([top])
+        now = time.monotonic()
+        while pending:
+            directory = pending.popleft()
+            if len(self._wd_to_dir) >= self.max_watches:
+                self._overflow(directory, pending)
+                return
+            try:
+                wd = inotify.add_watch(directory, _WATCH_MASK)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    self._overflow(directory, pending)
+                    return
+                continue
+            self._wd_to_dir[wd] = directory
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith((".", "#", "@")):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif observe_files and entry.is_file(follow_symlinks=False):
+                            self._tracker.observe(entry.path, now)
+            except OSError:
+                continue
+
+    def _overflow(self, directory: str, pending: deque) -> None:
+        if not self._polled_dirs:
+            logger.warning(
+                f"inotify watch 數量已達上限 {self.max_watches}，其餘子目錄改以輪詢監看"
+            )
+        self._polled_dirs.add(directory)
+        self._polled_dirs.update(pending)
+        pending.clear()
+
+    def _run_inotify(self, inotify: _Inotify) -> None:
+        for root in self.roots:
+            self._watch_tree(inotify, root)
+        logger.info(
+            f"來源目錄監看已啟動（inotify），watch 數量: {len(self._wd_to_dir)}，"
+            f"輪詢目錄數量: {len(self._polled_dirs)}"
+        )
+
+        next_poll = time.monotonic() + self.poll_interval
+        if self._polled_dirs:
+            self._poll()
+        while not self._stop.is_set():
+            for wd, mask, name in inotify.read_events(timeout=1.0):
+                self._handle_event(inotify, wd, mask, name)
+            if self._polled_dirs and time.monotonic() >= next_poll:
+                self._poll()
+                next_poll = time.monotonic() + self.poll_interval
+            self._dispatch_stable()
+
+    def _handle_event(self, inotify: _Inotify, wd: int, mask: int, name: str) -> None:
+        if mask & IN_Q_OVERFLOW:
+            logger.warning("inotify 事件佇列溢位，部分檔案事件可能遺失")
+            return
+        if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+            self._wd_to_dir.pop(wd, None)
+            return
+        directory = self._wd_to_dir.get(wd)
+        if directory is None or not name or name.startswith((".", "#", "@")):
+            return
+        path = os.path.join(directory, name)
+        if mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                # 移入的資料夾可能已包含完整檔案，一併列入候選
+                self._watch_tree(inotify, path, observe_files=True)
+            return
+        if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+            self._tracker.observe(path, time.monotonic())
+
+
+def start_source_watcher() -> DirectoryWatcher | None:
+    """依設定建立並啟動來源目錄監看器，寫入完成的檔案送入下載處理佇列。
+
+    未設定允許的來源目錄時不啟動並回傳 None。
+    監看範圍於啟動時決定，變更來源目錄設定後需重新啟動服務。
+    """
+    from backend.database import SessionLocal
+    from backend.repositories.setting import SettingRepository
+    from backend.services.setting_service import SettingService
+    from backend.utils.env_config import (
+        get_watcher_max_watches,
+        get_watcher_mode,
+        get_watcher_poll_interval,
+        get_watcher_settle_seconds,
+    )
+    from backend.worker.job_queue import download_queue
+    from backend.worker.worker import process_completed_download
+
+    db = SessionLocal()
+    try:
+        roots = SettingService(SettingRepository(db=db)).get_allowed_source_directories()
+    finally:
+        db.close()
+
+    roots = [root for root in roots if os.path.isdir(root)]
+    if not roots:
+        logger.warning("未設定可用的允許來源目錄，來源目錄監看未啟動")
+        return None
+
+    watcher = DirectoryWatcher(
+        roots=roots,
+        on_ready=lambda path: download_queue.submit(process_completed_download, path),
+        mode=get_watcher_mode(),
+        settle=get_watcher_settle_seconds(),
+        poll_interval=get_watcher_poll_interval(),
+        max_watches=get_watcher_max_watches(),
+    )
+    watcher.start()
+    return watcher
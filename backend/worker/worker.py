@@ -1,20 +1,39 @@
 import os
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal
+from typing import Iterator, Literal
+
+from sqlalchemy.orm import Session
 
 from backend import schemas
 from backend.database import SessionLocal
 from backend.exceptions.worker_exception import MoveOperationError, RenameOperationError
+from backend.repositories.job_trace import JobTraceRepository
 from backend.repositories.log import LogRepository
 from backend.repositories.setting import SettingRepository
 from backend.repositories.task import TaskRepository
+from backend.services.job_trace_service import JobTraceService
 from backend.services.log_service import LogService
 from backend.services.setting_service import SettingService
 from backend.services.task_service import TaskService
+from backend.utils.env_config import get_task_match_mode
+from backend.utils.event_bus import event_bus
 from backend.utils.logger import logger
+from backend.utils.metrics import (
+    DB_POOL_WAIT,
+    JOB_FAILURES,
+    JOBS,
+    MATCH_DURATION,
+    RENAME_DURATION,
+)
 from backend.utils.move import move
+from backend.utils.path_validator import get_path_matcher
+from backend.utils.profiler import profiler
 from backend.utils.rename import Rename
+from backend.utils.safe_regex import RegexTimeoutError
+from backend.utils.tracing import JobTrace, current_trace, start_trace, trace_span, use_trace
+from backend.worker.matcher import TaskMatcher
 
 
 @dataclass
@@ -28,29 +47,50 @@ class WorkerServices:
     task_service: TaskService
     log_service: LogService
     setting_service: SettingService
+    trace_service: JobTraceService | None = None
+
 
+@contextmanager
+def worker_session() -> Iterator[Session]:
+    """單一 Worker 工作使用的 session，結束時提交並一定關閉。
 
-def create_worker_services() -> WorkerServices:
-    """建立 Worker 服務實例。
+    Why: 過去每個工作建立的 session 從未關閉，突發事件時連線與 ORM identity map
+    要等到 GC 才釋放，QueuePool 耗盡後後續工作會卡在取得連線。
+    同一工作的任務、日誌、設定與追蹤服務共用此 session。
 
-    Why: 將服務建立邏輯集中在此工廠函式，
-    讓呼叫端（webhook 路由）負責生命週期管理。
+    expire_on_commit=False 讓寫入日誌後不必為了讀取任務欄位重新查詢整個任務；
+    Worker 對任務與設定只讀不寫，不會讀到自己造成的過期資料。
+    """
+    with DB_POOL_WAIT.time():
+        db = SessionLocal(expire_on_commit=False)
+        db.connection()
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def create_worker_services(db: Session) -> WorkerServices:
+    """以呼叫端的 session 建立 Worker 服務實例。
+
+    Why: 將服務建立邏輯集中在此工廠函式，session 的生命週期由呼叫端負責；
+    session 必須由呼叫端傳入（通常來自 worker_session()），避免建立無人關閉的連線。
     """
-    db = SessionLocal()
     return WorkerServices(
         task_service=TaskService(TaskRepository(db=db)),
         log_service=LogService(LogRepository(db=db)),
         setting_service=SettingService(SettingRepository(db=db)),
+        trace_service=JobTraceService(JobTraceRepository(db=db)),
     )
 
 
 def is_path_within_allowed(filepath: str, allowed_directories: list[str]) -> bool:
     """檢查檔案路徑是否在允許的來源目錄白名單範圍內。"""
-    resolved = Path(filepath).resolve()
-    for allowed_dir in allowed_directories:
-        if resolved.is_relative_to(Path(allowed_dir).resolve()):
-            return True
-    return False
+    return get_path_matcher(allowed_directories).matches(filepath)
 
 
 def web_logger(
@@ -66,19 +106,36 @@ def web_logger(
     :param level: 日誌等級
     :param message: 日誌訊息
     """
-    services.log_service.create_log(
-        schemas.LogCreate(
-            task_id=task_id,
-            level=level.upper(),
-            message=message,
+    with trace_span("log"):
+        services.log_service.create_log(
+            schemas.LogCreate(
+                task_id=task_id,
+                level=level.upper(),
+                message=message,
+            )
         )
-    )
+
+
+def find_matching_task(
+    tasks: list[schemas.Task],
+    filepath: str,
+    category: str | None = None,
+    tags: str | None = None,
+) -> schemas.Task | None:
+    """依 TASK_MATCH_MODE 回傳 include 出現在 filepath 中的任務，不寫入任何日誌。
+
+    Why: Planner 需要與 Worker 完全一致的比對結果，但 dry-run 不可留下任務日誌，
+    因此將純比對邏輯與記錄行為分開。比對大量檔案時應改為建立一次 TaskMatcher 重複使用。
+    """
+    return TaskMatcher(tasks, get_task_match_mode()).match(filepath, category, tags)
 
 
 def match_task(
     services: WorkerServices,
-    tasks: list[schemas.Task],
+    matcher: TaskMatcher,
     filepath: str,
+    category: str | None = None,
+    tags: str | None = None,
 ) -> schemas.Task | None:
     """將路徑 filepath 與任務的 include 進行比對，找到第一個符合的任務。
 
@@ -87,22 +144,28 @@ def match_task(
 
     Args:
         services: Worker 服務容器
-        tasks: 任務列表
+        matcher: 已啟用任務的比對器
         filepath: 檔案的絕對路徑
+        category: 下載器回報的類別（可選）
+        tags: 下載器回報的標籤，以逗號分隔（可選）
 
     Returns:
         符合的任務，或 None 如果沒有符合
     """
-    for task in tasks:
-        if task.include in filepath:
-            web_logger(
-                services=services,
-                task_id=task.id,
-                level="INFO",
-                message=f'檔案 "{os.path.basename(filepath)}" 與任務 "{task.name}" 匹配成功',
-            )
-            return task
-    return None
+    with MATCH_DURATION.time():
+        try:
+            task = matcher.match(filepath, category, tags)
+        except RegexTimeoutError as e:
+            logger.error(f'檔案 "{os.path.basename(filepath)}" 比對任務失敗: {e}')
+            return None
+    if task is not None:
+        web_logger(
+            services=services,
+            task_id=task.id,
+            level="INFO",
+            message=f'檔案 "{os.path.basename(filepath)}" 與任務 "{task.name}" 匹配成功',
+        )
+    return task
 
 
 def perform_rename_operation(
@@ -127,7 +190,7 @@ def perform_rename_operation(
         return filepath
 
     try:
-        dst_filepath = Rename(
+        rename = Rename(
             filepath=filepath,
             src=task.src_filename,
             dst=task.dst_filename,
@@ -135,7 +198,9 @@ def perform_rename_operation(
             episode_offset_enabled=task.episode_offset_enabled,
             episode_offset_group=task.episode_offset_group,
             episode_offset_value=task.episode_offset_value,
-        ).execute_rename()
+        )
+        with RENAME_DURATION.time(rule=task.rename_rule):
+            dst_filepath = rename.execute_rename()
 
         web_logger(
             services=services,
@@ -187,37 +252,117 @@ def perform_move_operation(
         raise MoveOperationError(filepath, task.move_to, str(e)) from e
 
 
+def publish_job_event(
+    status: Literal["started", "skipped", "completed", "failed"],
+    filepath: str,
+    task: schemas.Task | None = None,
+    **extra,
+) -> None:
+    """發布工作狀態變化事件，讓即時訂閱者不必輪詢即可得知處理進度。"""
+    if status != "started":
+        JOBS.inc(status=status)
+    trace = current_trace()
+    event_bus.publish(
+        "job",
+        {
+            "job_id": trace.id if trace is not None else None,
+            "status": status,
+            "filepath": filepath,
+            "task_id": task.id if task is not None else None,
+            **extra,
+        },
+    )
+
+
 def process_completed_download(
-    filepath: str, services: WorkerServices | None = None
+    filepath: str,
+    services: WorkerServices | None = None,
+    category: str | None = None,
+    tags: str | None = None,
 ) -> None:
     """處理已完成的下載任務。
 
     Why: 接受可選的 services 參數，讓測試可以注入 mock 服務，
     同時保持向後相容性——未傳入時自動建立服務實例。
+    每個工作帶有一個 trace，結束後將各階段耗時與任務日誌一同保存。
 
     Args:
         filepath: 檔案的絕對路徑
-        services: Worker 服務容器（可選，未提供時自動建立）
+        services: Worker 服務容器（可選，未提供時以 worker_session() 建立並於結束時關閉）
+        category: 下載器回報的類別，用於篩選限定類別的任務（可選）
+        tags: 下載器回報的標籤，以逗號分隔（可選）
     """
     if services is None:
-        services = create_worker_services()
+        with worker_session() as db:
+            process_completed_download(filepath, create_worker_services(db), category, tags)
+        return
+    trace = start_trace(filepath)
+    with use_trace(trace), profiler.profile("jobs", os.path.basename(filepath)):
+        _run_job(services, trace, filepath, category, tags)
+        record_trace(services, trace)
+
+
+def record_trace(services: WorkerServices, trace: JobTrace) -> None:
+    """保存工作的階段追蹤；寫入失敗只記錄警告，不影響工作結果。"""
+    if services.trace_service is None or not trace.sampled:
+        return
+    try:
+        services.trace_service.record(trace)
+    except Exception:
+        logger.exception(f'檔案 "{trace.filepath}" 的階段追蹤保存失敗')
+
+
+def _run_job(
+    services: WorkerServices,
+    trace: JobTrace,
+    filepath: str,
+    category: str | None = None,
+    tags: str | None = None,
+) -> None:
+    publish_job_event("started", filepath)
 
     # 驗證檔案來源路徑是否在允許的白名單範圍內
-    allowed_source = services.setting_service.get_allowed_source_directories()
-    if allowed_source and not is_path_within_allowed(filepath, allowed_source):
+    with trace.span("whitelist"):
+        allowed_source = services.setting_service.get_allowed_source_directories()
+        allowed = not allowed_source or is_path_within_allowed(filepath, allowed_source)
+    if not allowed:
         logger.warning(f'檔案 "{filepath}" 不在允許的來源目錄範圍內，已拒絕處理')
+        trace.status = "skipped"
+        publish_job_event("skipped", filepath, reason="not_allowed")
         return
 
-    tasks = services.task_service.get_enabled_tasks()
+    # 任務未變更時沿用快取的比對器，include 的編譯與類別索引不必每個事件重建
+    with trace.span("load_tasks"):
+        matcher = services.task_service.get_task_matcher(get_task_match_mode())
 
-    task = match_task(services, tasks, filepath)
+    with trace.span("match"):
+        task = match_task(services, matcher, filepath, category, tags)
     if task is None:
+        trace.status = "skipped"
+        publish_job_event("skipped", filepath, reason="no_match")
+        return
+    trace.task_id = task.id
+
+    # 目標目錄位於監看範圍內時，移入的檔案會再次觸發事件；已就位的檔案不重複處理
+    if Path(filepath).parent.resolve() == Path(task.move_to).resolve():
+        logger.info(f'檔案 "{filepath}" 已位於任務目標目錄，略過處理')
+        trace.status = "skipped"
+        publish_job_event("skipped", filepath, task, reason="in_target")
         return
 
+    trace.status = "failed"
     try:
-        dst_filepath = perform_rename_operation(services, task, filepath)
-        perform_move_operation(services, task, dst_filepath)
-    except RenameOperationError:
+        with trace.span("rename"):
+            dst_filepath = perform_rename_operation(services, task, filepath)
+        with trace.span("move"):
+            perform_move_operation(services, task, dst_filepath)
+    except RenameOperationError as e:
+        JOB_FAILURES.inc(task_id=task.id, stage="rename")
+        publish_job_event("failed", filepath, task, error=str(e))
         return
-    except MoveOperationError:
+    except MoveOperationError as e:
+        JOB_FAILURES.inc(task_id=task.id, stage="move")
+        publish_job_event("failed", filepath, task, error=str(e))
         return
+    trace.status = "completed"
+    publish_job_event("completed", filepath, task, move_to=task.move_to)
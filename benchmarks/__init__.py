@@ -0,0 +1,8 @@
+"""Worker 熱路徑的效能基準測試。
+
+Why: tests/backend 只驗證行為，無法察覺比對、重新命名、移動或 Webhook 吞吐量的效能退化。
+此套件以固定的資料量重複量測各熱路徑，將結果寫成 JSON，
+並可與先前的結果比較，在中位數變慢超過門檻時以非零結束碼回報。
+
+執行方式：`uv run python -m benchmarks --help`
+"""
@@ -0,0 +1,80 @@
+"""效能基準測試的命令列進入點。
+
+    uv run python -m benchmarks                          # 執行全部案例並寫入 .benchmarks/results.json
+    uv run python -m benchmarks -k rename --quick        # 只執行名稱含 rename 的案例，迭代次數減少
+    uv run python -m benchmarks --compare baseline.json  # 與先前結果比較，退化時結束碼為 1
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+DEFAULT_OUTPUT = Path(".benchmarks/results.json")
+QUICK_SCALE = 0.2
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Movera 熱路徑效能基準測試")
+    parser.add_argument("-k", "--filter", action="append", default=[], help="只執行名稱包含此字串的案例，可重複指定")
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_OUTPUT, help="結果 JSON 的輸出路徑")
+    parser.add_argument("--compare", type=Path, help="作為比較基準的先前結果 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="中位數允許變慢的比例（預設 0.2，即 20%%）")
+    parser.add_argument("--quick", action="store_true", help="減少迭代次數，用於快速檢查")
+    parser.add_argument("--list", action="store_true", help="列出所有案例後結束")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    # 工作目錄放在磁碟上（/tmp 可能是 tmpfs），並在匯入 backend 前指定暫存資料庫
+    workroot = Path(".benchmarks")
+    workroot.mkdir(exist_ok=True)
+    workdir = Path(tempfile.mkdtemp(prefix="run-", dir=workroot)).resolve()
+    os.environ["SQLITE_PATH"] = str(workdir / "benchmark.db")
+
+    from benchmarks import cases  # noqa: F401 註冊所有案例
+    from benchmarks.harness import (
+        Context,
+        compare,
+        format_comparison,
+        load_results,
+        registered,
+        run_all,
+        write_results,
+    )
+
+    selected = [
+        case
+        for case in registered()
+        if not args.filter or any(pattern in case.name for pattern in args.filter)
+    ]
+    if args.list:
+        for case in selected:
+            print(case.name)
+        return 0
+
+    try:
+        context = Context(workdir=workdir, scale=QUICK_SCALE if args.quick else 1.0)
+        results, skipped = run_all(selected, context)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    write_results(args.output, results, skipped)
+    print(f"\n結果已寫入 {args.output}")
+
+    if args.compare is None:
+        return 0
+    comparisons, regressions = compare(load_results(args.compare), results, args.threshold)
+    print(f"\n與 {args.compare} 比較（門檻 {args.threshold:.0%}）：")
+    for comparison in comparisons:
+        marker = "  ← 退化" if comparison in regressions else ""
+        print(format_comparison(comparison) + marker)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
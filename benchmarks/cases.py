@@ -0,0 +1,307 @@
+"""各熱路徑的基準測試案例。
+
+匯入此模組前必須先設定 SQLITE_PATH（由 `python -m benchmarks` 負責），
+Webhook 端到端案例才會寫入暫存資料庫而非正式資料庫。
+"""
+
+import os
+import shutil
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend import schemas
+from backend.utils.rename import Rename, apply_episode_offset, apply_episode_offsets
+from backend.utils.safe_regex import safe_compile, safe_search, safe_sub
+
+from benchmarks.harness import BenchmarkSkipped, Context, benchmark, measure
+
+SAMPLE_FILENAME = "[Group] 公爵千金的家庭教師 - 01 [1080P].mp4"
+MOVE_FILE_SIZE = 16 * 1024 * 1024
+TMPFS_DIR = Path("/dev/shm")
+WEBHOOK_BATCH = 200
+
+
+# --- match_task ---
+
+
+class _NullLogService:
+    def create_log(self, log):
+        return None
+
+
+def _match_case(task_count: int):
+    def run(ctx: Context):
+        from backend.worker.matcher import TaskMatcher
+        from backend.worker.worker import WorkerServices, match_task
+
+        # 只有最後一個任務會匹配，量測比對全部任務的最壞情況
+        tasks = [
+            SimpleNamespace(
+                id=str(i),
+                name=f"任務 {i}",
+                include=f"影集 {i:05d}",
+                include_type="substring",
+                priority=0,
+            )
+            for i in range(task_count)
+        ]
+        filepath = f"/downloads/影集 {task_count - 1:05d} - 01.mp4"
+        services = WorkerServices(
+            task_service=None, log_service=_NullLogService(), setting_service=None
+        )
+        # 比對器由 TaskService 依任務版本號快取，每個事件只需比對
+        matcher = TaskMatcher(tasks)
+        return measure(
+            lambda _: match_task(services, matcher, filepath),
+            iterations=ctx.iterations(max(10, 100_000 // task_count)),
+        )
+
+    return run
+
+
+for _count in (10, 1_000, 10_000):
+    benchmark(f"match_task[{_count}]")(_match_case(_count))
+
+
+# --- Rename.execute_rename ---
+
+_RENAME_RULES = {
+    "parse": ("[{group}] {title} - {episode} [{quality}].mp4", "{title} - S01E{episode}.mp4", "episode"),
+    "regex": (
+        r"\[(?P<group>.+)\] (?P<title>.+) - (?P<episode>\d+) \[(?P<quality>.+)\]\.mp4",
+        r"\g<title> - S01E\g<episode>.mp4",
+        "episode",
+    ),
+}
+
+
+def _rename_case(rule: str, offset: bool):
+    def run(ctx: Context):
+        src, dst, group = _RENAME_RULES[rule]
+        workdir = ctx.workdir / f"rename-{rule}-{offset}"
+        workdir.mkdir(parents=True, exist_ok=True)
+
+        def setup() -> Rename:
+            for leftover in workdir.iterdir():
+                leftover.unlink()
+            filepath = workdir / SAMPLE_FILENAME
+            filepath.touch()
+            return Rename(
+                filepath=filepath,
+                src=src,
+                dst=dst,
+                rule=rule,
+                episode_offset_enabled=offset,
+                episode_offset_group=group if offset else None,
+                episode_offset_value=12 if offset else 0,
+            )
+
+        iterations = 200 if rule == "parse" else 20
+        return measure(
+            lambda rename: rename.execute_rename(),
+            setup=setup,
+            iterations=ctx.iterations(iterations),
+        )
+
+    return run
+
+
+for _rule in ("parse", "regex"):
+    for _offset in (False, True):
+        _label = "offset" if _offset else "plain"
+        benchmark(f"rename.{_rule}[{_label}]")(_rename_case(_rule, _offset))
+
+
+# --- episode 偏移 ---
+
+OFFSET_BATCH = 1_000
+
+
+@benchmark(f"episode_offset.single[{OFFSET_BATCH}]")
+def bench_episode_offset_single(ctx: Context):
+    values = [f"{i % 200:02d}" for i in range(OFFSET_BATCH)]
+    return measure(
+        lambda _: [apply_episode_offset(value, 12) for value in values],
+        iterations=ctx.iterations(50),
+        units=OFFSET_BATCH,
+    )
+
+
+@benchmark(f"episode_offset.batch[{OFFSET_BATCH}]")
+def bench_episode_offset_batch(ctx: Context):
+    values = [f"{i % 200:02d}" for i in range(OFFSET_BATCH)]
+    return measure(
+        lambda _: apply_episode_offsets(values, 12),
+        iterations=ctx.iterations(50),
+        units=OFFSET_BATCH,
+    )
+
+
+# --- 正則沙箱 ---
+
+
+@benchmark("safe_regex.search")
+def bench_safe_search(ctx: Context):
+    pattern = safe_compile(_RENAME_RULES["regex"][0])
+    return measure(lambda _: safe_search(pattern, SAMPLE_FILENAME), iterations=ctx.iterations(20))
+
+
+@benchmark("safe_regex.sub")
+def bench_safe_sub(ctx: Context):
+    pattern = safe_compile(_RENAME_RULES["regex"][0])
+    dst = _RENAME_RULES["regex"][1]
+    return measure(lambda _: safe_sub(pattern, dst, SAMPLE_FILENAME), iterations=ctx.iterations(20))
+
+
+# --- move() ---
+
+
+def _move_dirs(ctx: Context, source: str, target: str) -> tuple[Path, Path]:
+    roots = {"disk": ctx.workdir}
+    if TMPFS_DIR.is_dir() and os.access(TMPFS_DIR, os.W_OK):
+        roots["tmpfs"] = TMPFS_DIR
+    if source not in roots or target not in roots:
+        raise BenchmarkSkipped(f"{TMPFS_DIR} 不存在或不可寫入")
+    token = uuid.uuid4().hex
+    return roots[source] / f"movera-bench-src-{token}", roots[target] / f"movera-bench-dst-{token}"
+
+
+def _move_case(source: str, target: str):
+    def run(ctx: Context):
+        from backend.utils.move import move
+
+        src_dir, dst_dir = _move_dirs(ctx, source, target)
+        same_device = source == target
+        src_dir.mkdir(parents=True)
+        dst_dir.mkdir(parents=True)
+        try:
+            if (src_dir.stat().st_dev == dst_dir.stat().st_dev) != same_device:
+                raise BenchmarkSkipped("來源與目標的裝置配置與案例不符")
+            payload = os.urandom(MOVE_FILE_SIZE)
+
+            def setup() -> Path:
+                moved = dst_dir / "video.mp4"
+                if moved.exists():
+                    moved.unlink()
+                filepath = src_dir / "video.mp4"
+                filepath.write_bytes(payload)
+                return filepath
+
+            return measure(
+                lambda filepath: move(filepath, dst_dir),
+                setup=setup,
+                iterations=ctx.iterations(10),
+            )
+        finally:
+            shutil.rmtree(src_dir, ignore_errors=True)
+            shutil.rmtree(dst_dir, ignore_errors=True)
+
+    return run
+
+
+for _source, _target in (("disk", "disk"), ("tmpfs", "tmpfs"), ("disk", "tmpfs"), ("tmpfs", "disk")):
+    _kind = "same_device" if _source == _target else "cross_device"
+    benchmark(f"move.{_kind}[{_source}->{_target}]")(_move_case(_source, _target))
+
+
+# --- TaskRepository.batch_create ---
+
+
+@benchmark("task_repository.batch_create[500]")
+def bench_batch_create(ctx: Context):
+    from backend.database import Base
+    from backend.repositories.task import TaskRepository
+
+    items = [
+        schemas.TaskCreate(name=f"任務 {i}", include=f"影集 {i}", move_to=f"/media/影集 {i}")
+        for i in range(schemas.TASK_BATCH_MAX_ITEMS)
+    ]
+    sessions = []
+
+    def setup() -> TaskRepository:
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        sessions.append(session)
+        return TaskRepository(db=session)
+
+    try:
+        return measure(
+            lambda repository: repository.batch_create(items),
+            setup=setup,
+            iterations=ctx.iterations(5),
+            units=len(items),
+        )
+    finally:
+        for session in sessions:
+            session.close()
+
+
+# --- Webhook 端到端 ---
+
+
+@benchmark(f"webhook.end_to_end[{WEBHOOK_BATCH}]")
+def bench_webhook_end_to_end(ctx: Context):
+    """經由 ASGI app 送出 Webhook，直到佇列中的比對、重新命名與移動全部完成。"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from backend.database import Base, SessionLocal, engine
+    from backend.repositories.task import TaskRepository
+    from backend.routers import webhook
+    from backend.worker.job_queue import download_queue
+
+    Base.metadata.create_all(bind=engine)
+    src_dir = ctx.workdir / "webhook-src"
+    dst_dir = ctx.workdir / "webhook-dst"
+    src_dir.mkdir(parents=True, exist_ok=True)
+    dst_dir.mkdir(parents=True, exist_ok=True)
+
+    with SessionLocal() as session:
+        repository = TaskRepository(db=session)
+        if not repository.get_by_name("基準測試"):
+            repository.create(
+                schemas.TaskCreate(
+                    name="基準測試",
+                    include="公爵千金的家庭教師",
+                    move_to=str(dst_dir),
+                    src_filename="{title} - {episode}.mp4",
+                    dst_filename="{title} - S01E{episode}.mp4",
+                    rename_rule="parse",
+                )
+            )
+
+    app = FastAPI()
+    app.include_router(webhook.router)
+    client = TestClient(app)
+
+    def setup() -> list[str]:
+        token = uuid.uuid4().hex[:8]
+        filepaths = []
+        for i in range(WEBHOOK_BATCH):
+            filepath = src_dir / f"公爵千金的家庭教師 - {token}{i:04d}.mp4"
+            filepath.touch()
+            filepaths.append(str(filepath))
+        return filepaths
+
+    def run(filepaths: list[str]) -> None:
+        for filepath in filepaths:
+            client.post("/webhook/on-complete", json={"filepath": filepath})
+        download_queue.join()
+
+    rounds = 3
+    measurement = measure(run, setup=setup, iterations=1, rounds=rounds, units=WEBHOOK_BATCH)
+    # 確認每個事件都真的完成重新命名與移動，避免量測到被略過或失敗的流程
+    moved = len(list(dst_dir.iterdir()))
+    if moved != rounds * WEBHOOK_BATCH:
+        raise RuntimeError(f"預期移動 {rounds * WEBHOOK_BATCH} 個檔案，實際為 {moved}")
+    return measurement
@@ -0,0 +1,200 @@
+"""基準測試的註冊、量測、輸出與比較。"""
+
+import json
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Callable
+
+RESULT_FORMAT_VERSION = 1
+
+
+class BenchmarkSkipped(Exception):
+    """環境不支援此項量測（例如沒有 tmpfs）時由案例拋出。"""
+
+
+@dataclass
+class Result:
+    """單一案例的量測結果；時間皆為每次操作的秒數。"""
+
+    name: str
+    rounds: int
+    iterations: int
+    units: int
+    min: float
+    median: float
+    mean: float
+    max: float
+    stdev: float
+    ops_per_sec: float
+
+
+@dataclass
+class Measurement:
+    """案例回傳給執行器的原始量測：每一輪的總耗時。"""
+
+    iterations: int
+    units: int
+    round_times: list[float] = field(default_factory=list)
+
+    def to_result(self, name: str) -> Result:
+        per_op = [t / (self.iterations * self.units) for t in self.round_times]
+        median = statistics.median(per_op)
+        return Result(
+            name=name,
+            rounds=len(per_op),
+            iterations=self.iterations,
+            units=self.units,
+            min=min(per_op),
+            median=median,
+            mean=statistics.fmean(per_op),
+            max=max(per_op),
+            stdev=statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+            ops_per_sec=1 / median if median > 0 else float("inf"),
+        )
+
+
+def measure(
+    func: Callable[[Any], Any],
+    *,
+    setup: Callable[[], Any] | None = None,
+    iterations: int = 100,
+    rounds: int = 5,
+    units: int = 1,
+) -> Measurement:
+    """重複執行 func 並量測耗時。
+
+    setup 不計入耗時，每次迭代前呼叫一次，回傳值會傳給 func；
+    units 為每次迭代處理的項目數（例如一次送出的 Webhook 數），用於換算每項耗時與吞吐量。
+    """
+    measurement = Measurement(iterations=iterations, units=units)
+    for _ in range(rounds):
+        elapsed = 0.0
+        for _ in range(iterations):
+            arg = setup() if setup is not None else None
+            started = time.perf_counter()
+            func(arg)
+            elapsed += time.perf_counter() - started
+        measurement.round_times.append(elapsed)
+    return measurement
+
+
+@dataclass
+class Benchmark:
+    name: str
+    run: Callable[["Context"], Measurement]
+
+
+@dataclass
+class Context:
+    """傳給每個案例的執行環境。
+
+    workdir: 位於磁碟上的暫存目錄；scale: 迭代次數倍率（--quick 時小於 1）。
+    """
+
+    workdir: Path
+    scale: float = 1.0
+
+    def iterations(self, count: int) -> int:
+        return max(1, int(count * self.scale))
+
+
+_REGISTRY: list[Benchmark] = []
+
+
+def benchmark(name: str) -> Callable:
+    """註冊基準測試案例，名稱以 `.` 分隔類別，方括號內為參數。"""
+
+    def decorator(run: Callable[[Context], Measurement]) -> Callable[[Context], Measurement]:
+        _REGISTRY.append(Benchmark(name=name, run=run))
+        return run
+
+    return decorator
+
+
+def registered() -> list[Benchmark]:
+    return list(_REGISTRY)
+
+
+def run_all(
+    benchmarks: list[Benchmark], context: Context, log: Callable[[str], None] = print
+) -> tuple[list[Result], dict[str, str]]:
+    """依序執行案例，回傳 (結果, {被略過的案例: 原因})。"""
+    results: list[Result] = []
+    skipped: dict[str, str] = {}
+    for case in benchmarks:
+        try:
+            result = case.run(context).to_result(case.name)
+        except BenchmarkSkipped as e:
+            skipped[case.name] = str(e)
+            log(f"{case.name:<48} 略過：{e}")
+            continue
+        results.append(result)
+        log(
+            f"{case.name:<48} median {_format_seconds(result.median):>10}"
+            f"  ±{_format_seconds(result.stdev):>9}  {result.ops_per_sec:>12.1f} ops/s"
+        )
+    return results, skipped
+
+
+def write_results(path: Path, results: list[Result], skipped: dict[str, str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "version": RESULT_FORMAT_VERSION,
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {result.name: asdict(result) for result in results},
+        "skipped": skipped,
+    }
+    path.write_text(json.dumps(document, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def load_results(path: Path) -> dict[str, dict]:
+    return json.loads(path.read_text(encoding="utf-8"))["results"]
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline > 0 else float("inf")
+
+
+def compare(
+    baseline: dict[str, dict], results: list[Result], threshold: float
+) -> tuple[list[Comparison], list[Comparison]]:
+    """比較兩次結果的中位數，回傳 (全部比較, 變慢超過 threshold 的項目)。
+
+    只比較兩邊都有的案例；threshold 為允許的變慢比例，例如 0.2 代表慢 20% 以內不視為退化。
+    """
+    comparisons = [
+        Comparison(result.name, baseline[result.name]["median"], result.median)
+        for result in results
+        if result.name in baseline
+    ]
+    regressions = [c for c in comparisons if c.ratio > 1 + threshold]
+    return comparisons, regressions
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f}ms"
+    return f"{seconds * 1e6:.3f}µs"
+
+
+def format_comparison(comparison: Comparison) -> str:
+    change = (comparison.ratio - 1) * 100
+    return (
+        f"{comparison.name:<48} {_format_seconds(comparison.baseline):>10}"
+        f" → {_format_seconds(comparison.current):>10}  ({change:+.1f}%)"
+    )
@@ -0,0 +1,380 @@
+"""以行程內 ASGI transport 重播下載器 Webhook 風暴的負載測試。
+
+Why: 基準測試只量測單一路徑的耗時，無法回答「一季整包同時完成」或「多個下載器同時觸發」時
+Webhook 的回應延遲、佇列消化速度與 SQLite 鎖定衝突。此工具建立合成的檔案樹與大量任務，
+依情境排程送出 Webhook，並以事件匯流排的 job 事件計算每個檔案的端到端處理延遲，
+用於部署前決定 DOWNLOAD_WORKERS 等參數。
+
+    uv run python -m benchmarks.loadtest --scenario all --tasks 2000 --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+SCENARIOS = ("season-pack", "many-clients", "duplicates")
+
+
+@dataclass
+class Fire:
+    """在情境開始後 at 秒送出一次 filepath 的完成事件。"""
+
+    at: float
+    filepath: str
+
+
+@dataclass
+class ScenarioReport:
+    scenario: str
+    requests: int
+    accepted: int
+    duplicates: int
+    http_errors: int
+    completed: int
+    failed: int
+    skipped: int
+    unfinished: int
+    wall_seconds: float
+    accept_latency_ms: dict[str, float]
+    end_to_end_latency_ms: dict[str, float]
+    db_lock_errors: int
+    regex_subprocesses: int
+    peak_queue_depth: int
+    peak_db_connections: int
+    open_db_connections: int
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """以最近排名法計算 p50／p95／p99 與最大值。"""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        index = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+        return round(ordered[index], 3)
+
+    return {"p50": rank(50), "p95": rank(95), "p99": rank(99), "max": round(ordered[-1], 3)}
+
+
+# --- 合成資料 ---
+
+
+@dataclass
+class Fixture:
+    src_root: Path
+    dst_root: Path
+    shows: list[str]
+    rng: random.Random
+    _episode_counter: dict[str, int] = field(default_factory=dict)
+
+    def season_pack(self, episodes: int) -> list[str]:
+        """在來源目錄建立一季的集數檔案，回傳檔案路徑。"""
+        show = self.rng.choice(self.shows)
+        start = self._episode_counter.get(show, 0)
+        self._episode_counter[show] = start + episodes
+        season_dir = self.src_root / f"{show} [{self.rng.randrange(1 << 30):08x}]"
+        season_dir.mkdir(parents=True, exist_ok=True)
+        filepaths = []
+        for episode in range(start + 1, start + episodes + 1):
+            filepath = season_dir / f"{show} - {episode:03d}.mp4"
+            filepath.write_bytes(b"\0" * 1024)
+            filepaths.append(str(filepath))
+        return filepaths
+
+
+def create_fixture(workdir: Path, task_count: int, regex_ratio: float, seed: int) -> Fixture:
+    """建立 task_count 個任務；parse 與 regex 規則依 regex_ratio 混合。"""
+    from backend import schemas
+    from backend.database import SessionLocal
+    from backend.repositories.task import TaskRepository
+
+    rng = random.Random(seed)
+    src_root = workdir / "downloads"
+    dst_root = workdir / "media"
+    shows = [f"合成影集 {i:05d}" for i in range(task_count)]
+    items = []
+    for show in shows:
+        if rng.random() < regex_ratio:
+            rule = dict(
+                rename_rule="regex",
+                src_filename=r"(?P<title>.+) - (?P<episode>\d+)\.mp4",
+                dst_filename=r"\g<title> - S01E\g<episode>.mp4",
+            )
+        else:
+            rule = dict(
+                rename_rule="parse",
+                src_filename="{title} - {episode}.mp4",
+                dst_filename="{title} - S01E{episode}.mp4",
+            )
+        items.append(
+            schemas.TaskCreate(name=show, include=show, move_to=str(dst_root / show), **rule)
+        )
+
+    with SessionLocal() as session:
+        repository = TaskRepository(db=session)
+        batch = schemas.TASK_BATCH_MAX_ITEMS
+        for start in range(0, len(items), batch):
+            repository.batch_create(items[start : start + batch])
+    return Fixture(src_root=src_root, dst_root=dst_root, shows=shows, rng=rng)
+
+
+# --- 情境 ---
+
+
+def build_fires(scenario: str, fixture: Fixture, args: argparse.Namespace) -> list[Fire]:
+    rng = fixture.rng
+    if scenario == "season-pack":
+        # 下載器依序對每個檔案執行完成腳本，間隔數毫秒
+        files = fixture.season_pack(args.episodes)
+        return [Fire(at=i * 0.005, filepath=path) for i, path in enumerate(files)]
+    if scenario == "many-clients":
+        fires = []
+        for _ in range(args.clients):
+            offset = rng.uniform(0, args.window)
+            files = fixture.season_pack(args.episodes)
+            fires.extend(Fire(at=offset + i * 0.005, filepath=path) for i, path in enumerate(files))
+        return fires
+    if scenario == "duplicates":
+        # scripts/rTorrent 與重新校驗會對同一檔案重複觸發
+        fires = []
+        for i, path in enumerate(fixture.season_pack(args.episodes)):
+            fires.append(Fire(at=i * 0.005, filepath=path))
+            fires.extend(
+                Fire(at=i * 0.005 + rng.uniform(0, args.window), filepath=path)
+                for _ in range(args.duplicates - 1)
+            )
+        return fires
+    raise ValueError(f"未知的情境: {scenario}")
+
+
+# --- 執行 ---
+
+
+class _LockErrorCounter:
+    """統計 SQLAlchemy 回報的 database is locked 錯誤。"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, context) -> None:
+        if "database is locked" in str(context.original_exception):
+            with self._lock:
+                self.count += 1
+
+
+async def run_scenario(
+    scenario: str, fixture: Fixture, args: argparse.Namespace, lock_errors: _LockErrorCounter
+) -> ScenarioReport:
+    import httpx
+    from fastapi import FastAPI
+
+    from backend.database import engine
+    from backend.routers import webhook
+    from backend.utils.event_bus import event_bus
+    from backend.utils.metrics import REGEX_SANDBOX_SPAWN
+    from backend.worker.job_queue import download_queue
+
+    fires = build_fires(scenario, fixture, args)
+    expected = {fire.filepath for fire in fires}
+    first_sent: dict[str, float] = {}
+    finished: dict[str, tuple[str, float]] = {}
+    accept_latencies: list[float] = []
+    results = {"accepted": 0, "duplicates": 0, "http_errors": 0}
+    peak_depth = 0
+    peak_connections = 0
+
+    app = FastAPI()
+    app.include_router(webhook.router)
+    # 每個檔案會產生 started、數筆 log 與結果事件，緩衝區需足以容納整個情境
+    subscription = event_bus.subscribe(maxsize=len(fires) * 16 + 64)
+    lock_errors_before = lock_errors.count
+    spawns_before = REGEX_SANDBOX_SPAWN.count()
+    all_done = asyncio.Event()
+
+    async def collect() -> None:
+        while len(finished) < len(expected):
+            event = await subscription.get()
+            if event["event"] == "overflow":
+                raise RuntimeError(f"事件緩衝區溢位，遺失 {event['payload']['dropped']} 個事件")
+            if event["event"] != "job":
+                continue
+            payload = event["payload"]
+            if payload["status"] != "started" and payload["filepath"] in expected:
+                finished.setdefault(payload["filepath"], (payload["status"], time.perf_counter()))
+        all_done.set()
+
+    async def sample_depth() -> None:
+        nonlocal peak_depth, peak_connections
+        while not all_done.is_set():
+            peak_depth = max(peak_depth, download_queue.qsize())
+            peak_connections = max(peak_connections, engine.pool.checkedout())
+            await asyncio.sleep(0.01)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://movera") as client:
+
+        async def send(fire: Fire, started: float) -> None:
+            await asyncio.sleep(max(0.0, started + fire.at - time.perf_counter()))
+            sent = time.perf_counter()
+            first_sent.setdefault(fire.filepath, sent)
+            response = await client.post("/webhook/on-complete", json={"filepath": fire.filepath})
+            accept_latencies.append((time.perf_counter() - sent) * 1000)
+            if response.status_code != 200:
+                results["http_errors"] += 1
+            elif response.json()["duplicate"]:
+                results["duplicates"] += 1
+            else:
+                results["accepted"] += 1
+
+        collector = asyncio.create_task(collect())
+        sampler = asyncio.create_task(sample_depth())
+        started = time.perf_counter()
+        await asyncio.gather(*(send(fire, started) for fire in fires))
+        try:
+            await asyncio.wait_for(asyncio.shield(collector), timeout=args.timeout)
+            # 結果事件先於工作收尾送出，等佇列清空後 session 才確定已關閉
+            await asyncio.to_thread(download_queue.join)
+        except TimeoutError:
+            collector.cancel()
+        all_done.set()
+        await sampler
+        wall = time.perf_counter() - started
+    event_bus.unsubscribe(subscription)
+
+    statuses = [status for status, _ in finished.values()]
+    return ScenarioReport(
+        scenario=scenario,
+        requests=len(fires),
+        accepted=results["accepted"],
+        duplicates=results["duplicates"],
+        http_errors=results["http_errors"],
+        completed=statuses.count("completed"),
+        failed=statuses.count("failed"),
+        skipped=statuses.count("skipped"),
+        unfinished=len(expected) - len(finished),
+        wall_seconds=round(wall, 3),
+        accept_latency_ms=percentiles(accept_latencies),
+        end_to_end_latency_ms=percentiles(
+            [(done - first_sent[path]) * 1000 for path, (_, done) in finished.items()]
+        ),
+        db_lock_errors=lock_errors.count - lock_errors_before,
+        regex_subprocesses=REGEX_SANDBOX_SPAWN.count() - spawns_before,
+        peak_queue_depth=peak_depth,
+        peak_db_connections=peak_connections,
+        # 所有工作結束後仍未歸還的連線，大於 0 代表有 session 未關閉
+        open_db_connections=engine.pool.checkedout(),
+    )
+
+
+def print_report(report: ScenarioReport) -> None:
+    accept = report.accept_latency_ms
+    e2e = report.end_to_end_latency_ms
+    print(f"\n== {report.scenario} ==")
+    print(
+        f"請求 {report.requests}（接受 {report.accepted}、重複 {report.duplicates}、"
+        f"HTTP 錯誤 {report.http_errors}），耗時 {report.wall_seconds:.2f}s"
+    )
+    print(
+        f"處理結果：完成 {report.completed}、失敗 {report.failed}、"
+        f"略過 {report.skipped}、未完成 {report.unfinished}"
+    )
+    print(
+        f"接受延遲   p50 {accept['p50']:.1f}ms  p95 {accept['p95']:.1f}ms  "
+        f"p99 {accept['p99']:.1f}ms  max {accept['max']:.1f}ms"
+    )
+    print(
+        f"端到端延遲 p50 {e2e['p50']:.1f}ms  p95 {e2e['p95']:.1f}ms  "
+        f"p99 {e2e['p99']:.1f}ms  max {e2e['max']:.1f}ms"
+    )
+    print(
+        f"資料庫鎖定錯誤 {report.db_lock_errors}、正則沙箱子行程 {report.regex_subprocesses}、"
+        f"佇列最大深度 {report.peak_queue_depth}"
+    )
+    print(
+        f"資料庫連線  尖峰使用 {report.peak_db_connections}、"
+        f"結束後未歸還 {report.open_db_connections}"
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.loadtest", description="重播下載器 Webhook 風暴的負載測試"
+    )
+    parser.add_argument("--scenario", choices=(*SCENARIOS, "all"), default="all")
+    parser.add_argument("--tasks", type=int, default=2000, help="建立的任務數（預設 2000）")
+    parser.add_argument("--regex-ratio", type=float, default=0.25, help="使用 regex 規則的任務比例")
+    parser.add_argument("--episodes", type=int, default=24, help="每季的集數（預設 24）")
+    parser.add_argument("--clients", type=int, default=8, help="many-clients 情境的下載器數量")
+    parser.add_argument("--duplicates", type=int, default=3, help="duplicates 情境每個檔案的觸發次數")
+    parser.add_argument("--window", type=float, default=1.0, help="多個下載器或重複觸發分散的秒數")
+    parser.add_argument("--workers", type=int, help="下載處理佇列的執行緒數（預設讀取 DOWNLOAD_WORKERS）")
+    parser.add_argument("--timeout", type=float, default=300.0, help="等待全部處理完成的秒數上限")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=Path, help="將報告寫入 JSON 檔")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    # 在匯入 backend 前指定暫存資料庫，並關閉追蹤以免影響量測
+    workroot = Path(".benchmarks")
+    workroot.mkdir(exist_ok=True)
+    workdir = Path(tempfile.mkdtemp(prefix="loadtest-", dir=workroot)).resolve()
+    os.environ["SQLITE_PATH"] = str(workdir / "loadtest.db")
+    os.environ.setdefault("TRACE_SAMPLE_RATE", "0")
+
+    from sqlalchemy import event
+
+    from backend import models  # noqa: F401 註冊所有資料表
+    from backend.database import Base, engine
+    from backend.worker.job_queue import download_queue
+
+    if args.workers is not None:
+        download_queue.workers = max(1, args.workers)
+    lock_errors = _LockErrorCounter()
+    event.listen(engine, "handle_error", lock_errors)
+
+    try:
+        Base.metadata.create_all(bind=engine)
+        fixture = create_fixture(workdir, args.tasks, args.regex_ratio, args.seed)
+        print(
+            f"已建立 {args.tasks} 個任務，下載處理執行緒 {download_queue.workers} 個"
+        )
+        scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+        reports = []
+        for scenario in scenarios:
+            report = asyncio.run(run_scenario(scenario, fixture, args, lock_errors))
+            print_report(report)
+            reports.append(report)
+    finally:
+        download_queue.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(
+                {"workers": download_queue.workers, "tasks": args.tasks, "reports": [asdict(r) for r in reports]},
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+    return 0 if all(r.unfinished == 0 and r.http_errors == 0 for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
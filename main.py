@@ -9,6 +9,7 @@ from fastapi.staticfiles import StaticFiles
 load_dotenv()
 
 from backend.backend import app
+from backend.utils.env_config import get_workers
 
 # 靜態檔案目錄路徑
 DIST_DIR = Path(__file__).parent / "dist"
@@ -42,11 +43,14 @@ def setup_static_files():
 setup_static_files()
 
 if __name__ == "__main__":
+    reload = os.getenv("ENV") == "development"
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
         log_level="info",
-        reload=os.getenv("ENV") == "development",
+        reload=reload,
         reload_dirs=["backend"],
+        # reload 模式僅支援單一行程
+        workers=1 if reload else get_workers(),
     )
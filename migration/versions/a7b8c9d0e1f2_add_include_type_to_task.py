@@ -0,0 +1,38 @@
+"""add include_type to task table
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, Sequence[str], None] = "f6a7b8c9d0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """新增 include 的比對方式欄位，既有任務維持子字串比對。"""
+    op.add_column(
+        "task",
+        sa.Column(
+            "include_type",
+            sa.String(),
+            nullable=False,
+            server_default="substring",
+            comment="include 的比對方式：substring、regex 或 glob",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """移除 include 的比對方式欄位。"""
+    with op.batch_alter_table("task") as batch_op:
+        batch_op.drop_column("include_type")
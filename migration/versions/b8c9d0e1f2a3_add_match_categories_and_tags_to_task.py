@@ -0,0 +1,47 @@
+"""add match_categories and match_tags to task table
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8c9d0e1f2a3"
+down_revision: Union[str, Sequence[str], None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """新增下載器類別與標籤的路由條件欄位，既有任務不限類別與標籤。"""
+    op.add_column(
+        "task",
+        sa.Column(
+            "match_categories",
+            sa.String(),
+            nullable=True,
+            comment="限定的下載器類別，以逗號分隔",
+        ),
+    )
+    op.add_column(
+        "task",
+        sa.Column(
+            "match_tags",
+            sa.String(),
+            nullable=True,
+            comment="需要的下載器標籤，以逗號分隔",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """移除下載器類別與標籤的路由條件欄位。"""
+    with op.batch_alter_table("task") as batch_op:
+        batch_op.drop_column("match_tags")
+        batch_op.drop_column("match_categories")
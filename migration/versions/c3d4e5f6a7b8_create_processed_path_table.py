@@ -0,0 +1,49 @@
+"""create processed_path table
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6g7
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d4e5f6a7b8"
+down_revision: Union[str, Sequence[str], None] = "b2c3d4e5f6g7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """建立 Webhook 去重用的 processed_path 表。"""
+    op.create_table(
+        "processed_path",
+        sa.Column(
+            "filepath",
+            sa.String(),
+            primary_key=True,
+            nullable=False,
+            comment="已接受處理的下載路徑",
+        ),
+        sa.Column("size", sa.Integer(), nullable=True, comment="接受當下的檔案大小"),
+        sa.Column(
+            "mtime_ns", sa.Integer(), nullable=True, comment="接受當下的修改時間（奈秒）"
+        ),
+        sa.Column("inode", sa.Integer(), nullable=True, comment="接受當下的 inode"),
+        sa.Column(
+            "expires_at", sa.DateTime(), nullable=False, comment="去重紀錄的到期時間"
+        ),
+    )
+    op.create_index(
+        "ix_processed_path_expires_at", "processed_path", ["expires_at"]
+    )
+
+
+def downgrade() -> None:
+    """移除 processed_path 表。"""
+    op.drop_index("ix_processed_path_expires_at", table_name="processed_path")
+    op.drop_table("processed_path")
@@ -0,0 +1,27 @@
+"""add (tag_id, task_id) index to task_tags table
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c9d0e1f2a3b4"
+down_revision: Union[str, Sequence[str], None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """新增依標籤反查任務的覆蓋索引，主鍵 (task_id, tag_id) 無法用於此方向的查詢。"""
+    op.create_index("ix_task_tags_tag_id_task_id", "task_tags", ["tag_id", "task_id"])
+
+
+def downgrade() -> None:
+    """移除依標籤反查任務的索引。"""
+    op.drop_index("ix_task_tags_tag_id_task_id", table_name="task_tags")
@@ -0,0 +1,44 @@
+"""create backlog_scan_state table
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d0e1f2a3b4c5"
+down_revision: Union[str, Sequence[str], None] = "c9d0e1f2a3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """建立積壓掃描狀態表，並移除先前寫在 setting 表中的水位線。"""
+    op.create_table(
+        "backlog_scan_state",
+        sa.Column("name", sa.String(), primary_key=True, nullable=False, comment="掃描狀態名稱"),
+        sa.Column(
+            "watermark_mtime_ns", sa.Integer(), nullable=False, comment="水位線的修改時間（奈秒）"
+        ),
+        sa.Column("watermark_inode", sa.Integer(), nullable=False, comment="水位線的 inode"),
+        sa.Column(
+            "fingerprint",
+            sa.String(),
+            nullable=False,
+            comment="產生水位線時啟用任務與來源目錄的指紋，兩者變更後水位線失效",
+        ),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, comment="最後更新時間"),
+    )
+    # 舊的水位線不含任務指紋，直接捨棄，下次掃描會完整走訪一次
+    op.execute("DELETE FROM setting WHERE key = 'backlog_scan_watermark'")
+
+
+def downgrade() -> None:
+    """移除積壓掃描狀態表。"""
+    op.drop_table("backlog_scan_state")
@@ -0,0 +1,44 @@
+"""create cache_version table
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, Sequence[str], None] = "c3d4e5f6a7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """建立記錄快取版本號的 cache_version 表。"""
+    op.create_table(
+        "cache_version",
+        sa.Column(
+            "name",
+            sa.String(),
+            primary_key=True,
+            nullable=False,
+            comment="快取名稱（例如 setting）",
+        ),
+        sa.Column(
+            "version",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+            comment="每次相關資料寫入時遞增的版本號",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """移除 cache_version 表。"""
+    op.drop_table("cache_version")
@@ -0,0 +1,29 @@
+"""add started_at index to job_trace table
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-21 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1f2a3b4c5d6"
+down_revision: Union[str, Sequence[str], None] = "d0e1f2a3b4c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """為 job_trace.started_at 建立索引，並刪除未匹配任務的追蹤。"""
+    op.create_index("ix_job_trace_started_at", "job_trace", ["started_at"])
+    # 未匹配任務的追蹤不再保存，先前寫入的資料一併清除
+    op.execute("DELETE FROM job_trace WHERE task_id IS NULL")
+
+
+def downgrade() -> None:
+    """移除 job_trace.started_at 的索引。"""
+    op.drop_index("ix_job_trace_started_at", table_name="job_trace")
@@ -0,0 +1,54 @@
+"""create job_trace table
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f6a7b8c9d0"
+down_revision: Union[str, Sequence[str], None] = "d4e5f6a7b8c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """建立記錄工作階段耗時的 job_trace 表。"""
+    op.create_table(
+        "job_trace",
+        sa.Column(
+            "id", sa.String(), primary_key=True, nullable=False, comment="工作的 trace id"
+        ),
+        sa.Column(
+            "task_id",
+            sa.String(),
+            sa.ForeignKey("task.id", ondelete="CASCADE"),
+            nullable=True,
+            comment="匹配的任務 ID，未匹配任何任務時為空",
+        ),
+        sa.Column("filepath", sa.String(), nullable=False, comment="工作處理的檔案路徑"),
+        sa.Column(
+            "status", sa.String(), nullable=False, comment="工作結果（skipped／completed／failed）"
+        ),
+        sa.Column("started_at", sa.DateTime(), nullable=False, comment="工作開始時間"),
+        sa.Column("duration_ms", sa.Float(), nullable=False, comment="工作總耗時（毫秒）"),
+        sa.Column(
+            "spans",
+            sa.String(),
+            nullable=False,
+            comment="以 JSON 陣列儲存的 [名稱, 起點毫秒, 耗時毫秒] 時間區段",
+        ),
+    )
+    op.create_index("ix_job_trace_task_id", "job_trace", ["task_id"])
+
+
+def downgrade() -> None:
+    """移除 job_trace 表。"""
+    op.drop_index("ix_job_trace_task_id", table_name="job_trace")
+    op.drop_table("job_trace")
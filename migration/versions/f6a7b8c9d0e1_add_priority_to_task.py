@@ -0,0 +1,40 @@
+"""add priority to task table
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a7b8c9d0e1"
+down_revision: Union[str, Sequence[str], None] = "e5f6a7b8c9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """新增任務的比對優先順序欄位，並建立啟用狀態與優先順序的複合索引。"""
+    op.add_column(
+        "task",
+        sa.Column(
+            "priority",
+            sa.Integer(),
+            nullable=False,
+            server_default=sa.text("0"),
+            comment="比對優先順序，數字越大越先比對",
+        ),
+    )
+    op.create_index("ix_task_enabled_priority", "task", ["enabled", "priority"])
+
+
+def downgrade() -> None:
+    """移除優先順序欄位與索引。"""
+    op.drop_index("ix_task_enabled_priority", table_name="task")
+    with op.batch_alter_table("task") as batch_op:
+        batch_op.drop_column("priority")
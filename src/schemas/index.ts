@@ -11,6 +11,11 @@ export interface Tag {
   created_at: string;
 }
 
+export interface TagTaskCount {
+  tag_id: string;
+  task_count: number;
+}
+
 export interface TagCreate {
   name: string;
   color: string;
@@ -34,6 +39,9 @@ export interface Task {
   id: string;
   name: string;
   include: string;
+  include_type?: 'substring' | 'regex' | 'glob';
+  match_categories?: string | null;
+  match_tags?: string | null;
   move_to: string
   src_filename: string | null;
   dst_filename: string | null;
@@ -42,6 +50,7 @@ export interface Task {
   episode_offset_group?: string | null;
   episode_offset_value?: number;
   enabled: boolean;
+  priority?: number;
   created_at: string; // ISO 8601 date string
   logs: Log[];
   tags: Tag[];
@@ -0,0 +1,201 @@
+"""
+BacklogService 單元測試
+"""
+
+import os
+import time
+
+from unittest.mock import patch
+
+import pytest
+
+from backend.repositories.backlog_scan_state import BacklogScanStateRepository
+from backend.schemas import TaskCreate
+from backend.services.backlog_service import BacklogService
+from backend.utils.safe_regex import RegexTimeoutError
+
+
+@pytest.fixture
+def backlog_service(task_service, setting_service, db_session) -> BacklogService:
+    """建立 BacklogService 實例"""
+    return BacklogService(
+        task_service=task_service,
+        setting_service=setting_service,
+        state_repository=BacklogScanStateRepository(db_session),
+    )
+
+
+@pytest.fixture
+def source_dir(tmp_path, setting_service):
+    """建立來源目錄並加入白名單"""
+    source = tmp_path / "downloads"
+    (source / "anime").mkdir(parents=True)
+    (source / ".hidden").mkdir()
+    (source / "anime" / "動畫 - 01.mp4").write_text("1")
+    (source / "anime" / "動畫 - 02.mp4").write_text("2")
+    (source / "other.mkv").write_text("x")
+    (source / ".hidden" / "動畫 - 03.mp4").write_text("3")
+    setting_service.update_settings({"allowed_source_directories": [str(source)]})
+    return source
+
+
+@pytest.fixture
+def anime_task(task_service, tmp_path):
+    return task_service.create_task(
+        TaskCreate(name="動畫", include="動畫", move_to=str(tmp_path / "media"))
+    )
+
+
+class TestIterCandidates:
+    """測試 BacklogService.iter_candidates"""
+
+    def test_walks_files_recursively(self, source_dir):
+        paths = [p for p, _ in BacklogService.iter_candidates([str(source_dir)])]
+
+        assert sorted(paths) == sorted([
+            str(source_dir / "other.mkv"),
+            str(source_dir / "anime" / "動畫 - 01.mp4"),
+            str(source_dir / "anime" / "動畫 - 02.mp4"),
+        ])
+
+    def test_excluded_directory_skipped(self, source_dir):
+        paths = [
+            p
+            for p, _ in BacklogService.iter_candidates(
+                [str(source_dir)], exclude={str(source_dir / "anime")}
+            )
+        ]
+
+        assert paths == [str(source_dir / "other.mkv")]
+
+    def test_missing_root_ignored(self, tmp_path):
+        assert list(BacklogService.iter_candidates([str(tmp_path / "missing")])) == []
+
+
+class TestScan:
+    """測試 BacklogService.scan"""
+
+    def test_dispatches_matching_files(self, backlog_service, source_dir, anime_task):
+        dispatched = []
+
+        result = backlog_service.scan(dispatched.append, rate=1000, min_age=0)
+
+        assert sorted(os.path.basename(p) for p in dispatched) == [
+            "動畫 - 01.mp4",
+            "動畫 - 02.mp4",
+        ]
+        assert result.scanned == 3
+        assert result.matched == 2
+        assert result.dispatched == 2
+
+    def test_incremental_rescan_uses_watermark(
+        self, backlog_service, source_dir, anime_task
+    ):
+        backlog_service.scan(lambda p: None, rate=1000, min_age=0)
+        assert backlog_service.get_watermark() is not None
+
+        new_file = source_dir / "anime" / "動畫 - 04.mp4"
+        new_file.write_text("4")
+        future = time.time() + 10
+        os.utime(new_file, (future, future))
+
+        dispatched = []
+        result = backlog_service.scan(dispatched.append, rate=1000, min_age=-60)
+
+        assert dispatched == [str(new_file)]
+        assert result.skipped == 3
+
+    def test_full_rescan_ignores_watermark(self, backlog_service, source_dir, anime_task):
+        backlog_service.scan(lambda p: None, rate=1000, min_age=0)
+
+        dispatched = []
+        backlog_service.scan(dispatched.append, rate=1000, min_age=0, full=True)
+
+        assert len(dispatched) == 2
+
+    def test_recent_files_not_dispatched(self, backlog_service, source_dir, anime_task):
+        dispatched = []
+
+        result = backlog_service.scan(dispatched.append, rate=1000, min_age=3600)
+
+        assert dispatched == []
+        assert result.watermark is None
+
+    def test_rate_limit_sleeps_between_dispatches(
+        self, backlog_service, source_dir, anime_task
+    ):
+        sleeps = []
+
+        backlog_service.scan(lambda p: None, rate=0.5, min_age=0, sleep=sleeps.append)
+
+        assert len(sleeps) == 1
+        assert 0 < sleeps[0] <= 2
+
+    def test_dispatch_failure_counted(self, backlog_service, source_dir, anime_task):
+        def fail(filepath):
+            raise RuntimeError("boom")
+
+        result = backlog_service.scan(fail, rate=1000, min_age=0)
+
+        assert result.failed == 2
+        assert result.dispatched == 0
+
+    def test_no_allowed_source_skips_scan(self, backlog_service, anime_task):
+        dispatched = []
+
+        result = backlog_service.scan(dispatched.append, rate=1000, min_age=0)
+
+        assert dispatched == []
+        assert result.scanned == 0
+
+
+class TestWatermark:
+    """測試水位線只越過已處理完成的檔案"""
+
+    def test_watermark_not_stored_in_settings(
+        self, backlog_service, setting_service, source_dir, anime_task
+    ):
+        backlog_service.scan(lambda p: None, rate=1000, min_age=0)
+
+        assert backlog_service.get_watermark() is not None
+        assert setting_service.get_setting_by_key("backlog_scan_watermark") is None
+
+    def test_new_task_picks_up_existing_files(
+        self, backlog_service, task_service, source_dir, anime_task, tmp_path
+    ):
+        backlog_service.scan(lambda p: None, rate=1000, min_age=0)
+        task_service.create_task(
+            TaskCreate(name="其他", include="other", move_to=str(tmp_path / "other"))
+        )
+
+        dispatched = []
+        backlog_service.scan(dispatched.append, rate=1000, min_age=0)
+
+        assert str(source_dir / "other.mkv") in dispatched
+
+    def test_failed_dispatch_retried(self, backlog_service, source_dir, anime_task):
+        failing = str(source_dir / "anime" / "動畫 - 01.mp4")
+
+        def dispatch(filepath):
+            if filepath == failing:
+                raise RuntimeError("boom")
+
+        backlog_service.scan(dispatch, rate=1000, min_age=0)
+
+        dispatched = []
+        backlog_service.scan(dispatched.append, rate=1000, min_age=0)
+
+        assert failing in dispatched
+
+    def test_regex_timeout_retried(self, backlog_service, source_dir, anime_task):
+        with patch(
+            "backend.services.backlog_service.TaskMatcher.match",
+            side_effect=RegexTimeoutError(1.0),
+        ):
+            result = backlog_service.scan(lambda p: None, rate=1000, min_age=0)
+        assert result.matched == 0
+
+        dispatched = []
+        backlog_service.scan(dispatched.append, rate=1000, min_age=0)
+
+        assert len(dispatched) == 2
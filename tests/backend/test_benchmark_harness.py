@@ -0,0 +1,76 @@
+"""
+效能基準測試執行器（benchmarks.harness）單元測試
+"""
+
+from benchmarks.harness import (
+    BenchmarkSkipped,
+    Benchmark,
+    Context,
+    Measurement,
+    compare,
+    load_results,
+    measure,
+    run_all,
+    write_results,
+)
+
+
+class TestMeasure:
+    """測試 measure 與結果統計"""
+
+    def test_setup_not_timed_and_passed_to_func(self):
+        received = []
+
+        measurement = measure(received.append, setup=lambda: "arg", iterations=3, rounds=2)
+
+        assert received == ["arg"] * 6
+        assert len(measurement.round_times) == 2
+
+    def test_result_is_per_unit(self):
+        measurement = Measurement(iterations=2, units=10, round_times=[2.0, 4.0, 6.0])
+
+        result = measurement.to_result("case")
+
+        assert result.median == 0.2
+        assert result.min == 0.1
+        assert result.ops_per_sec == 5.0
+
+
+class TestRunAndCompare:
+    """測試案例執行、JSON 輸出與比較"""
+
+    def test_skipped_case_recorded(self, tmp_path):
+        def skip(ctx):
+            raise BenchmarkSkipped("沒有 tmpfs")
+
+        results, skipped = run_all(
+            [Benchmark("skip", skip)], Context(workdir=tmp_path), log=lambda _: None
+        )
+
+        assert results == []
+        assert skipped == {"skip": "沒有 tmpfs"}
+
+    def test_compare_flags_regressions_over_threshold(self, tmp_path):
+        fast = Measurement(iterations=1, units=1, round_times=[1.0]).to_result("a")
+        slow = Measurement(iterations=1, units=1, round_times=[1.5]).to_result("a")
+        path = tmp_path / "baseline.json"
+        write_results(path, [fast], {})
+
+        comparisons, regressions = compare(load_results(path), [slow], threshold=0.2)
+
+        assert [c.name for c in comparisons] == ["a"]
+        assert regressions[0].ratio == 1.5
+
+    def test_compare_within_threshold_and_new_cases(self, tmp_path):
+        baseline = Measurement(iterations=1, units=1, round_times=[1.0]).to_result("a")
+        current = [
+            Measurement(iterations=1, units=1, round_times=[1.1]).to_result("a"),
+            Measurement(iterations=1, units=1, round_times=[9.0]).to_result("new"),
+        ]
+        path = tmp_path / "baseline.json"
+        write_results(path, [baseline], {})
+
+        comparisons, regressions = compare(load_results(path), current, threshold=0.2)
+
+        assert [c.name for c in comparisons] == ["a"]
+        assert regressions == []
@@ -0,0 +1,167 @@
+"""
+Webhook 去重單元測試
+"""
+
+import time
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.models.processed_path import ProcessedPath
+from backend.worker.dedup import WebhookDeduplicator, fingerprint
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    return sessionmaker(bind=db_engine)
+
+
+@pytest.fixture
+def media_file(tmp_path):
+    path = tmp_path / "動畫 - 01.mp4"
+    path.write_text("content")
+    return path
+
+
+class TestClaim:
+    """測試 WebhookDeduplicator.claim"""
+
+    def test_first_event_accepted(self, media_file):
+        dedup = WebhookDeduplicator()
+
+        accepted, fp = dedup.claim(str(media_file))
+
+        assert accepted is True
+        assert fp == fingerprint(str(media_file))
+
+    def test_duplicate_event_suppressed(self, media_file):
+        dedup = WebhookDeduplicator()
+        dedup.claim(str(media_file))
+
+        accepted, _ = dedup.claim(str(media_file))
+
+        assert accepted is False
+        assert dedup.suppressed == 1
+
+    def test_duplicate_after_file_moved_suppressed(self, media_file):
+        """測試檔案已被移走後的重複事件仍視為重複"""
+        dedup = WebhookDeduplicator()
+        dedup.claim(str(media_file))
+        media_file.unlink()
+
+        accepted, _ = dedup.claim(str(media_file))
+
+        assert accepted is False
+
+    def test_new_file_at_same_path_accepted(self, media_file):
+        """測試同路徑出現不同指紋的新檔案時照常處理"""
+        dedup = WebhookDeduplicator()
+        dedup.claim(str(media_file))
+        media_file.write_text("a different and longer content")
+
+        accepted, _ = dedup.claim(str(media_file))
+
+        assert accepted is True
+
+    def test_expired_entry_accepted(self, media_file):
+        dedup = WebhookDeduplicator(ttl=0.01)
+        dedup.claim(str(media_file))
+        time.sleep(0.02)
+
+        accepted, _ = dedup.claim(str(media_file))
+
+        assert accepted is True
+
+    def test_max_entries_evicts_oldest(self, tmp_path):
+        dedup = WebhookDeduplicator(max_entries=2)
+        for name in ("a", "b", "c"):
+            dedup.claim(str(tmp_path / name))
+
+        accepted, _ = dedup.claim(str(tmp_path / "a"))
+
+        assert accepted is True
+
+
+class TestPersistence:
+    """測試資料表後援與跨行程認領"""
+
+    def test_no_database_access_before_load(self, media_file, session_factory):
+        dedup = WebhookDeduplicator(session_factory=session_factory)
+
+        dedup.claim(str(media_file))
+
+        session = session_factory()
+        assert session.query(ProcessedPath).count() == 0
+        session.close()
+
+    def test_records_survive_restart(self, media_file, session_factory):
+        """測試重新啟動後自資料表載入紀錄並辨識重複事件"""
+        first = WebhookDeduplicator(session_factory=session_factory)
+        first.load()
+        first.claim(str(media_file))
+
+        second = WebhookDeduplicator(session_factory=session_factory)
+        second.load()
+        accepted, _ = second.claim(str(media_file))
+
+        assert accepted is False
+
+    def test_event_claimed_by_other_process_suppressed(self, media_file, session_factory):
+        """測試兩個行程（各自的去重器）收到同一事件時只有一個接受"""
+        first = WebhookDeduplicator(session_factory=session_factory)
+        second = WebhookDeduplicator(session_factory=session_factory)
+        first.load()
+        second.load()
+
+        results = [first.claim(str(media_file))[0], second.claim(str(media_file))[0]]
+
+        assert results == [True, False]
+        assert second.suppressed == 1
+
+    def test_new_file_reclaimed_across_processes(self, media_file, session_factory):
+        first = WebhookDeduplicator(session_factory=session_factory)
+        second = WebhookDeduplicator(session_factory=session_factory)
+        first.load()
+        second.load()
+        first.claim(str(media_file))
+        media_file.write_text("a different and longer content")
+
+        accepted, _ = second.claim(str(media_file))
+
+        assert accepted is True
+
+    def test_expired_claim_reclaimed(self, media_file, session_factory):
+        first = WebhookDeduplicator(ttl=-1, session_factory=session_factory)
+        first.load()
+        first.claim(str(media_file))
+
+        second = WebhookDeduplicator(session_factory=session_factory)
+        second.load()
+        accepted, _ = second.claim(str(media_file))
+
+        assert accepted is True
+
+    def test_load_removes_expired_records(self, media_file, session_factory):
+        dedup = WebhookDeduplicator(ttl=-1, session_factory=session_factory)
+        dedup.load()
+        dedup.claim(str(media_file))
+
+        WebhookDeduplicator(session_factory=session_factory).load()
+
+        session = session_factory()
+        assert session.query(ProcessedPath).count() == 0
+        session.close()
+
+    def test_claim_prunes_expired_records(self, tmp_path, session_factory):
+        """測試長時間執行時，到期的其他路徑在認領時一併刪除"""
+        dedup = WebhookDeduplicator(ttl=-1, session_factory=session_factory)
+        dedup.load()
+        for i in range(5):
+            path = tmp_path / f"動畫 - {i:02d}.mp4"
+            path.write_text("content")
+            dedup.claim(str(path))
+
+        session = session_factory()
+        assert session.query(ProcessedPath).count() == 1
+        session.close()
+
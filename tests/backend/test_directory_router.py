@@ -127,3 +127,36 @@ class TestDirectoryRouter:
             params={"path": os.path.join(temp_dir_structure, "nonexistent")},
         )
         assert response.status_code == 404
+
+    def test_list_directories_paginated(self, client, temp_dir_structure):
+        """測試 limit 與 next_cursor 分頁"""
+        first = client.get(
+            "/api/v1/directories", params={"path": temp_dir_structure, "limit": 1}
+        ).json()
+        second = client.get(
+            "/api/v1/directories",
+            params={
+                "path": temp_dir_structure,
+                "limit": 1,
+                "cursor": first["next_cursor"],
+            },
+        ).json()
+
+        assert [d["name"] for d in first["directories"]] == ["anime"]
+        assert [d["name"] for d in second["directories"]] == ["movies"]
+        assert second["next_cursor"] is None
+
+    def test_list_directories_query(self, client, temp_dir_structure):
+        """測試 q 參數過濾目錄名稱"""
+        response = client.get(
+            "/api/v1/directories", params={"path": temp_dir_structure, "q": "MOV"}
+        )
+
+        assert [d["name"] for d in response.json()["directories"]] == ["movies"]
+
+    def test_list_directories_invalid_limit(self, client, temp_dir_structure):
+        """測試 limit 超出範圍回傳 422"""
+        response = client.get(
+            "/api/v1/directories", params={"path": temp_dir_structure, "limit": 0}
+        )
+        assert response.status_code == 422
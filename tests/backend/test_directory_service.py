@@ -208,3 +208,137 @@ class TestDirectoryServiceListDirectories:
         result = path_service.list_directories(temp_dir_structure)
         names = [d["name"] for d in result]
         assert "symlink_dir" not in names
+
+
+class TestDirectoryServiceScanCache:
+    """測試以 scandir 掃描與 (路徑, mtime) 快取"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from backend.services.directory_service import directory_cache
+
+        directory_cache.clear()
+        yield
+        directory_cache.clear()
+
+    @pytest.fixture
+    def allowed_root(self, db_session, temp_dir_structure):
+        db_session.add(
+            Setting(key="allowed_directories", value=json.dumps([temp_dir_structure]))
+        )
+        db_session.commit()
+        return temp_dir_structure
+
+    def test_has_children_reported_per_subdirectory(self, path_service, allowed_root):
+        result = path_service.list_directories(allowed_root)
+
+        flags = {d["name"]: d["has_children"] for d in result}
+        assert flags == {"anime": True, "movies": False}
+
+    def test_repeated_listing_served_from_cache(self, path_service, allowed_root, mocker):
+        path_service.list_directories(allowed_root)
+        spy = mocker.spy(os, "scandir")
+
+        result = path_service.list_directories(allowed_root)
+
+        assert spy.call_count == 0
+        assert [d["name"] for d in result] == ["anime", "movies"]
+
+    def test_cache_invalidated_when_directory_changes(self, path_service, allowed_root):
+        path_service.list_directories(allowed_root)
+        os.makedirs(os.path.join(allowed_root, "music"))
+        # 確保 mtime 的變化可被檔案系統解析度辨識
+        stat = os.stat(allowed_root)
+        os.utime(allowed_root, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        result = path_service.list_directories(allowed_root)
+
+        assert "music" in [d["name"] for d in result]
+
+    def test_cached_result_not_shared_with_caller(self, path_service, allowed_root):
+        first = path_service.list_directories(allowed_root)
+        first[0]["name"] = "changed"
+
+        second = path_service.list_directories(allowed_root)
+
+        assert second[0]["name"] == "anime"
+
+
+class TestDirectoryServicePagination:
+    """測試 list_directories_page 的分頁與搜尋"""
+
+    @pytest.fixture
+    def series_root(self, tmp_path, db_session):
+        for name in ("Alpha", "beta", "Gamma", "delta", "Epsilon"):
+            (tmp_path / name).mkdir()
+        (tmp_path / "beta" / "Season 1").mkdir()
+        db_session.add(
+            Setting(key="allowed_directories", value=json.dumps([str(tmp_path)]))
+        )
+        db_session.commit()
+        return str(tmp_path)
+
+    def test_pages_follow_cursor_until_exhausted(self, path_service, series_root):
+        names = []
+        cursor = None
+        while True:
+            page = path_service.list_directories_page(series_root, cursor=cursor, limit=2)
+            names.extend(d["name"] for d in page["directories"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert names == ["Alpha", "Epsilon", "Gamma", "beta", "delta"]
+
+    def test_last_page_has_no_cursor(self, path_service, series_root):
+        page = path_service.list_directories_page(series_root, limit=5)
+
+        assert len(page["directories"]) == 5
+        assert page["next_cursor"] is None
+
+    def test_query_filters_case_insensitively(self, path_service, series_root):
+        page = path_service.list_directories_page(series_root, q="ET")
+
+        assert [d["name"] for d in page["directories"]] == ["beta"]
+        assert page["directories"][0]["has_children"] is True
+
+    def test_query_combined_with_paging(self, path_service, series_root):
+        first = path_service.list_directories_page(series_root, q="a", limit=2)
+        second = path_service.list_directories_page(
+            series_root, q="a", cursor=first["next_cursor"], limit=2
+        )
+
+        assert [d["name"] for d in first["directories"]] == ["Alpha", "Gamma"]
+        assert [d["name"] for d in second["directories"]] == ["beta", "delta"]
+        assert second["next_cursor"] is None
+
+    def test_only_page_items_are_probed(self, path_service, series_root, mocker):
+        from backend.services.directory_service import directory_cache
+
+        directory_cache.clear()
+        probe = mocker.spy(path_service, "_has_subdirectories")
+
+        path_service.list_directories_page(series_root, limit=2)
+
+        assert probe.call_count == 2
+
+    def test_root_listing_paginates(self, path_service, db_session, tmp_path):
+        roots = [tmp_path / "a", tmp_path / "b"]
+        for root in roots:
+            root.mkdir()
+        db_session.add(
+            Setting(
+                key="allowed_directories",
+                value=json.dumps([str(root) for root in roots]),
+            )
+        )
+        db_session.commit()
+
+        first = path_service.list_directories_page(None, limit=1)
+        second = path_service.list_directories_page(
+            None, cursor=first["next_cursor"], limit=1
+        )
+
+        assert first["next_cursor"] == str(roots[0])
+        assert [d["name"] for d in second["directories"]] == ["b"]
+        assert second["next_cursor"] is None
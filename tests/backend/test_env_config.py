@@ -6,8 +6,22 @@ from unittest.mock import patch
 
 from backend.utils.env_config import (
     get_allow_webui_setting,
+    get_backlog_scan_min_age,
+    get_backlog_scan_on_startup,
+    get_backlog_scan_rate,
+    get_download_workers,
     get_env_allowed_directories,
     get_env_allowed_source_directories,
+    get_profiling_enabled,
+    get_task_match_mode,
+    get_trace_retention_days,
+    get_trace_sample_rate,
+    get_watcher_enabled,
+    get_watcher_max_watches,
+    get_watcher_mode,
+    get_watcher_poll_interval,
+    get_watcher_settle_seconds,
+    get_workers,
 )
 
 
@@ -83,3 +97,171 @@ class TestGetAllowWebuiSetting:
     def test_not_set_returns_true(self):
         """測試未設定時回傳 True（預設）"""
         assert get_allow_webui_setting() is True
+
+
+class TestBacklogScanEnv:
+    """測試積壓掃描相關環境變數"""
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_defaults(self):
+        assert get_backlog_scan_on_startup() is False
+        assert get_backlog_scan_rate() == 2.0
+        assert get_backlog_scan_min_age() == 60.0
+
+    @patch.dict(
+        "os.environ",
+        {"BACKLOG_SCAN_ON_STARTUP": "TRUE", "BACKLOG_SCAN_RATE": "5", "BACKLOG_SCAN_MIN_AGE": "10"},
+    )
+    def test_values_from_env(self):
+        assert get_backlog_scan_on_startup() is True
+        assert get_backlog_scan_rate() == 5.0
+        assert get_backlog_scan_min_age() == 10.0
+
+    @patch.dict("os.environ", {"BACKLOG_SCAN_RATE": "abc"})
+    def test_invalid_rate_falls_back_to_default(self):
+        assert get_backlog_scan_rate() == 2.0
+
+
+class TestWatcherEnv:
+    """測試來源目錄監看相關環境變數"""
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_defaults(self):
+        assert get_watcher_enabled() is False
+        assert get_watcher_mode() == "auto"
+        assert get_watcher_settle_seconds() == 10.0
+        assert get_watcher_poll_interval() == 30.0
+        assert get_watcher_max_watches() is None
+
+    @patch.dict(
+        "os.environ",
+        {"WATCHER_ENABLED": "true", "WATCHER_MODE": "POLLING", "WATCHER_MAX_WATCHES": "100"},
+    )
+    def test_values_from_env(self):
+        assert get_watcher_enabled() is True
+        assert get_watcher_mode() == "polling"
+        assert get_watcher_max_watches() == 100
+
+    @patch.dict("os.environ", {"WATCHER_MODE": "fanotify"})
+    def test_invalid_mode_falls_back_to_auto(self):
+        assert get_watcher_mode() == "auto"
+
+
+class TestGetWorkers:
+    """測試 get_workers 函式"""
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_default(self):
+        assert get_workers() == 1
+
+    @patch.dict("os.environ", {"WORKERS": "4"})
+    def test_custom(self):
+        assert get_workers() == 4
+
+    @patch.dict("os.environ", {"WORKERS": "many"})
+    def test_invalid_falls_back_to_one(self):
+        assert get_workers() == 1
+
+    @patch.dict("os.environ", {"WORKERS": "0"})
+    def test_zero_clamped_to_one(self):
+        assert get_workers() == 1
+
+
+class TestGetTraceSampleRate:
+    """測試 get_trace_sample_rate 函式"""
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_default_samples_a_tenth(self):
+        assert get_trace_sample_rate() == 0.1
+
+    @patch.dict("os.environ", {"TRACE_SAMPLE_RATE": "0.25"})
+    def test_custom(self):
+        assert get_trace_sample_rate() == 0.25
+
+    @patch.dict("os.environ", {"TRACE_SAMPLE_RATE": "0"})
+    def test_zero_disables_tracing(self):
+        assert get_trace_sample_rate() == 0.0
+
+    @patch.dict("os.environ", {"TRACE_SAMPLE_RATE": "5"})
+    def test_clamped_to_one(self):
+        assert get_trace_sample_rate() == 1.0
+
+    @patch.dict("os.environ", {"TRACE_SAMPLE_RATE": "often"})
+    def test_invalid_falls_back_to_default(self):
+        assert get_trace_sample_rate() == 0.1
+
+
+class TestGetTraceRetentionDays:
+    """測試 get_trace_retention_days 函式"""
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_default(self):
+        assert get_trace_retention_days() == 7
+
+    @patch.dict("os.environ", {"TRACE_RETENTION_DAYS": "30"})
+    def test_custom(self):
+        assert get_trace_retention_days() == 30
+
+    @patch.dict("os.environ", {"TRACE_RETENTION_DAYS": "0"})
+    def test_zero_disables_pruning(self):
+        assert get_trace_retention_days() == 0
+
+    @patch.dict("os.environ", {"TRACE_RETENTION_DAYS": "-3"})
+    def test_negative_clamped_to_zero(self):
+        assert get_trace_retention_days() == 0
+
+    @patch.dict("os.environ", {"TRACE_RETENTION_DAYS": "week"})
+    def test_invalid_falls_back_to_default(self):
+        assert get_trace_retention_days() == 7
+
+
+class TestGetDownloadWorkers:
+    """測試 get_download_workers 函式"""
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_default(self):
+        assert get_download_workers() == 1
+
+    @patch.dict("os.environ", {"DOWNLOAD_WORKERS": "4"})
+    def test_custom(self):
+        assert get_download_workers() == 4
+
+    @patch.dict("os.environ", {"DOWNLOAD_WORKERS": "0"})
+    def test_zero_clamped_to_one(self):
+        assert get_download_workers() == 1
+
+    @patch.dict("os.environ", {"DOWNLOAD_WORKERS": "many"})
+    def test_invalid_falls_back_to_one(self):
+        assert get_download_workers() == 1
+
+
+class TestGetProfilingEnabled:
+    """測試 get_profiling_enabled 函式"""
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_default_disabled(self):
+        assert get_profiling_enabled() is False
+
+    @patch.dict("os.environ", {"ENV": "development"}, clear=True)
+    def test_enabled_in_development(self):
+        assert get_profiling_enabled() is True
+
+    @patch.dict("os.environ", {"PROFILING_ENABLED": "TRUE"}, clear=True)
+    def test_explicit_flag(self):
+        assert get_profiling_enabled() is True
+
+
+class TestGetTaskMatchMode:
+    """測試 get_task_match_mode 函式"""
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_default_priority(self):
+        assert get_task_match_mode() == "priority"
+
+    @patch.dict("os.environ", {"TASK_MATCH_MODE": "MOST_SPECIFIC"})
+    def test_most_specific(self):
+        assert get_task_match_mode() == "most_specific"
+
+    @patch.dict("os.environ", {"TASK_MATCH_MODE": "random"})
+    def test_invalid_falls_back_to_priority(self):
+        assert get_task_match_mode() == "priority"
@@ -0,0 +1,192 @@
+"""
+即時事件匯流排與事件串流路由單元測試
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend import schemas
+from backend.routers import events
+from backend.utils.event_bus import EventBus, event_bus
+from backend.worker.matcher import TaskMatcher
+
+
+class TestEventBus:
+    """測試 EventBus 的訂閱與扇出"""
+
+    def test_publish_without_subscribers_is_noop(self):
+        bus = EventBus()
+
+        bus.publish("log", {"task_id": "t1"})
+
+        assert bus.subscriber_count == 0
+
+    def test_subscriber_receives_event(self):
+        async def scenario():
+            bus = EventBus()
+            sub = bus.subscribe()
+            bus.publish("log", {"task_id": "t1", "message": "hello"})
+            return await sub.get(timeout=1)
+
+        event = asyncio.run(scenario())
+
+        assert event["event"] == "log"
+        assert event["payload"]["message"] == "hello"
+        assert isinstance(event["timestamp"], int)
+
+    def test_task_id_filter(self):
+        async def scenario():
+            bus = EventBus()
+            sub = bus.subscribe(task_id="t2")
+            bus.publish("log", {"task_id": "t1"})
+            bus.publish("log", {"task_id": "t2"})
+            first = await sub.get(timeout=1)
+            second = await sub.get(timeout=0.05)
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        assert first["payload"]["task_id"] == "t2"
+        assert second is None
+
+    def test_publish_from_other_thread_wakes_subscriber(self):
+        async def scenario():
+            bus = EventBus()
+            sub = bus.subscribe()
+            threading.Timer(0.05, bus.publish, ("job", {"task_id": None})).start()
+            return await sub.get(timeout=2)
+
+        event = asyncio.run(scenario())
+
+        assert event["event"] == "job"
+
+    def test_slow_subscriber_drops_oldest_and_reports_overflow(self):
+        async def scenario():
+            bus = EventBus()
+            sub = bus.subscribe(maxsize=2)
+            for i in range(5):
+                bus.publish("log", {"task_id": "t1", "n": i})
+            return [await sub.get(timeout=1) for _ in range(3)], sub.dropped
+
+        received, dropped = asyncio.run(scenario())
+
+        assert received[0]["event"] == "overflow"
+        assert received[0]["payload"]["dropped"] == 3
+        assert [e["payload"]["n"] for e in received[1:]] == [3, 4]
+        assert dropped == 3
+
+    def test_unsubscribe_stops_delivery(self):
+        async def scenario():
+            bus = EventBus()
+            sub = bus.subscribe()
+            bus.unsubscribe(sub)
+            bus.publish("log", {"task_id": "t1"})
+            return await sub.get(timeout=0.05)
+
+        assert asyncio.run(scenario()) is None
+
+
+class TestLogServicePublishes:
+    """測試寫入日誌時推送 log 事件"""
+
+    def test_create_log_publishes_event(self, log_service, task_service, sample_task_data):
+        task = task_service.create_task(schemas.TaskCreate(**sample_task_data))
+
+        async def scenario():
+            sub = event_bus.subscribe(task_id=task.id)
+            try:
+                log_service.create_log(
+                    schemas.LogCreate(task_id=task.id, level="INFO", message="即時日誌")
+                )
+                return await sub.get(timeout=1)
+            finally:
+                event_bus.unsubscribe(sub)
+
+        event = asyncio.run(scenario())
+
+        assert event["event"] == "log"
+        assert event["payload"]["message"] == "即時日誌"
+        assert event["payload"]["task_id"] == task.id
+
+
+class TestWorkerPublishesJobEvents:
+    """測試 Worker 推送工作狀態事件"""
+
+    def test_unmatched_file_publishes_started_and_skipped(self):
+        from unittest.mock import MagicMock
+
+        from backend.worker.worker import process_completed_download
+
+        services = MagicMock()
+        services.setting_service.get_allowed_source_directories.return_value = []
+        services.task_service.get_task_matcher.return_value = TaskMatcher([])
+
+        async def scenario():
+            sub = event_bus.subscribe()
+            try:
+                process_completed_download("/downloads/none.mp4", services=services)
+                return [await sub.get(timeout=1) for _ in range(2)]
+            finally:
+                event_bus.unsubscribe(sub)
+
+        started, skipped = asyncio.run(scenario())
+
+        assert started["payload"]["status"] == "started"
+        assert started["payload"]["job_id"] is not None
+        assert skipped["payload"] == {
+            "job_id": started["payload"]["job_id"],
+            "status": "skipped",
+            "filepath": "/downloads/none.mp4",
+            "task_id": None,
+            "reason": "no_match",
+        }
+
+
+class TestEventStreams:
+    """測試 WebSocket 與 SSE 串流"""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(events.router)
+        return TestClient(app)
+
+    def test_websocket_receives_filtered_events(self, client):
+        with client.websocket_connect("/api/v1/events/ws?task_id=t1") as ws:
+            event_bus.publish("log", {"task_id": "other"})
+            event_bus.publish("job", {"task_id": "t1", "status": "completed"})
+            event = ws.receive_json()
+
+        assert event["event"] == "job"
+        assert event["payload"]["status"] == "completed"
+
+    def test_websocket_disconnect_unsubscribes(self, client):
+        before = event_bus.subscriber_count
+        with client.websocket_connect("/api/v1/events/ws"):
+            assert event_bus.subscriber_count == before + 1
+
+        assert event_bus.subscriber_count == before
+
+    def test_sse_stream_format_and_heartbeat(self):
+        async def scenario():
+            sub = event_bus.subscribe()
+            stream = events._sse_stream(sub, heartbeat=0.05)
+            heartbeat = await anext(stream)
+            event_bus.publish("log", {"task_id": "t1", "message": "嗨"})
+            chunk = await anext(stream)
+            await stream.aclose()
+            return heartbeat, chunk
+
+        before = event_bus.subscriber_count
+        heartbeat, chunk = asyncio.run(scenario())
+
+        assert heartbeat == ": keep-alive\n\n"
+        lines = chunk.strip().split("\n")
+        assert lines[0] == "event: log"
+        assert json.loads(lines[1].removeprefix("data: "))["payload"]["message"] == "嗨"
+        assert event_bus.subscriber_count == before
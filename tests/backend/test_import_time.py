@@ -0,0 +1,63 @@
+"""
+啟動時匯入成本回歸測試（python -X importtime）
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# 啟動時不應載入的重量級模組：Alembic 只在結構落後時才需要，ctypes 只有檔案監看會用到
+LAZY_MODULES = ("alembic", "ctypes")
+
+# 預算約為開發機實測值的四倍，只用來攔截明顯的回歸
+BACKEND_SELF_BUDGET_MS = 750
+TOTAL_BUDGET_MS = 4000
+
+
+@pytest.fixture(scope="module")
+def import_times(tmp_path_factory) -> dict[str, tuple[int, int]]:
+    """回傳 {模組名稱: (self 微秒, cumulative 微秒)}。"""
+    env = dict(os.environ)
+    env["SQLITE_PATH"] = str(tmp_path_factory.mktemp("db") / "database.db")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.backend"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+class TestImportTime:
+    """測試 import backend.backend 的模組與時間預算"""
+
+    @pytest.mark.parametrize("module", LAZY_MODULES)
+    def test_heavy_module_loaded_lazily(self, import_times, module):
+        assert module not in import_times
+
+    def test_backend_modules_within_budget(self, import_times):
+        own_us = sum(
+            self_us
+            for name, (self_us, _) in import_times.items()
+            if name == "backend" or name.startswith("backend.")
+        )
+
+        assert own_us / 1000 < BACKEND_SELF_BUDGET_MS
+
+    def test_total_within_budget(self, import_times):
+        _, cumulative_us = import_times["backend.backend"]
+
+        assert cumulative_us / 1000 < TOTAL_BUDGET_MS
@@ -0,0 +1,39 @@
+"""
+任務 include 規則編譯（backend.utils.include_pattern）單元測試
+"""
+
+import re
+
+import pytest
+
+from backend.utils.include_pattern import GLOB_MAX_LENGTH, compile_include
+
+
+class TestCompileInclude:
+    """測試 compile_include 函式"""
+
+    def test_substring_not_compiled(self):
+        assert compile_include("substring", "影集") is None
+
+    def test_regex_searches_case_insensitive(self):
+        pattern = compile_include("regex", r"\[subsplease\]")
+
+        assert pattern.search("/downloads/[SubsPlease] 影集.mkv")
+
+    def test_regex_invalid_raises(self):
+        with pytest.raises(re.error):
+            compile_include("regex", "(")
+
+    def test_regex_too_long_raises(self):
+        with pytest.raises(ValueError, match="長度超過上限"):
+            compile_include("regex", "a" * 501)
+
+    def test_glob_matches_whole_path(self):
+        pattern = compile_include("glob", "/downloads/*.MKV")
+
+        assert pattern.search("/downloads/影集/第一集.mkv")
+        assert not pattern.search("/other/downloads/a.mkv")
+
+    def test_glob_too_long_raises(self):
+        with pytest.raises(ValueError, match="萬用字元長度超過上限"):
+            compile_include("glob", "*" * (GLOB_MAX_LENGTH + 1))
@@ -0,0 +1,64 @@
+"""
+JobQueue 單元測試
+"""
+
+import threading
+
+from backend.worker.job_queue import JobQueue
+
+
+class TestJobQueue:
+    """測試 JobQueue 佇列行為"""
+
+    def test_submit_runs_job_in_background(self):
+        """測試提交的工作會在背景執行緒中執行"""
+        queue = JobQueue("test")
+        results = []
+
+        queue.submit(results.append, 1)
+        queue.submit(results.append, 2)
+        queue.join()
+        queue.stop()
+
+        assert results == [1, 2]
+
+    def test_submit_passes_keyword_arguments(self):
+        """測試提交工作時可傳入關鍵字參數"""
+        queue = JobQueue("test")
+        results = []
+
+        queue.submit(lambda value, suffix="": results.append(value + suffix), "a", suffix="b")
+        queue.join()
+        queue.stop()
+
+        assert results == ["ab"]
+
+    def test_job_exception_does_not_stop_worker(self):
+        """測試單一工作失敗不影響後續工作"""
+        queue = JobQueue("test")
+        results = []
+
+        def fail():
+            raise RuntimeError("boom")
+
+        queue.submit(fail)
+        queue.submit(results.append, "ok")
+        queue.join()
+        queue.stop()
+
+        assert results == ["ok"]
+
+    def test_qsize_reports_pending_jobs(self):
+        """測試 qsize 回報等待中的工作數量"""
+        queue = JobQueue("test")
+        gate = threading.Event()
+
+        queue.submit(gate.wait)
+        queue.submit(lambda: None)
+        queue.submit(lambda: None)
+        assert queue.qsize() >= 2
+
+        gate.set()
+        queue.join()
+        queue.stop()
+        assert queue.qsize() == 0
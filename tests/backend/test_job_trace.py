@@ -0,0 +1,284 @@
+"""
+工作階段追蹤（tracing、JobTraceService、/jobs/{id}/trace 路由）單元測試
+"""
+
+import json
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend import models, schemas
+from backend.database import Base
+from backend.dependencies import depends_job_trace_service
+from backend.exceptions.job_exception import JobTraceNotFound
+from backend.repositories.job_trace import JobTraceRepository
+from backend.routers import job
+from backend.services.job_trace_service import JobTraceService
+from backend.utils.tracing import JobTrace, current_trace, start_trace, trace_span, use_trace
+from backend.worker.matcher import TaskMatcher
+from backend.worker.worker import WorkerServices, process_completed_download
+
+
+@pytest.fixture
+def job_trace_service(db_session) -> JobTraceService:
+    return JobTraceService(JobTraceRepository(db=db_session))
+
+
+@pytest.fixture
+def task(task_service, sample_task_data):
+    return task_service.create_task(schemas.TaskCreate(**sample_task_data))
+
+
+class TestJobTrace:
+    """測試 JobTrace 的時間區段記錄"""
+
+    def test_span_records_name_offset_and_duration(self):
+        trace = JobTrace("/downloads/a.mp4")
+
+        with trace.span("match"):
+            pass
+
+        [(name, start_ms, duration_ms)] = trace.spans
+        assert name == "match"
+        assert start_ms >= 0
+        assert duration_ms >= 0
+
+    def test_span_recorded_when_block_raises(self):
+        trace = JobTrace("/downloads/a.mp4")
+
+        with pytest.raises(OSError):
+            with trace.span("move"):
+                raise OSError("disk full")
+
+        assert [span[0] for span in trace.spans] == ["move"]
+
+    def test_unsampled_trace_records_nothing(self):
+        trace = JobTrace("/downloads/a.mp4", sampled=False)
+
+        with trace.span("match"):
+            pass
+
+        assert trace.spans == []
+
+    def test_start_trace_honours_sample_rate(self):
+        assert start_trace("/a.mp4", sample_rate=1.0).sampled is True
+        assert start_trace("/a.mp4", sample_rate=0.0).sampled is False
+
+    def test_trace_span_uses_current_trace(self):
+        trace = JobTrace("/downloads/a.mp4")
+
+        with use_trace(trace):
+            assert current_trace() is trace
+            with trace_span("log"):
+                pass
+
+        assert current_trace() is None
+        assert [span[0] for span in trace.spans] == ["log"]
+
+    def test_trace_span_without_job_is_noop(self):
+        with trace_span("log"):
+            pass
+
+
+class TestJobTraceService:
+    """測試 JobTraceService 的保存與查詢"""
+
+    def test_record_and_get_trace(self, job_trace_service, task):
+        trace = JobTrace("/downloads/a.mp4")
+        trace.task_id = task.id
+        trace.status = "completed"
+        trace.spans = [("match", 2.0, 1.0), ("whitelist", 0.0, 0.5)]
+
+        job_trace_service.record(trace)
+        result = job_trace_service.get_trace(trace.id)
+
+        assert result.id == trace.id
+        assert result.status == "completed"
+        assert result.task_id == task.id
+        assert [span.name for span in result.spans] == ["whitelist", "match"]
+        assert result.spans[1].duration_ms == 1.0
+
+    def test_spans_stored_compactly(self, job_trace_service, db_session, task):
+        trace = JobTrace("/downloads/a.mp4")
+        trace.task_id = task.id
+        trace.status = "completed"
+        trace.spans = [("move", 1.5, 20.25)]
+
+        job_trace_service.record(trace)
+
+        row = db_session.get(models.JobTrace, trace.id)
+        assert row.spans == '[["move",1.5,20.25]]'
+
+    def test_unsampled_trace_not_recorded(self, job_trace_service, task):
+        trace = JobTrace("/downloads/a.mp4", sampled=False)
+        trace.task_id = task.id
+        trace.status = "completed"
+
+        job_trace_service.record(trace)
+
+        with pytest.raises(JobTraceNotFound):
+            job_trace_service.get_trace(trace.id)
+
+    def test_unmatched_trace_not_recorded(self, job_trace_service, db_session):
+        trace = JobTrace("/downloads/a.mp4")
+        trace.status = "skipped"
+
+        job_trace_service.record(trace)
+
+        assert db_session.query(models.JobTrace).count() == 0
+
+    def test_expired_traces_pruned_on_record(self, job_trace_service, db_session, task):
+        old = JobTrace("/downloads/old.mp4")
+        old.task_id = task.id
+        old.status = "completed"
+        old.started_at = datetime.now(UTC) - timedelta(days=8)
+        job_trace_service.record(old)
+
+        trace = JobTrace("/downloads/a.mp4")
+        trace.task_id = task.id
+        trace.status = "completed"
+        job_trace_service.record(trace)
+
+        assert [row.id for row in db_session.query(models.JobTrace)] == [trace.id]
+
+    @patch("backend.services.job_trace_service.get_trace_retention_days", return_value=0)
+    def test_zero_retention_keeps_traces(self, _days, job_trace_service, db_session, task):
+        old = JobTrace("/downloads/old.mp4")
+        old.task_id = task.id
+        old.status = "completed"
+        old.started_at = datetime.now(UTC) - timedelta(days=365)
+        job_trace_service.record(old)
+
+        trace = JobTrace("/downloads/a.mp4")
+        trace.task_id = task.id
+        trace.status = "completed"
+        job_trace_service.record(trace)
+
+        assert db_session.query(models.JobTrace).count() == 2
+
+    def test_trace_deleted_with_task(self, job_trace_service, task_service, db_session, task):
+        trace = JobTrace("/downloads/a.mp4")
+        trace.task_id = task.id
+        trace.status = "completed"
+        job_trace_service.record(trace)
+
+        task_service.delete_task(task.id)
+        db_session.expire_all()
+
+        assert db_session.get(models.JobTrace, trace.id) is None
+
+
+class TestWorkerTracing:
+    """測試 process_completed_download 記錄各階段"""
+
+    @patch("backend.worker.worker.move")
+    @patch("backend.utils.tracing.get_trace_sample_rate", return_value=1.0)
+    def test_completed_job_records_every_stage(
+        self, _rate, _move, job_trace_service, task_service, tmp_path
+    ):
+        task = task_service.create_task(
+            schemas.TaskCreate(name="動畫", include="動畫", move_to=str(tmp_path / "target"))
+        )
+        services = WorkerServices(
+            task_service=MagicMock(),
+            log_service=MagicMock(),
+            setting_service=MagicMock(),
+            trace_service=job_trace_service,
+        )
+        services.setting_service.get_allowed_source_directories.return_value = []
+        services.task_service.get_task_matcher.return_value = TaskMatcher([task])
+
+        with patch.object(
+            job_trace_service, "record", wraps=job_trace_service.record
+        ) as record:
+            process_completed_download(str(tmp_path / "動畫 - 01.mp4"), services=services)
+
+        trace = record.call_args.args[0]
+        stored = job_trace_service.get_trace(trace.id)
+        assert stored.status == "completed"
+        assert stored.task_id == task.id
+        names = [span.name for span in stored.spans]
+        for stage in ("whitelist", "load_tasks", "match", "rename", "move", "log"):
+            assert stage in names
+
+    @patch("backend.utils.tracing.get_trace_sample_rate", return_value=0.0)
+    def test_unsampled_job_is_not_recorded(self, _rate):
+        services = MagicMock()
+        services.setting_service.get_allowed_source_directories.return_value = []
+        services.task_service.get_task_matcher.return_value = TaskMatcher([])
+
+        process_completed_download("/downloads/a.mp4", services=services)
+
+        services.trace_service.record.assert_not_called()
+
+    @patch("backend.utils.tracing.get_trace_sample_rate", return_value=1.0)
+    def test_trace_write_failure_does_not_break_job(self, _rate):
+        services = MagicMock()
+        services.setting_service.get_allowed_source_directories.return_value = []
+        services.task_service.get_task_matcher.return_value = TaskMatcher([])
+        services.trace_service.record.side_effect = RuntimeError("database is locked")
+
+        process_completed_download("/downloads/a.mp4", services=services)
+
+        services.trace_service.record.assert_called_once()
+
+
+class TestJobTraceRouter:
+    """測試 GET /api/v1/jobs/{job_id}/trace"""
+
+    @pytest.fixture
+    def client_and_service(self):
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        service = JobTraceService(JobTraceRepository(db=session))
+
+        app = FastAPI()
+        app.include_router(job.router)
+        app.dependency_overrides[depends_job_trace_service] = lambda: service
+
+        @app.exception_handler(JobTraceNotFound)
+        async def _not_found(request, exc):
+            return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+        yield TestClient(app), service
+        session.close()
+
+    def test_get_trace(self, client_and_service):
+        client, service = client_and_service
+        task = models.Task(name="動畫", include="動畫", move_to="/downloads/target")
+        service.repository.db.add(task)
+        service.repository.db.commit()
+        trace = JobTrace("/downloads/a.mp4")
+        trace.task_id = task.id
+        trace.status = "failed"
+        trace.spans = [("rename", 0.5, 3000.0)]
+        service.record(trace)
+
+        response = client.get(f"/api/v1/jobs/{trace.id}/trace")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "failed"
+        assert data["spans"] == [
+            {"name": "rename", "start_ms": 0.5, "duration_ms": 3000.0}
+        ]
+
+    def test_unknown_trace_returns_404(self, client_and_service):
+        client, _ = client_and_service
+
+        response = client.get("/api/v1/jobs/missing/trace")
+
+        assert response.status_code == 404
+        assert json.loads(response.text)["detail"] == "Job trace Id: 'missing' not found"
@@ -0,0 +1,56 @@
+"""
+Webhook 負載測試工具（benchmarks.loadtest）的情境產生與統計單元測試
+"""
+
+import random
+
+from benchmarks.loadtest import Fixture, build_fires, parse_args, percentiles
+
+
+def make_fixture(tmp_path) -> Fixture:
+    return Fixture(
+        src_root=tmp_path / "downloads",
+        dst_root=tmp_path / "media",
+        shows=["影集 A", "影集 B"],
+        rng=random.Random(0),
+    )
+
+
+class TestPercentiles:
+    """測試 percentiles 函式"""
+
+    def test_nearest_rank(self):
+        result = percentiles([float(i) for i in range(1, 101)])
+
+        assert result == {"p50": 50.0, "p95": 95.0, "p99": 99.0, "max": 100.0}
+
+    def test_empty(self):
+        assert percentiles([])["p99"] == 0.0
+
+
+class TestBuildFires:
+    """測試各情境產生的事件"""
+
+    def test_season_pack_creates_files(self, tmp_path):
+        args = parse_args(["--episodes", "5"])
+
+        fires = build_fires("season-pack", make_fixture(tmp_path), args)
+
+        assert len(fires) == 5
+        assert all(fire.at >= 0 for fire in fires)
+        assert len({fire.filepath for fire in fires}) == 5
+
+    def test_many_clients_use_distinct_files(self, tmp_path):
+        args = parse_args(["--episodes", "3", "--clients", "4"])
+
+        fires = build_fires("many-clients", make_fixture(tmp_path), args)
+
+        assert len({fire.filepath for fire in fires}) == 12
+
+    def test_duplicates_fire_each_file_repeatedly(self, tmp_path):
+        args = parse_args(["--episodes", "4", "--duplicates", "3"])
+
+        fires = build_fires("duplicates", make_fixture(tmp_path), args)
+
+        assert len(fires) == 12
+        assert len({fire.filepath for fire in fires}) == 4
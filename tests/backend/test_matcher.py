@@ -0,0 +1,217 @@
+"""
+任務比對器（backend.worker.matcher）單元測試
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from backend.utils.safe_regex import BatchOutcome
+from backend.worker import matcher as matcher_module
+from backend.worker.matcher import TaskMatcher
+from backend.worker.worker import find_matching_task
+
+
+def make_task(
+    name: str,
+    include: str,
+    priority: int = 0,
+    include_type: str = "substring",
+    match_categories: str | None = None,
+    match_tags: str | None = None,
+):
+    return SimpleNamespace(
+        id=name,
+        name=name,
+        include=include,
+        include_type=include_type,
+        priority=priority,
+        match_categories=match_categories,
+        match_tags=match_tags,
+    )
+
+
+class TestPriorityMode:
+    """測試依優先順序比對"""
+
+    def test_higher_priority_wins(self):
+        general = make_task("general", "影集")
+        season2 = make_task("season2", "影集 第二季", priority=5)
+
+        matcher = TaskMatcher([general, season2])
+
+        assert matcher.match("/downloads/影集 第二季 - 01.mp4") is season2
+
+    def test_same_priority_keeps_given_order(self):
+        first = make_task("first", "影集")
+        second = make_task("second", "影集")
+
+        assert TaskMatcher([first, second]).match("/downloads/影集.mp4") is first
+
+    def test_no_match(self):
+        assert TaskMatcher([make_task("a", "影集")]).match("/downloads/電影.mp4") is None
+
+
+class TestMostSpecificMode:
+    """測試 include 最長者優先的比對"""
+
+    def test_longest_include_wins(self):
+        general = make_task("general", "影集", priority=100)
+        season2 = make_task("season2", "影集 第二季")
+
+        matcher = TaskMatcher([general, season2], mode="most_specific")
+
+        assert matcher.match("/downloads/影集 第二季 - 01.mp4") is season2
+        assert matcher.match("/downloads/影集 第一季 - 01.mp4") is general
+
+    def test_priority_breaks_length_ties(self):
+        low = make_task("low", "影集 A")
+        high = make_task("high", "影集 B", priority=1)
+
+        matcher = TaskMatcher([low, high], mode="most_specific")
+
+        assert matcher.match("/downloads/影集 A 影集 B.mp4") is high
+
+    def test_includes_longer_than_path_skipped(self):
+        long_task = make_task("long", "x" * 100)
+        short_task = make_task("short", "影集")
+
+        matcher = TaskMatcher([long_task, short_task], mode="most_specific")
+
+        assert matcher.match("影集.mp4") is short_task
+
+
+class TestPatternIncludes:
+    """測試 regex 與 glob include 的比對"""
+
+    def test_regex_include(self):
+        task = make_task("regex", r"\[SubsPlease\].*1080p", include_type="regex")
+
+        matcher = TaskMatcher([task])
+
+        assert matcher.match("/downloads/[SubsPlease] 影集 - 01 (1080p).mkv") is task
+        assert matcher.match("/downloads/[SubsPlease] 影集 - 01 (720p).mkv") is None
+
+    def test_glob_matches_whole_path_case_insensitive(self):
+        task = make_task("glob", "*/影集 - ?? (1080P).mkv", include_type="glob")
+
+        matcher = TaskMatcher([task])
+
+        assert matcher.match("/downloads/影集 - 01 (1080p).mkv") is task
+        assert matcher.match("/downloads/影集 - 01 (1080p).mkv.part") is None
+
+    def test_priority_between_substring_and_pattern(self):
+        general = make_task("general", "影集", priority=1)
+        regex = make_task("regex", r"影集 - \d+", priority=5, include_type="regex")
+        fallback = make_task("fallback", ".*", include_type="regex")
+
+        matcher = TaskMatcher([general, regex, fallback])
+
+        assert matcher.match("/downloads/影集 - 01.mp4") is regex
+        assert matcher.match("/downloads/影集 SP.mp4") is general
+        assert matcher.match("/downloads/電影.mp4") is fallback
+
+    def test_invalid_pattern_skipped(self):
+        broken = make_task("broken", "(", priority=10, include_type="regex")
+        general = make_task("general", "影集")
+
+        assert TaskMatcher([broken, general]).match("/downloads/影集.mp4") is general
+
+    def test_match_many(self):
+        literal = make_task("literal", "電影", priority=5)
+        regex = make_task("regex", r"影集 - \d+", include_type="regex")
+
+        outcomes = TaskMatcher([literal, regex]).match_many(
+            ["/downloads/影集 - 01.mp4", "/downloads/電影 影集 - 01.mp4", "/downloads/其他.mp4"]
+        )
+
+        assert [outcome.value for outcome in outcomes] == [regex, literal, None]
+
+    def test_match_many_reports_timeout(self):
+        evil = make_task("evil", r"(a+)+$", include_type="regex")
+
+        with patch("backend.worker.matcher.safe_search_first_many") as search:
+            search.return_value = [BatchOutcome(error="逾時", timed_out=True)]
+            outcomes = TaskMatcher([evil]).match_many(["a" * 30 + "!"])
+
+        assert outcomes[0].timed_out
+
+
+class TestRouting:
+    """測試依下載器類別與標籤篩選候選任務"""
+
+    def test_category_restricts_candidates(self):
+        anime = make_task("anime", "影集", priority=5, match_categories="Anime, TV")
+        movie = make_task("movie", "影集", match_categories="movie")
+
+        matcher = TaskMatcher([anime, movie])
+
+        assert matcher.match("/downloads/影集.mp4", category="movie") is movie
+        assert matcher.match("/downloads/影集.mp4", category="tv") is anime
+        assert matcher.match("/downloads/影集.mp4", category="music") is None
+
+    def test_uncategorized_tasks_keep_priority_order(self):
+        general = make_task("general", "影集", priority=10)
+        anime = make_task("anime", "影集", match_categories="anime")
+        fallback = make_task("fallback", "影集", priority=-1)
+
+        matcher = TaskMatcher([anime, fallback, general])
+
+        assert matcher.match("/downloads/影集.mp4", category="anime") is general
+        assert matcher.match("/downloads/影集.mp4", category="") is general
+
+    def test_required_tags(self):
+        hd = make_task("hd", "影集", priority=5, match_tags="1080p,webrip")
+        general = make_task("general", "影集")
+
+        matcher = TaskMatcher([hd, general])
+
+        assert matcher.match("/downloads/影集.mp4", tags="WebRip, 1080p, baha") is hd
+        assert matcher.match("/downloads/影集.mp4", tags="1080p") is general
+
+    def test_routing_skipped_without_context(self):
+        anime = make_task("anime", "影集", match_categories="anime", match_tags="1080p")
+
+        assert TaskMatcher([anime]).match("/downloads/影集.mp4") is anime
+
+    def test_routing_with_pattern_includes(self):
+        regex = make_task("regex", r"影集 - \d+", include_type="regex", match_categories="anime")
+        other = make_task("other", r".*", include_type="regex", match_categories="movie")
+
+        matcher = TaskMatcher([other, regex])
+
+        assert matcher.match("/downloads/影集 - 01.mp4", category="anime") is regex
+
+
+    def test_route_cache_ignores_unused_labels(self):
+        """測試任務未使用的類別與標籤共用同一個路由結果"""
+        hd = make_task("hd", "影集", match_categories="anime", match_tags="1080p")
+        general = make_task("general", "影集")
+
+        matcher = TaskMatcher([hd, general])
+        for i in range(50):
+            matcher.match("/downloads/影集.mp4", category=f"cat-{i}", tags=f"torrent-{i}")
+            matcher.match("/downloads/影集.mp4", category="anime", tags=f"1080p,torrent-{i}")
+
+        assert matcher._routed.cache_info().currsize == 2
+        assert matcher.match("/downloads/影集.mp4", category="anime", tags="1080p,x") is hd
+        assert matcher.match("/downloads/影集.mp4", category="other", tags="1080p") is general
+
+    def test_route_cache_bounded(self):
+        tasks = [make_task(f"t{i}", "影集", match_categories=f"c{i}") for i in range(300)]
+
+        matcher = TaskMatcher(tasks)
+        for i in range(300):
+            matcher.match("/downloads/影集.mp4", category=f"c{i}")
+
+        assert matcher._routed.cache_info().currsize == matcher_module._ROUTE_CACHE_SIZE
+
+
+class TestFindMatchingTask:
+    """測試 find_matching_task 依 TASK_MATCH_MODE 選擇比對模式"""
+
+    @patch.dict("os.environ", {"TASK_MATCH_MODE": "most_specific"})
+    def test_uses_configured_mode(self):
+        general = make_task("general", "影集", priority=100)
+        season2 = make_task("season2", "影集 第二季")
+
+        assert find_matching_task([general, season2], "/downloads/影集 第二季.mp4") is season2
@@ -0,0 +1,170 @@
+"""
+Prometheus 指標登錄表與 /metrics 路由單元測試
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.exceptions.worker_exception import RenameOperationError
+from backend.routers import metrics
+from backend.utils.metrics import (
+    JOB_FAILURES,
+    MOVE_BYTES,
+    MOVE_DURATION,
+    RENAME_DURATION,
+    MetricsRegistry,
+    _Metric,
+)
+from backend.utils.move import move
+from backend.worker.job_queue import download_queue
+from backend.worker.worker import (
+    WorkerServices,
+    perform_rename_operation,
+    process_completed_download,
+)
+
+
+@pytest.fixture
+def mock_services():
+    setting_service = MagicMock()
+    setting_service.get_allowed_source_directories.return_value = []
+    return WorkerServices(
+        task_service=MagicMock(),
+        log_service=MagicMock(),
+        setting_service=setting_service,
+    )
+
+
+class TestMetricsRegistry:
+    """測試指標的累計與文字格式輸出"""
+
+    def test_counter_renders_with_labels(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("demo_total", "示範計數器", ("result",))
+
+        counter.inc(result="ok")
+        counter.inc(2, result="ok")
+        counter.inc(result="fail")
+
+        text = registry.render()
+        assert "# TYPE demo_total counter" in text
+        assert 'demo_total{result="ok"} 3' in text
+        assert 'demo_total{result="fail"} 1' in text
+
+    def test_base_metric_is_abstract(self):
+        with pytest.raises(TypeError):
+            _Metric("demo", "示範")
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("demo_seconds", "示範分佈", buckets=(0.1, 1.0))
+
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        text = registry.render()
+        assert 'demo_seconds_bucket{le="0.1"} 1' in text
+        assert 'demo_seconds_bucket{le="1"} 2' in text
+        assert 'demo_seconds_bucket{le="+Inf"} 3' in text
+        assert "demo_seconds_sum 5.55" in text
+        assert "demo_seconds_count 3" in text
+
+    def test_histogram_time_records_on_exception(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("demo_seconds", "示範分佈")
+
+        with pytest.raises(ValueError):
+            with histogram.time():
+                raise ValueError("boom")
+
+        assert histogram.count() == 1
+
+    def test_gauge_reads_callback_at_render(self):
+        registry = MetricsRegistry()
+        depth = [3]
+        registry.gauge("demo_depth", "示範量測值", lambda: depth[0])
+
+        depth[0] = 7
+
+        assert "demo_depth 7" in registry.render()
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("demo_total", "示範計數器", ("name",))
+
+        counter.inc(name='a"b')
+
+        assert 'demo_total{name="a\\"b"} 1' in registry.render()
+
+    def test_register_same_name_returns_existing(self):
+        registry = MetricsRegistry()
+
+        first = registry.counter("demo_total", "示範計數器")
+        second = registry.counter("demo_total", "示範計數器")
+
+        assert first is second
+
+
+class TestMetricsRouter:
+    """測試 GET /metrics"""
+
+    def test_metrics_endpoint_returns_prometheus_text(self):
+        app = FastAPI()
+        app.include_router(metrics.router)
+        client = TestClient(app)
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE movera_jobs_total counter" in response.text
+        assert (
+            f"movera_download_queue_depth {download_queue.qsize()}" in response.text
+        )
+
+
+class TestPipelineInstrumentation:
+    """測試 Worker 流程各階段的指標記錄"""
+
+    def test_move_records_device_and_bytes(self, tmp_path):
+        src = tmp_path / "video.mp4"
+        src.write_bytes(b"x" * 128)
+        before_bytes = MOVE_BYTES.value(device="same")
+        before_count = MOVE_DURATION.count(device="same")
+
+        move(src, tmp_path / "target")
+
+        assert MOVE_BYTES.value(device="same") - before_bytes == 128
+        assert MOVE_DURATION.count(device="same") - before_count == 1
+
+    @patch("backend.worker.worker.Rename")
+    def test_rename_duration_labelled_by_rule(self, mock_rename, mock_services):
+        task = MagicMock()
+        task.id = "metrics-task"
+        task.rename_rule = "parse"
+        mock_rename.return_value.execute_rename.return_value = "/downloads/b.mp4"
+        before = RENAME_DURATION.count(rule="parse")
+
+        perform_rename_operation(mock_services, task, "/downloads/a.mp4")
+
+        assert RENAME_DURATION.count(rule="parse") - before == 1
+
+    @patch("backend.worker.worker.perform_rename_operation")
+    @patch("backend.worker.worker.match_task")
+    def test_rename_failure_counted_per_task(
+        self, mock_match, mock_rename, mock_services
+    ):
+        task = MagicMock()
+        task.id = "metrics-task"
+        task.move_to = "/target"
+        mock_match.return_value = task
+        mock_rename.side_effect = RenameOperationError("/downloads/a.mp4", "boom")
+        before = JOB_FAILURES.value(task_id="metrics-task", stage="rename")
+
+        process_completed_download("/downloads/a.mp4", services=mock_services)
+
+        assert JOB_FAILURES.value(task_id="metrics-task", stage="rename") - before == 1
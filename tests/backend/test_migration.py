@@ -0,0 +1,90 @@
+"""
+資料庫結構版本檢查與啟動遷移快速路徑單元測試
+"""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from backend.utils.migration import (
+    MIGRATION_HEAD,
+    get_current_revisions,
+    is_schema_at_head,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _set_revision(engine, revision):
+    with engine.begin() as connection:
+        connection.execute(
+            text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32))")
+        )
+        connection.execute(text("DELETE FROM alembic_version"))
+        connection.execute(
+            text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": revision}
+        )
+
+
+class TestMigrationHead:
+    """測試建置時的 head 與遷移檔一致"""
+
+    def test_head_matches_alembic_scripts(self):
+        from alembic.config import Config
+        from alembic.script import ScriptDirectory
+
+        script = ScriptDirectory.from_config(Config("alembic.ini"))
+
+        assert script.get_current_head() == MIGRATION_HEAD
+
+
+class TestIsSchemaAtHead:
+    """測試 is_schema_at_head"""
+
+    def test_fresh_database(self, engine):
+        assert get_current_revisions(engine) == set()
+        assert is_schema_at_head(engine) is False
+
+    def test_outdated_database(self, engine):
+        _set_revision(engine, "c3d4e5f6a7b8")
+
+        assert is_schema_at_head(engine) is False
+
+    def test_database_at_head(self, engine):
+        _set_revision(engine, MIGRATION_HEAD)
+
+        assert is_schema_at_head(engine) is True
+
+
+class TestRunAlembicUpgrade:
+    """測試啟動時僅在結構落後時呼叫 Alembic"""
+
+    def test_skips_alembic_when_at_head(self, engine):
+        from backend import backend as backend_module
+
+        _set_revision(engine, MIGRATION_HEAD)
+        with patch.object(backend_module, "engine", engine), patch(
+            "alembic.command.upgrade"
+        ) as mock_upgrade:
+            upgraded = backend_module._run_alembic_upgrade()
+
+        assert upgraded is False
+        mock_upgrade.assert_not_called()
+
+    def test_upgrades_fresh_database(self, engine, tmp_path):
+        from backend import backend as backend_module
+
+        url = f"sqlite:///{tmp_path / 'test.db'}"
+        with patch.object(backend_module, "engine", engine), patch.object(
+            backend_module, "DATABASE_URL", url
+        ):
+            upgraded = backend_module._run_alembic_upgrade()
+
+        assert upgraded is True
+        assert is_schema_at_head(engine) is True
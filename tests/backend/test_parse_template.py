@@ -0,0 +1,36 @@
+"""
+parse 樣板編譯快取（backend.utils.parse_template）單元測試
+"""
+
+import pytest
+
+from backend.utils.parse_template import compile_parse, parse_named
+
+
+class TestCompileParse:
+    """測試 compile_parse 函式"""
+
+    def test_same_pattern_compiled_once(self):
+        assert compile_parse("{title} - {episode}.mp4") is compile_parse("{title} - {episode}.mp4")
+
+    def test_invalid_type_raises_value_error(self):
+        with pytest.raises(ValueError):
+            compile_parse("{episode:zz}")
+
+
+class TestParseNamed:
+    """測試 parse_named 函式"""
+
+    def test_typed_fields_converted(self):
+        groups = parse_named("{title} - {episode:d} v{version:f}.mp4", "動畫 - 07 v1.5.mp4")
+
+        assert groups == {"title": "動畫", "episode": 7, "version": 1.5}
+
+    def test_mismatch_returns_none(self):
+        assert parse_named("{title} - {episode:d}.mp4", "動畫 - 第一集.mp4") is None
+
+    def test_returns_independent_dicts(self):
+        first = parse_named("{title}.mp4", "a.mp4")
+        first["title"] = "changed"
+
+        assert parse_named("{title}.mp4", "a.mp4") == {"title": "a"}
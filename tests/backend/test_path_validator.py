@@ -1,6 +1,14 @@
 """路徑驗證工具函式單元測試"""
 
-from backend.utils.path_validator import is_absolute_path, validate_allowed_directories
+import os
+
+from backend.utils.path_validator import (
+    AllowedPathMatcher,
+    clear_path_matcher_cache,
+    get_path_matcher,
+    is_absolute_path,
+    validate_allowed_directories,
+)
 
 
 class TestIsAbsolutePath:
@@ -36,3 +44,48 @@ class TestValidateAllowedDirectories:
 
     def test_empty_list(self):
         assert validate_allowed_directories([]) == []
+
+
+class TestAllowedPathMatcher:
+    """測試 AllowedPathMatcher 前綴樹比對"""
+
+    def test_matches_root_and_descendants(self):
+        matcher = AllowedPathMatcher(["/downloads", "/media/tv"])
+
+        assert matcher.matches("/downloads") is True
+        assert matcher.matches("/downloads/anime/ep01.mp4") is True
+        assert matcher.matches("/media/tv/show") is True
+
+    def test_rejects_sibling_with_common_prefix(self):
+        matcher = AllowedPathMatcher(["/downloads"])
+
+        assert matcher.matches("/downloads-other/file.mp4") is False
+        assert matcher.matches("/media/tv") is False
+
+    def test_rejects_traversal(self):
+        matcher = AllowedPathMatcher(["/downloads"])
+
+        assert matcher.matches("/downloads/../etc/passwd") is False
+
+    def test_follows_symlinked_roots(self, tmp_path):
+        target = tmp_path / "real"
+        target.mkdir()
+        link = tmp_path / "link"
+        os.symlink(target, link)
+        matcher = AllowedPathMatcher([str(link)])
+
+        assert matcher.matches(str(target / "file.mp4")) is True
+
+    def test_empty_matcher_is_falsy(self):
+        assert not AllowedPathMatcher([])
+        assert AllowedPathMatcher(["/downloads"])
+
+    def test_matcher_cached_per_directory_list(self):
+        clear_path_matcher_cache()
+
+        first = get_path_matcher(["/downloads"])
+
+        assert get_path_matcher(["/downloads"]) is first
+        assert get_path_matcher(["/downloads", "/media"]) is not first
+        clear_path_matcher_cache()
+        assert get_path_matcher(["/downloads"]) is not first
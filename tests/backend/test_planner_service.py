@@ -0,0 +1,240 @@
+"""
+PlannerService 與 /api/v1/plan 路由單元測試
+"""
+
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base
+
+from backend.dependencies import depends_planner_service
+from backend.repositories.setting import SettingRepository
+from backend.repositories.task import TaskRepository
+from backend.exceptions.directory_exception import (
+    DirectoryAccessDenied,
+    DirectoryNotFound,
+)
+from backend.routers import plan
+from backend.schemas import TaskCreate
+from backend.services.planner_service import PlannerService
+from backend.services.setting_service import SettingService
+from backend.services.task_service import TaskService
+
+
+@pytest.fixture
+def planner_service(task_service, setting_service) -> PlannerService:
+    """建立 PlannerService 實例"""
+    return PlannerService(task_service=task_service, setting_service=setting_service)
+
+
+@pytest.fixture
+def parse_task(task_service):
+    return task_service.create_task(
+        TaskCreate(
+            name="Parse 任務",
+            include="動畫",
+            move_to="/media/anime",
+            src_filename="{title} - {episode}.mp4",
+            dst_filename="{title} - S01E{episode}.mp4",
+            rename_rule="parse",
+        )
+    )
+
+
+@pytest.fixture
+def regex_task(task_service):
+    return task_service.create_task(
+        TaskCreate(
+            name="Regex 任務",
+            include="Show",
+            move_to="/media/show",
+            src_filename=r"(?P<title>.+) - (?P<episode>\d+)\.mkv",
+            dst_filename=r"\g<title> - S02E\g<episode>.mkv",
+            rename_rule="regex",
+            episode_offset_enabled=True,
+            episode_offset_group="episode",
+            episode_offset_value=12,
+        )
+    )
+
+
+class TestPlannerService:
+    """測試 PlannerService.plan"""
+
+    def test_parse_rule_plan(self, planner_service, parse_task):
+        """測試 parse 規則產生目的地路徑"""
+        result = planner_service.plan(["/downloads/動畫 - 01.mp4"])
+
+        assert result[0]["task_id"] == parse_task.id
+        assert result[0]["dst_filepath"] == "/media/anime/動畫 - S01E01.mp4"
+        assert result[0]["error"] is None
+
+    def test_regex_rule_with_offset_batch(self, planner_service, regex_task):
+        """測試 regex 規則批次處理並套用偏移"""
+        result = planner_service.plan(
+            ["/downloads/Show - 01.mkv", "/downloads/Show - 02.mkv"]
+        )
+
+        assert [r["dst_filepath"] for r in result] == [
+            "/media/show/Show - S02E13.mkv",
+            "/media/show/Show - S02E14.mkv",
+        ]
+
+    def test_no_match_returns_empty_item(self, planner_service, parse_task):
+        """測試沒有匹配任務時回傳空結果"""
+        result = planner_service.plan(["/downloads/other.mp4"])
+
+        assert result[0]["task_id"] is None
+        assert result[0]["dst_filepath"] is None
+
+    def test_parse_non_match_reports_error(self, planner_service, parse_task):
+        """測試 include 匹配但檔名不符合 parse 樣板時回報錯誤"""
+        result = planner_service.plan(["/downloads/動畫.mp4"])
+
+        assert result[0]["task_id"] == parse_task.id
+        assert result[0]["error"] is not None
+
+    def test_conflict_detection(self, planner_service, task_service):
+        """測試兩個檔案規劃到相同目的地時標記衝突"""
+        task_service.create_task(
+            TaskCreate(name="移動", include="movie", move_to="/media/movies")
+        )
+
+        result = planner_service.plan(["/a/movie.mkv", "/b/movie.mkv"])
+
+        assert result[0]["conflict_with"] is None
+        assert result[1]["conflict_with"] == "/a/movie.mkv"
+
+    def test_does_not_touch_filesystem(self, planner_service, parse_task, tmp_path):
+        """測試規劃不會重新命名或移動檔案"""
+        src = tmp_path / "動畫 - 01.mp4"
+        src.write_text("test")
+
+        planner_service.plan([str(src)])
+
+        assert src.exists()
+
+    def test_task_ids_include_disabled_task(self, planner_service, task_service):
+        """測試指定 task_ids 時可預覽停用中的任務"""
+        task = task_service.create_task(
+            TaskCreate(name="停用", include="movie", move_to="/media", enabled=False)
+        )
+
+        assert planner_service.plan(["/a/movie.mkv"])[0]["task_id"] is None
+        result = planner_service.plan(["/a/movie.mkv"], task_ids=[task.id])
+        assert result[0]["task_id"] == task.id
+
+    def test_outside_allowed_source_reports_error(
+        self, planner_service, parse_task, setting_service, tmp_path
+    ):
+        """測試來源路徑不在白名單時回報錯誤"""
+        setting_service.update_settings(
+            {"allowed_source_directories": [str(tmp_path)]}
+        )
+
+        result = planner_service.plan(["/elsewhere/動畫 - 01.mp4"])
+
+        assert result[0]["error"] is not None
+        assert result[0]["task_id"] is None
+
+    def test_chunked_plan_keeps_order(self, planner_service, parse_task):
+        """測試跨批次時仍保持輸入順序"""
+        paths = [f"/downloads/動畫 - {i:02d}.mp4" for i in range(5)]
+
+        result = list(planner_service.iter_plan(paths, chunk_size=2))
+
+        assert [r["filepath"] for r in result] == paths
+
+
+class TestPlannerListDirectory:
+    """測試 PlannerService.list_directory"""
+
+    def test_list_directory(self, planner_service, tmp_path):
+        (tmp_path / "b.mp4").write_text("")
+        (tmp_path / "a").mkdir()
+        (tmp_path / ".hidden").write_text("")
+
+        result = planner_service.list_directory(str(tmp_path))
+
+        assert result == [str(tmp_path / "a"), str(tmp_path / "b.mp4")]
+
+    def test_list_directory_not_found(self, planner_service, tmp_path):
+        with pytest.raises(DirectoryNotFound):
+            planner_service.list_directory(str(tmp_path / "missing"))
+
+    def test_list_directory_access_denied(self, planner_service, setting_service, tmp_path):
+        allowed = tmp_path / "allowed"
+        allowed.mkdir()
+        setting_service.update_settings({"allowed_source_directories": [str(allowed)]})
+
+        with pytest.raises(DirectoryAccessDenied):
+            planner_service.list_directory(str(tmp_path))
+
+
+class TestPlanRouter:
+    """測試 POST /api/v1/plan"""
+
+    @pytest.fixture
+    def session(self):
+        """TestClient 於其他執行緒執行，使用 StaticPool 共用同一個 in-memory DB"""
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+
+    @pytest.fixture
+    def task_service(self, session):
+        return TaskService(TaskRepository(db=session))
+
+    @pytest.fixture
+    def client(self, task_service, session):
+        service = PlannerService(
+            task_service=task_service,
+            setting_service=SettingService(SettingRepository(db=session)),
+        )
+        app = FastAPI()
+        app.include_router(plan.router)
+        app.dependency_overrides[depends_planner_service] = lambda: service
+
+        @app.exception_handler(DirectoryNotFound)
+        async def handle_not_found(request: Request, exc: DirectoryNotFound):
+            return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+        return TestClient(app)
+
+    def test_stream_ndjson(self, client, parse_task):
+        response = client.post(
+            "/api/v1/plan",
+            json={"filepaths": ["/downloads/動畫 - 01.mp4", "/downloads/x.mp4"]},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 2
+        assert lines[0]["dst_filepath"] == "/media/anime/動畫 - S01E01.mp4"
+        assert lines[1]["task_id"] is None
+
+    def test_empty_request_rejected(self, client):
+        response = client.post("/api/v1/plan", json={})
+
+        assert response.status_code == 400
+
+    def test_directory_not_found(self, client, tmp_path):
+        response = client.post(
+            "/api/v1/plan", json={"directory": str(tmp_path / "missing")}
+        )
+
+        assert response.status_code == 404
@@ -2,6 +2,8 @@
 PreviewService 單元測試 (ParsePreviewService, RegexPreviewService)
 """
 
+from unittest.mock import patch
+
 import pytest
 
 from backend.services.preview_service import ParsePreviewService, RegexPreviewService
@@ -42,6 +44,20 @@ class TestParsePreviewServiceMatch:
         assert groups["name"] == "file"
         assert isinstance(groups["date"], str)
 
+    def test_match_typed_field_zero_padded(self):
+        """測試型別欄位轉為數值，並以格式規格補零輸出"""
+        result = ParsePreviewService.preview(
+            "{title} - {episode:d}.mp4", "動畫 - 7.mp4", "{title} - S01E{episode:02d}.mp4"
+        )
+
+        assert result["groups"]["episode"] == 7
+        assert result["formatted"] == "動畫 - S01E07.mp4"
+
+    def test_match_invalid_pattern(self):
+        """測試無法辨識的型別拋出 ValueError"""
+        with pytest.raises(ValueError):
+            ParsePreviewService._match("{a:zz}", "a")
+
 
 class TestParsePreviewServiceFormat:
     """測試 ParsePreviewService._format 方法"""
@@ -202,3 +218,84 @@ class TestRegexPreviewServicePreview:
         result = RegexPreviewService.preview(src_pattern, text, dst_pattern)
 
         assert result["formatted"] == "公爵千金的家庭教師 - S01E01 [1080P].mp4"
+
+
+class TestParsePreviewServiceBatch:
+    """測試 ParsePreviewService.preview_batch 方法"""
+
+    def test_preview_batch(self):
+        """測試批次預覽逐筆回傳結果"""
+        result = ParsePreviewService.preview_batch(
+            "{title} - {episode}.mp4",
+            ["動畫 - 01.mp4", "不符合"],
+            "{title} - S01E{episode}.mp4",
+        )
+
+        items = result["items"]
+        assert items[0]["groups"] == {"title": "動畫", "episode": "01"}
+        assert items[0]["formatted"] == "動畫 - S01E01.mp4"
+        assert items[1]["groups"] == {}
+        assert items[1]["formatted"] == ""
+
+    def test_preview_batch_time_budget(self):
+        """測試超出總時間預算的項目被標記為逾時"""
+        result = ParsePreviewService.preview_batch(
+            "{title}.mp4", ["a.mp4", "b.mp4"], "{title}", timeout=-1
+        )
+
+        assert all(item["timed_out"] for item in result["items"])
+
+    def test_preview_batch_item_error_isolated(self):
+        """測試單筆格式化失敗只標記該筆，其餘項目照常完成"""
+        with patch.object(
+            ParsePreviewService, "_format", side_effect=[ValueError("格式錯誤"), "b"]
+        ):
+            result = ParsePreviewService.preview_batch("{title}.mp4", ["a.mp4", "b.mp4"], "{title}")
+
+        first, second = result["items"]
+        assert first["error"] == "格式錯誤"
+        assert first["formatted"] == ""
+        assert first["timed_out"] is False
+        assert second["error"] is None
+        assert second["formatted"] == "b"
+
+    def test_preview_batch_invalid_pattern(self):
+        """測試無效樣板拋出 ValueError"""
+        with pytest.raises(ValueError):
+            ParsePreviewService.preview_batch("{a:zz}", ["a"], "{a}")
+
+
+class TestRegexPreviewServiceBatch:
+    """測試 RegexPreviewService.preview_batch 方法"""
+
+    def test_preview_batch(self):
+        """測試批次預覽逐筆回傳分組與替換結果"""
+        result = RegexPreviewService.preview_batch(
+            r"(?P<title>.+) - (\d+)\.mp4",
+            ["動畫 - 01.mp4", "不符合"],
+            r"\g<title> - S01E\2.mp4",
+        )
+
+        items = result["items"]
+        assert items[0]["groups"]["named_group"] == {"title": "動畫"}
+        assert items[0]["groups"]["numbered_group"] == ["動畫", "01"]
+        assert items[0]["formatted"] == "動畫 - S01E01.mp4"
+        assert items[1]["groups"] == {"named_group": {}, "numbered_group": []}
+        assert items[1]["formatted"] == "不符合"
+
+    def test_preview_batch_flags_timed_out_item(self):
+        """測試單筆逾時時只標記該筆，其餘項目保留結果"""
+        result = RegexPreviewService.preview_batch(
+            r"(a+)+b", ["ab", "a" * 30 + "c"], "X", timeout=1
+        )
+
+        items = result["items"]
+        assert items[0]["formatted"] == "X"
+        assert items[0]["timed_out"] is False
+        assert items[1]["timed_out"] is True
+        assert items[1]["error"] is not None
+
+    def test_preview_batch_pattern_too_long(self):
+        """測試 pattern 過長拋出 ValueError"""
+        with pytest.raises(ValueError):
+            RegexPreviewService.preview_batch("a" * 501, ["a"], "b")
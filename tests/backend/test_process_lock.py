@@ -0,0 +1,73 @@
+"""
+跨行程檔案鎖與多行程啟動協調單元測試
+"""
+
+import multiprocessing
+from unittest.mock import patch
+
+from backend.utils.process_lock import ProcessLock
+
+
+def _try_acquire_in_child(path, result_queue):
+    result_queue.put(ProcessLock(path).acquire(blocking=False))
+
+
+class TestProcessLock:
+    """測試 ProcessLock"""
+
+    def test_acquire_and_release(self, tmp_path):
+        lock = ProcessLock(tmp_path / "a.lock")
+
+        assert lock.acquire() is True
+        assert lock.held is True
+        lock.release()
+        assert lock.held is False
+
+    def test_second_holder_rejected_until_released(self, tmp_path):
+        first = ProcessLock(tmp_path / "a.lock")
+        second = ProcessLock(tmp_path / "a.lock")
+        first.acquire()
+
+        assert second.acquire(blocking=False) is False
+        first.release()
+        assert second.acquire(blocking=False) is True
+        second.release()
+
+    def test_lock_excludes_other_process(self, tmp_path):
+        path = tmp_path / "a.lock"
+        result_queue = multiprocessing.Queue()
+        with ProcessLock(path):
+            child = multiprocessing.Process(
+                target=_try_acquire_in_child, args=(path, result_queue)
+            )
+            child.start()
+            child.join(timeout=10)
+
+        assert result_queue.get(timeout=5) is False
+
+    def test_creates_parent_directory(self, tmp_path):
+        lock = ProcessLock(tmp_path / "nested" / "a.lock")
+
+        with lock:
+            assert (tmp_path / "nested" / "a.lock").exists()
+
+
+class TestStartBackgroundJobs:
+    """測試只有取得背景鎖的行程啟動檔案監看"""
+
+    @patch("backend.backend.get_watcher_enabled", return_value=True)
+    @patch("backend.worker.watcher.start_source_watcher")
+    def test_only_lock_holder_starts_watcher(self, mock_start, _enabled, tmp_path):
+        from backend import backend as backend_module
+
+        holder = ProcessLock(tmp_path / "bg.lock")
+        other = ProcessLock(tmp_path / "bg.lock")
+        with patch.object(backend_module, "background_lock", holder):
+            first = backend_module.start_background_jobs()
+        with patch.object(backend_module, "background_lock", other):
+            second = backend_module.start_background_jobs()
+        holder.release()
+
+        assert first is mock_start.return_value
+        assert second is None
+        assert mock_start.call_count == 1
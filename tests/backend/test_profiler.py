@@ -0,0 +1,188 @@
+"""
+執行期間剖析（backend.utils.profiler）與剖析管理端點單元測試
+"""
+
+import pstats
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.middlewares import setup_profiling
+from backend.routers import profiling
+from backend.utils.profiler import Profiler, profiler
+from backend.worker.matcher import TaskMatcher
+from backend.worker.worker import WorkerServices, process_completed_download
+
+
+def busy_work():
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+
+@pytest.fixture
+def tmp_profiler(tmp_path, monkeypatch):
+    """讓全域 profiler 寫入暫存目錄，並確保測試結束後關閉。"""
+    monkeypatch.setattr(profiler, "base_dir", tmp_path)
+    yield profiler
+    profiler.stop()
+
+
+class TestProfiler:
+    """測試剖析工作階段的輸出與自動關閉"""
+
+    def test_inactive_does_nothing(self, tmp_path):
+        instance = Profiler(base_dir=tmp_path)
+
+        with instance.profile("jobs", "a.mp4"):
+            busy_work()
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_cprofile_writes_pstats(self, tmp_path):
+        instance = Profiler(base_dir=tmp_path)
+        session = instance.start("jobs", 1, "cprofile")
+
+        with instance.profile("jobs", "影集 - 01.mp4"):
+            busy_work()
+
+        assert session.files == ["job-001-影集_-_01.mp4.prof"]
+        stats = pstats.Stats(str(session.output_dir / session.files[0]))
+        assert any(func[2] == "busy_work" for func in stats.stats)
+
+    def test_sampling_writes_folded_stacks(self, tmp_path):
+        instance = Profiler(base_dir=tmp_path)
+        session = instance.start("jobs", 1, "sampling")
+
+        with instance.profile("jobs", "a.mp4"):
+            busy_work()
+
+        lines = (session.output_dir / session.files[0]).read_text().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert "busy_work" in stack
+        assert int(count) > 0
+
+    def test_turns_off_after_count(self, tmp_path):
+        instance = Profiler(base_dir=tmp_path)
+        session = instance.start("jobs", 2, "cprofile")
+
+        for name in ("a", "b", "c"):
+            with instance.profile("jobs", name):
+                pass
+
+        assert instance.session is None
+        assert len(session.files) == 2
+
+    def test_other_target_not_profiled(self, tmp_path):
+        instance = Profiler(base_dir=tmp_path)
+        session = instance.start("requests", 1, "cprofile")
+
+        with instance.profile("jobs", "a.mp4"):
+            pass
+
+        assert session.files == []
+        assert instance.session is session
+
+    def test_concurrent_profile_skipped(self, tmp_path):
+        instance = Profiler(base_dir=tmp_path)
+        session = instance.start("jobs", 5, "cprofile")
+
+        with instance.profile("jobs", "outer"):
+            with instance.profile("jobs", "inner"):
+                pass
+
+        assert session.files == ["job-001-outer.prof"]
+        assert session.remaining == 4
+
+
+class TestProfilingHooks:
+    """測試 Worker 與請求中介軟體的剖析掛勾"""
+
+    def test_worker_job_profiled(self, tmp_profiler):
+        setting_service = MagicMock()
+        setting_service.get_allowed_source_directories.return_value = []
+        task_service = MagicMock()
+        task_service.get_task_matcher.return_value = TaskMatcher([])
+        services = WorkerServices(
+            task_service=task_service,
+            log_service=MagicMock(),
+            setting_service=setting_service,
+        )
+        session = tmp_profiler.start("jobs", 1, "cprofile")
+
+        process_completed_download("/downloads/a.mp4", services=services)
+
+        assert session.files == ["job-001-a.mp4.prof"]
+        assert tmp_profiler.session is None
+
+    def test_request_profiled_except_admin_endpoint(self, tmp_profiler):
+        app = FastAPI()
+        app.include_router(profiling.router)
+        setup_profiling(app)
+
+        @app.get("/ping")
+        def ping():
+            return "pong"
+
+        client = TestClient(app)
+        response = client.post(
+            "/api/v1/admin/profiling",
+            json={"target": "requests", "count": 1, "mode": "cprofile"},
+        )
+        assert response.status_code == 200
+        assert response.json()["active"] is True
+
+        session = tmp_profiler.session
+
+        client.get("/ping")
+
+        assert session.files == ["request-001-GET_ping.prof"]
+        assert client.get("/api/v1/admin/profiling").json()["active"] is False
+
+
+class TestProfilingRouter:
+    """測試剖析管理端點"""
+
+    @pytest.fixture
+    def client(self, tmp_profiler):
+        app = FastAPI()
+        app.include_router(profiling.router)
+        return TestClient(app)
+
+    def test_start_and_status(self, client):
+        response = client.post(
+            "/api/v1/admin/profiling", json={"target": "jobs", "count": 3, "mode": "sampling"}
+        )
+
+        data = client.get("/api/v1/admin/profiling").json()
+        assert response.status_code == 200
+        assert data["active"] is True
+        assert data["target"] == "jobs"
+        assert data["mode"] == "sampling"
+        assert data["remaining"] == 3
+
+    def test_stop(self, client):
+        client.post("/api/v1/admin/profiling", json={"count": 1})
+
+        response = client.delete("/api/v1/admin/profiling")
+
+        assert response.json()["active"] is False
+        assert response.json()["count"] == 1
+        assert client.get("/api/v1/admin/profiling").json() == {
+            "active": False,
+            "target": None,
+            "mode": None,
+            "count": 0,
+            "remaining": 0,
+            "output_dir": None,
+            "files": [],
+        }
+
+    def test_count_validated(self, client):
+        response = client.post("/api/v1/admin/profiling", json={"count": 0})
+
+        assert response.status_code == 422
@@ -42,3 +42,18 @@ class TestSafeFormat:
         """測試同一 key 出現多次"""
         result = safe_format("{ep} and {ep}", {"ep": "01"})
         assert result == "01 and 01"
+
+    def test_format_spec_zero_padding(self):
+        """測試 {key:spec} 套用格式規格，數字字串先轉為數字再補零"""
+        result = safe_format("E{ep:02d} E{ep:03} {n:02d}", {"ep": "7", "n": 7})
+        assert result == "E07 E007 07"
+
+    def test_format_spec_on_non_numeric_preserved(self):
+        """測試無法套用格式規格時保留原始佔位符"""
+        result = safe_format("{title:02d}", {"title": "動畫"})
+        assert result == "{title:02d}"
+
+    def test_format_spec_width_limited(self):
+        """測試過大的寬度不被接受，避免產生巨大字串"""
+        result = safe_format("{ep:999999999}", {"ep": "1"})
+        assert result == "{ep:999999999}"
@@ -10,7 +10,11 @@ from backend.utils.safe_regex import (
     RegexTimeoutError,
     safe_compile,
     safe_search,
+    safe_search_first,
+    safe_search_first_many,
+    safe_search_many,
     safe_sub,
+    safe_sub_many,
 )
 
 
@@ -84,3 +88,71 @@ class TestSafeSub:
         pattern = safe_compile(r"(a+)+b")
         with pytest.raises(RegexTimeoutError):
             safe_sub(pattern, "replacement", "a" * 30 + "c", timeout=1)
+
+
+class TestSafeBatch:
+    """測試 safe_search_many / safe_sub_many 批次函式"""
+
+    def test_search_many_returns_per_item_results(self):
+        """測試批次搜尋逐筆回傳結果並保持順序"""
+        pattern = safe_compile(r"(?P<ep>\d+)")
+        outcomes = safe_search_many(pattern, ["a 01", "none", "b 12"])
+
+        assert outcomes[0].value.groupdict() == {"ep": "01"}
+        assert outcomes[1].ok and outcomes[1].value is None
+        assert outcomes[2].value.group(1) == "12"
+
+    def test_sub_many_uses_per_item_replacement(self):
+        """測試批次替換可逐筆指定替換字串"""
+        pattern = safe_compile(r"(\d+)")
+        outcomes = safe_sub_many(pattern, [(r"E\1", "ep 01"), ("X", "ep 02")])
+
+        assert [o.value for o in outcomes] == ["ep E01", "ep X"]
+
+    def test_timeout_flags_only_stuck_item(self):
+        """測試單筆逾時只標記該筆，其餘項目仍完成"""
+        pattern = safe_compile(r"(a+)+b")
+        outcomes = safe_search_many(
+            pattern, ["ab", "a" * 30 + "c", "aab"], timeout=5, item_timeout=1
+        )
+
+        assert outcomes[0].ok and outcomes[0].value is not None
+        assert outcomes[1].timed_out
+        assert outcomes[2].ok and outcomes[2].value is not None
+
+    def test_item_error_is_reported(self):
+        """測試替換錯誤逐筆回報"""
+        pattern = safe_compile(r"(\d+)")
+        outcomes = safe_sub_many(pattern, [(r"\9", "1"), (r"\1", "2")])
+
+        assert not outcomes[0].ok
+        assert outcomes[1].value == "2"
+
+
+class TestSafeSearchFirst:
+    """測試 safe_search_first / safe_search_first_many 多 pattern 比對"""
+
+    def test_returns_first_matching_index(self):
+        """測試回傳依順序第一個符合的 pattern 索引"""
+        patterns = [safe_compile(r"第二季"), safe_compile(r"\d+"), safe_compile(r"影集")]
+
+        assert safe_search_first(patterns, "影集 - 01") == 1
+        assert safe_search_first(patterns, "電影") is None
+
+    def test_many_keeps_order(self):
+        """測試批次比對逐筆回傳索引並保持順序"""
+        patterns = [safe_compile(r"a"), safe_compile(r"b")]
+        outcomes = safe_search_first_many(patterns, ["xb", "ab", "x"])
+
+        assert [o.value for o in outcomes] == [1, 0, None]
+
+    def test_empty_patterns(self):
+        """測試沒有 pattern 時不啟動子行程，直接回傳 None"""
+        assert safe_search_first_many([], ["a"])[0].value is None
+
+    def test_timeout_raises(self):
+        """測試任一 pattern 逾時時拋出 RegexTimeoutError"""
+        patterns = [safe_compile(r"x"), safe_compile(r"(a+)+b")]
+
+        with pytest.raises(RegexTimeoutError):
+            safe_search_first(patterns, "a" * 30 + "c", timeout=1)
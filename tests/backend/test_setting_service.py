@@ -394,3 +394,84 @@ class TestSettingServiceAllowedDirectoriesValidation:
             setting_service.update_settings({
                 "allowed_directories": ["not/absolute"],
             })
+
+
+class TestSettingServicePathMatcherInvalidation:
+    """測試更新允許目錄時清除已編譯的白名單比對器"""
+
+    def test_set_allowed_directories_clears_matcher_cache(self, setting_service):
+        from backend.utils.path_validator import get_path_matcher
+
+        before = get_path_matcher(["/downloads"])
+
+        setting_service.set_allowed_directories(["/downloads"])
+
+        assert get_path_matcher(["/downloads"]) is not before
+
+    def test_update_settings_clears_matcher_cache(self, setting_service):
+        from backend.utils.path_validator import get_path_matcher
+
+        before = get_path_matcher(["/downloads"])
+
+        setting_service.update_settings({"allowed_source_directories": ["/downloads"]})
+
+        assert get_path_matcher(["/downloads"]) is not before
+
+
+class TestSettingServiceSnapshot:
+    """測試設定快照的快取與失效"""
+
+    def test_snapshot_reused_while_version_unchanged(self, setting_service, mocker):
+        first = setting_service.get_settings_snapshot()
+        get_all = mocker.spy(setting_service.repository, "get_all")
+
+        second = setting_service.get_settings_snapshot()
+
+        assert second is first
+        assert get_all.call_count == 0
+
+    def test_write_through_repository_invalidates(self, setting_service):
+        setting_service.get_allowed_directories()
+
+        setting_service.set_allowed_directories(["/media"])
+
+        assert "/media" in setting_service.get_allowed_directories()
+
+    def test_direct_orm_write_bumps_version(self, setting_service, db_session):
+        before = setting_service.repository.get_version()
+
+        db_session.add(Setting(key="timezone", value="Asia/Taipei"))
+        db_session.commit()
+
+        assert setting_service.repository.get_version() == before + 1
+        assert setting_service.get_all_settings()["timezone"] == "Asia/Taipei"
+
+    def test_write_from_other_session_invalidates(self, setting_service, db_engine):
+        """測試另一個 session（如其他 worker 行程）寫入後快照失效"""
+        from sqlalchemy.orm import sessionmaker
+
+        from backend.repositories.setting import SettingRepository
+
+        setting_service.get_allowed_source_directories()
+        other_session = sessionmaker(bind=db_engine)()
+        SettingService(SettingRepository(other_session)).update_settings(
+            {"allowed_source_directories": ["/downloads"]}
+        )
+        other_session.close()
+
+        assert "/downloads" in setting_service.get_allowed_source_directories()
+
+    def test_env_change_invalidates(self, setting_service, monkeypatch):
+        monkeypatch.delenv("ALLOWED_DIRECTORIES", raising=False)
+        setting_service.get_allowed_directories()
+
+        monkeypatch.setenv("ALLOWED_DIRECTORIES", "/env-media")
+
+        assert setting_service.get_allowed_directories()[0] == "/env-media"
+
+    def test_returned_lists_are_copies(self, setting_service):
+        setting_service.set_allowed_directories(["/media"])
+
+        setting_service.get_allowed_directories().append("/tampered")
+
+        assert "/tampered" not in setting_service.get_allowed_directories()
@@ -9,6 +9,7 @@ from fastapi import FastAPI
 
 from backend.routers.tag import router
 from backend.models.tag import Tag
+from backend.schemas import TagTaskCount
 from backend.services.tag_service import TagService
 from backend.exceptions.tag_exception import TagAlreadyExists, TagNotFound, InvalidTagColor
 
@@ -75,6 +76,20 @@ class TestGetAllTags:
         assert data[0]["name"] == "動畫"
 
 
+class TestGetTagTaskCounts:
+    def test_get_counts_success(self, client, mock_tag_service):
+        mock_tag_service.get_task_counts.return_value = [
+            TagTaskCount(tag_id="1", task_count=3),
+            TagTaskCount(tag_id="2", task_count=0),
+        ]
+        response = client.get("/api/v1/tags/counts")
+        assert response.status_code == 200
+        assert response.json() == [
+            {"tag_id": "1", "task_count": 3},
+            {"tag_id": "2", "task_count": 0},
+        ]
+
+
 class TestCreateTag:
     def test_create_tag_success(self, client, mock_tag_service):
         mock_tag_service.create_tag.return_value = _make_tag()
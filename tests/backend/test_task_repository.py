@@ -473,3 +473,35 @@ class TestTaskRepositoryGetEnabledTasks:
 
         assert len(enabled_tasks) == 1
         assert enabled_tasks[0].name == sample_task_data["name"]
+
+    def test_get_enabled_tasks_ordered_by_priority_then_name(self, task_repository):
+        """測試啟用任務依優先順序由大到小、再依名稱排列"""
+        for name, priority in (("b", 0), ("a", 0), ("hot", 10), ("cold", -5)):
+            task_repository.create(
+                schemas.TaskCreate(name=name, include=name, move_to="/media", priority=priority)
+            )
+
+        enabled_tasks = task_repository.get_enabled_tasks()
+
+        assert [task.name for task in enabled_tasks] == ["hot", "a", "b", "cold"]
+
+
+class TestTaskRepositoryVersion:
+    """測試任務寫入遞增 cache_version"""
+
+    def test_writes_bump_version(self, task_repository, sample_task_data, sample_task_data_2):
+        """測試單筆與批量的建立、更新、刪除都會遞增版本號"""
+        versions = [task_repository.get_version()]
+
+        task = task_repository.create(schemas.TaskCreate(**sample_task_data))
+        versions.append(task_repository.get_version())
+        task_repository.batch_update(
+            [schemas.TaskBatchUpdateItem(id=task.id, patch=schemas.TaskPatch(enabled=False))]
+        )
+        versions.append(task_repository.get_version())
+        task_repository.batch_create([schemas.TaskCreate(**sample_task_data_2)])
+        versions.append(task_repository.get_version())
+        task_repository.delete(task.id)
+        versions.append(task_repository.get_version())
+
+        assert versions == sorted(set(versions))
@@ -57,6 +57,10 @@ def _make_task(id="task-1", name="任務", enabled=True):
     t.episode_offset_enabled = False
     t.episode_offset_group = None
     t.episode_offset_value = 0
+    t.priority = 0
+    t.include_type = "substring"
+    t.match_categories = None
+    t.match_tags = None
     t.enabled = enabled
     t.created_at = datetime.now(UTC)
     t.tags = []
@@ -64,6 +68,27 @@ def _make_task(id="task-1", name="任務", enabled=True):
     return t
 
 
+class TestGetAllTasksRouter:
+    def test_filter_by_tags(self, client, mock_task_service):
+        mock_task_service.get_all_tasks.return_value = [_make_task(id="1", name="A")]
+        response = client.get("/api/v1/tasks?tag_ids=t1&tag_ids=t2&tag_match=all")
+        assert response.status_code == 200
+        assert [task["id"] for task in response.json()] == ["1"]
+        mock_task_service.get_all_tasks.assert_called_once_with(
+            tag_ids=["t1", "t2"], tag_match="all"
+        )
+
+    def test_default_returns_all(self, client, mock_task_service):
+        mock_task_service.get_all_tasks.return_value = []
+        response = client.get("/api/v1/tasks")
+        assert response.status_code == 200
+        mock_task_service.get_all_tasks.assert_called_once_with(tag_ids=[], tag_match="any")
+
+    def test_invalid_tag_match(self, client):
+        response = client.get("/api/v1/tasks?tag_match=none")
+        assert response.status_code == 422
+
+
 class TestBatchCreateRouter:
     def test_batch_create_success(self, client, mock_task_service):
         mock_task_service.batch_create_tasks.return_value = [
@@ -111,6 +136,14 @@ class TestBatchCreateRouter:
         response = client.post("/api/v1/tasks/batch", json={"items": items})
         assert response.status_code == 400
 
+    def test_batch_create_invalid_regex_include(self, client, mock_task_service):
+        payload = {
+            "items": [{"name": "A", "include": "(", "include_type": "regex", "move_to": "/a"}]
+        }
+        response = client.post("/api/v1/tasks/batch", json=payload)
+        assert response.status_code == 422
+        mock_task_service.batch_create_tasks.assert_not_called()
+
 
 class TestBatchUpdateRouter:
     def test_batch_update_enabled_success(self, client, mock_task_service):
@@ -146,6 +179,13 @@ class TestBatchUpdateRouter:
         response = client.put("/api/v1/tasks/batch", json=payload)
         assert response.status_code == 409
 
+    def test_batch_update_invalid_glob_include(self, client, mock_task_service):
+        payload = {
+            "items": [{"id": "1", "patch": {"include": "*" * 501, "include_type": "glob"}}]
+        }
+        response = client.put("/api/v1/tasks/batch", json=payload)
+        assert response.status_code == 422
+
     def test_batch_update_empty_items(self, client):
         response = client.put("/api/v1/tasks/batch", json={"items": []})
         assert response.status_code == 400
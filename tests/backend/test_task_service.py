@@ -5,7 +5,11 @@ TaskService 單元測試
 import pytest
 
 from backend import schemas
-from backend.exceptions.task_exception import TaskAlreadyExists, TaskNotFound
+from backend.exceptions.task_exception import (
+    InvalidTaskInclude,
+    TaskAlreadyExists,
+    TaskNotFound,
+)
 from backend.services.task_service import TaskService
 
 
@@ -50,6 +54,77 @@ class TestTaskServiceGetEnabledTasks:
         assert enabled_tasks[0].name == sample_task_data["name"]
 
 
+class TestTaskServiceGetTaskMatcher:
+    """測試 TaskService.get_task_matcher 的快取"""
+
+    def test_matcher_reused_until_tasks_change(self, task_service, sample_task_data):
+        """測試任務未變更時回傳同一個比對器"""
+        task_service.create_task(schemas.TaskCreate(**sample_task_data))
+
+        first = task_service.get_task_matcher("priority")
+
+        assert task_service.get_task_matcher("priority") is first
+
+    def test_task_writes_invalidate_matcher(
+        self, task_service, sample_task_data, sample_task_data_2
+    ):
+        """測試建立、更新與刪除任務後重新建立比對器"""
+        created = task_service.create_task(schemas.TaskCreate(**sample_task_data))
+        matcher = task_service.get_task_matcher("priority")
+
+        task_service.create_task(schemas.TaskCreate(**sample_task_data_2))
+        assert task_service.get_task_matcher("priority") is not matcher
+        matcher = task_service.get_task_matcher("priority")
+
+        task_service.update_task(
+            created.id,
+            schemas.TaskUpdate(
+                name=sample_task_data["name"], include="新關鍵字", move_to="/downloads/test"
+            ),
+        )
+        updated = task_service.get_task_matcher("priority")
+        assert updated is not matcher
+        assert updated.match("/downloads/新關鍵字 - 01.mp4").id == created.id
+
+        task_service.delete_task(created.id)
+        assert task_service.get_task_matcher("priority").match("/downloads/新關鍵字.mp4") is None
+
+    def test_mode_change_rebuilds_matcher(self, task_service):
+        """測試比對模式改變時重新建立比對器"""
+        matcher = task_service.get_task_matcher("priority")
+
+        assert task_service.get_task_matcher("most_specific").mode == "most_specific"
+        assert task_service.get_task_matcher("most_specific") is not matcher
+
+    def test_write_from_other_session_invalidates(self, task_service, db_engine, sample_task_data):
+        """測試另一個 session（如其他 worker 行程）寫入任務後比對器失效"""
+        from sqlalchemy.orm import sessionmaker
+
+        from backend.repositories.task import TaskRepository
+
+        task_service.get_task_matcher("priority")
+        other_session = sessionmaker(bind=db_engine)()
+        TaskService(TaskRepository(other_session)).create_task(
+            schemas.TaskCreate(**sample_task_data)
+        )
+        other_session.close()
+
+        matcher = task_service.get_task_matcher("priority")
+        assert matcher.match(f"/downloads/{sample_task_data['include']}.mp4") is not None
+
+    def test_cached_tasks_survive_commit(self, task_service, db_session, sample_task_data):
+        """測試快取的任務不會因 session 提交而過期"""
+        task_service.create_task(schemas.TaskCreate(**sample_task_data))
+        matcher = task_service.get_task_matcher("priority")
+
+        db_session.commit()
+        db_session.close()
+
+        assert matcher.match(f"/downloads/{sample_task_data['include']}.mp4").move_to == (
+            sample_task_data["move_to"]
+        )
+
+
 class TestTaskServiceGetTaskById:
     """測試 TaskService.get_task_by_id 方法"""
 
@@ -257,6 +332,44 @@ class TestTaskServiceBatch:
         with pytest.raises(TaskAlreadyExists):
             task_service.batch_update_tasks(items)
 
+    def test_batch_update_include_only_validated_against_regex_task(self, task_service):
+        """patch 只帶 include 時以任務現有的 include_type 驗證"""
+        task = task_service.create_task(
+            schemas.TaskCreate(name="regex", include=r"動畫 \d+", include_type="regex", move_to="/m")
+        )
+
+        items = [schemas.TaskBatchUpdateItem(id=task.id, patch=schemas.TaskPatch(include="("))]
+        with pytest.raises(InvalidTaskInclude):
+            task_service.batch_update_tasks(items)
+
+        assert task_service.get_task_by_id(task.id).include == r"動畫 \d+"
+
+    def test_batch_update_include_type_only_validated_against_include(self, task_service):
+        """patch 只把 include_type 改為 regex 時以任務現有的 include 驗證"""
+        task = task_service.create_task(
+            schemas.TaskCreate(name="literal", include="動畫 (第二季", move_to="/m")
+        )
+
+        items = [
+            schemas.TaskBatchUpdateItem(id=task.id, patch=schemas.TaskPatch(include_type="regex"))
+        ]
+        with pytest.raises(InvalidTaskInclude):
+            task_service.batch_update_tasks(items)
+
+        assert task_service.get_task_by_id(task.id).include_type == "substring"
+
+    def test_batch_update_valid_partial_include_patch(self, task_service):
+        task = task_service.create_task(
+            schemas.TaskCreate(name="regex", include=r"動畫 \d+", include_type="regex", move_to="/m")
+        )
+
+        items = [
+            schemas.TaskBatchUpdateItem(id=task.id, patch=schemas.TaskPatch(include=r"動畫 S\d+"))
+        ]
+        [updated] = task_service.batch_update_tasks(items)
+
+        assert updated.include == r"動畫 S\d+"
+
     def test_batch_update_not_found_propagates(self, task_service):
         """批量更新 id 不存在，TaskNotFound 往上拋"""
         items = [
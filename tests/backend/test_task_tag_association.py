@@ -96,3 +96,34 @@ class TestTaskTagCascadeDelete:
         refreshed_task = task_repository.get_by_id(task.id)
         assert refreshed_task is not None
         assert len(refreshed_task.tags) == 0
+
+
+class TestTaskTagFilter:
+    @pytest.fixture
+    def tagged(self, task_repository, tag_repository, sample_task_data, sample_tag_data, sample_tag_data_2):
+        anime = tag_repository.create(TagCreate(**sample_tag_data))
+        movie = tag_repository.create(TagCreate(**sample_tag_data_2))
+        for name, tag_ids in (("動畫任務", [anime.id]), ("兩者", [anime.id, movie.id]), ("無標籤", [])):
+            task_repository.create(TaskCreate(**{**sample_task_data, "name": name, "tag_ids": tag_ids}))
+        return anime, movie
+
+    def test_filter_any(self, task_repository, tagged):
+        anime, movie = tagged
+        tasks = task_repository.get_all(tag_ids=[anime.id, movie.id])
+        assert sorted(task.name for task in tasks) == ["兩者", "動畫任務"]
+
+    def test_filter_all(self, task_repository, tagged):
+        anime, movie = tagged
+        tasks = task_repository.get_all(tag_ids=[anime.id, movie.id, movie.id], tag_match="all")
+        assert [task.name for task in tasks] == ["兩者"]
+
+    def test_no_filter_returns_all(self, task_repository, tagged):
+        assert len(task_repository.get_all(tag_ids=[])) == 3
+
+    def test_tag_task_counts(self, tag_repository, tagged):
+        anime, movie = tagged
+        tag_repository.create(TagCreate(name="未使用", color="green"))
+        counts = dict(tag_repository.get_task_counts())
+        assert counts[anime.id] == 2
+        assert counts[movie.id] == 1
+        assert sorted(counts.values()) == [0, 1, 2]
@@ -6,7 +6,16 @@ import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from backend.utils.rename import Rename, ParseRenameRule, RegexRenameRule, apply_episode_offset
+from backend.utils.rename import (
+    ParseMismatchError,
+    ParseRenameRule,
+    Rename,
+    EpisodeOffset,
+    OffsetRange,
+    RegexRenameRule,
+    apply_episode_offset,
+    apply_episode_offsets,
+)
 
 
 class TestParseRenameRule:
@@ -343,3 +352,205 @@ class TestRenameWithEpisodeOffset:
 
         expected_path = tmp_path / "動畫 - S01E01.mp4"
         assert expected_path.exists()
+
+
+class TestRenameRender:
+    """測試 Rename.render 只計算檔名、不觸碰檔案系統"""
+
+    def test_parse_render_with_offset(self):
+        rename = Rename(
+            filepath="",
+            src="{title} - {episode}.mp4",
+            dst="{title} - S02E{episode}.mp4",
+            rule="parse",
+            episode_offset_enabled=True,
+            episode_offset_group="episode",
+            episode_offset_value=12,
+        )
+
+        assert rename.render("動畫 - 01.mp4") == "動畫 - S02E13.mp4"
+
+    def test_regex_render(self, tmp_path):
+        src_file = tmp_path / "動畫 - 01.mp4"
+        src_file.write_text("test")
+        rename = Rename(
+            filepath=str(src_file),
+            src=r"(.+) - (\d+)\.mp4",
+            dst=r"\1 - S01E\2.mp4",
+            rule="regex",
+        )
+
+        assert rename.render(src_file.name) == "動畫 - S01E01.mp4"
+        assert src_file.exists()
+
+    def test_offset_regex_replacement(self):
+        rename = Rename(
+            filepath="",
+            src=r"(?P<episode>\d+)",
+            dst=r"E\g<episode>",
+            rule="regex",
+            episode_offset_enabled=True,
+            episode_offset_group="episode",
+            episode_offset_value=1,
+        )
+
+        assert rename.offset_regex_replacement({"episode": "09"}) == "E10"
+
+
+class TestParseTypedFields:
+    """測試 parse 規則的型別欄位、補零輸出與不符合樣板的處理"""
+
+    def test_typed_field_zero_padded(self):
+        rename = Rename(
+            filepath="",
+            src="{title} - {episode:d}.mp4",
+            dst="{title} - S01E{episode:02d}.mp4",
+            rule="parse",
+        )
+
+        assert rename.render("動畫 - 7.mp4") == "動畫 - S01E07.mp4"
+
+    def test_typed_field_with_offset(self):
+        rename = Rename(
+            filepath="",
+            src="{title} - {episode:d}.mp4",
+            dst="{title} - S02E{episode:02d}.mp4",
+            rule="parse",
+            episode_offset_enabled=True,
+            episode_offset_group="episode",
+            episode_offset_value=-12,
+        )
+
+        assert rename.render("動畫 - 13.mp4") == "動畫 - S02E01.mp4"
+
+    def test_parse_groups_returns_none_on_mismatch(self):
+        rule = ParseRenameRule(filepath="", src="{title} - {episode}.mp4", dst="{title}")
+
+        assert rule.parse_groups("不符合.mkv") is None
+
+    @pytest.mark.parametrize("offset", [0, 12])
+    def test_render_mismatch_raises_value_error(self, offset):
+        rename = Rename(
+            filepath="",
+            src="{title} - {episode}.mp4",
+            dst="{title}",
+            rule="parse",
+            episode_offset_enabled=bool(offset),
+            episode_offset_group="episode",
+            episode_offset_value=offset,
+        )
+
+        with pytest.raises(ParseMismatchError) as exc_info:
+            rename.render("不符合.mkv")
+        assert isinstance(exc_info.value, ValueError)
+
+
+class TestApplyEpisodeOffsets:
+    """測試 apply_episode_offsets 批次偏移"""
+
+    def test_batch_preserves_width_and_decimal(self):
+        result = apply_episode_offsets(["01", "003", "07.5", "99", "abc"], 12)
+
+        assert result == ["13", "015", "19.5", "111", "abc"]
+
+    def test_sign_and_whitespace_accepted_like_int(self):
+        """測試與先前的 int() 轉換相同，接受正負號與前後空白"""
+        result = apply_episode_offsets([" 07", "+3", "-3", "07 ", " 07.5"], 5)
+
+        assert result == ["012", "08", "02", "012", "012.5"]
+
+    def test_zero_offset_returns_copy(self):
+        values = ["01", "02"]
+
+        result = apply_episode_offsets(values, 0)
+
+        assert result == values
+        assert result is not values
+
+    def test_per_range_offsets(self):
+        """測試第 1～12 集不變、第 13 集起減 12"""
+        rule = EpisodeOffset("episode", (OffsetRange(0, 1, 12), OffsetRange(-12, 13)))
+
+        result = apply_episode_offsets(["01", "12", "13", "24.5"], rule)
+
+        assert result == ["01", "12", "01", "12.5"]
+
+    def test_value_outside_ranges_unchanged(self):
+        rule = EpisodeOffset("episode", (OffsetRange(5, 10, 20),))
+
+        assert apply_episode_offsets(["09", "10", "21"], rule) == ["09", "15", "21"]
+
+    def test_single_value_accepts_rule(self):
+        rule = EpisodeOffset("episode", (OffsetRange(-12, 13),))
+
+        assert apply_episode_offset("14", rule) == "02"
+
+
+class TestRenameMultipleOffsets:
+    """測試 Rename 同時偏移多個分組與依範圍偏移"""
+
+    OFFSETS = (
+        EpisodeOffset.constant("season", 1),
+        EpisodeOffset("episode", (OffsetRange(0, 1, 12), OffsetRange(-12, 13))),
+    )
+
+    def test_parse_multiple_groups(self):
+        rename = Rename(
+            filepath="",
+            src="S{season}E{episode}.mp4",
+            dst="S{season}E{episode}.mp4",
+            rule="parse",
+            episode_offsets=self.OFFSETS,
+        )
+
+        assert rename.render("S01E14.mp4") == "S02E02.mp4"
+        assert rename.render("S01E03.mp4") == "S02E03.mp4"
+
+    def test_parse_groups_many_typed_and_untyped(self):
+        rename = Rename(
+            filepath="",
+            src="{title}",
+            dst="{title}",
+            rule="parse",
+            episode_offsets=self.OFFSETS,
+        )
+
+        rows = rename.offset_parse_groups_many(
+            [{"season": 1, "episode": 13}, {"season": "01", "episode": "05"}, {"title": "x"}]
+        )
+
+        assert rows == [
+            {"season": 2, "episode": 1},
+            {"season": "02", "episode": "05"},
+            {"title": "x"},
+        ]
+
+    def test_regex_replacements_batch(self):
+        rename = Rename(
+            filepath="",
+            src=r"S(?P<season>\d+)E(?P<episode>\d+)",
+            dst=r"S\g<season>E\g<episode>",
+            rule="regex",
+            episode_offsets=self.OFFSETS,
+        )
+
+        replacements = rename.offset_regex_replacements(
+            [{"season": "01", "episode": "13"}, None]
+        )
+
+        assert replacements == ["S02E01", r"S\g<season>E\g<episode>"]
+
+    def test_explicit_offsets_override_task_fields(self):
+        rename = Rename(
+            filepath="",
+            src="{episode}.mp4",
+            dst="{episode}.mp4",
+            rule="parse",
+            episode_offset_enabled=True,
+            episode_offset_group="episode",
+            episode_offset_value=12,
+            episode_offsets=(),
+        )
+
+        assert rename.should_apply_offset() is False
+        assert rename.render("01.mp4") == "01.mp4"
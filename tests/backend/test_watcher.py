@@ -0,0 +1,166 @@
+"""
+來源目錄監看器單元測試
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from backend.worker.watcher import DirectoryWatcher, _Inotify, _StabilityTracker
+
+
+def _inotify_available() -> bool:
+    try:
+        _Inotify().close()
+        return True
+    except (OSError, AttributeError):
+        return False
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def collected():
+    paths: list[str] = []
+    lock = threading.Lock()
+
+    def on_ready(path: str) -> None:
+        with lock:
+            paths.append(path)
+
+    return paths, on_ready
+
+
+class TestStabilityTracker:
+    """測試 _StabilityTracker 的大小穩定判斷"""
+
+    def test_stable_after_settle(self, tmp_path):
+        path = tmp_path / "a.mkv"
+        path.write_text("abc")
+        tracker = _StabilityTracker(settle=1)
+
+        tracker.observe(str(path), now=0)
+
+        assert tracker.pop_stable(now=0.5) == []
+        assert tracker.pop_stable(now=1.5) == [str(path)]
+        assert len(tracker) == 0
+
+    def test_growing_file_not_ready(self, tmp_path):
+        path = tmp_path / "a.mkv"
+        path.write_text("abc")
+        tracker = _StabilityTracker(settle=1)
+        tracker.observe(str(path), now=0)
+
+        path.write_text("abcdef")
+
+        assert tracker.pop_stable(now=1.5) == []
+        assert tracker.pop_stable(now=3) == [str(path)]
+
+    def test_temp_suffix_ignored(self, tmp_path):
+        path = tmp_path / "a.mkv.!qB"
+        path.write_text("abc")
+        tracker = _StabilityTracker(settle=0)
+
+        tracker.observe(str(path), now=0)
+
+        assert len(tracker) == 0
+
+    def test_removed_file_dropped(self, tmp_path):
+        path = tmp_path / "a.mkv"
+        path.write_text("abc")
+        tracker = _StabilityTracker(settle=0)
+        tracker.observe(str(path), now=0)
+
+        path.unlink()
+
+        assert tracker.pop_stable(now=1) == []
+        assert len(tracker) == 0
+
+
+class TestPollingWatcher:
+    """測試輪詢模式"""
+
+    def test_new_file_detected(self, tmp_path, collected):
+        paths, on_ready = collected
+        (tmp_path / "existing.mkv").write_text("old")
+        watcher = DirectoryWatcher(
+            [str(tmp_path)], on_ready, mode="polling", settle=0.1, poll_interval=0.1
+        )
+        watcher.start()
+        try:
+            time.sleep(0.3)
+            new_file = tmp_path / "sub" / "new.mkv"
+            new_file.parent.mkdir()
+            new_file.write_text("new")
+
+            assert _wait_for(lambda: str(new_file) in paths)
+            assert str(tmp_path / "existing.mkv") not in paths
+            assert watcher.active_mode == "polling"
+        finally:
+            watcher.stop()
+
+
+@pytest.mark.skipif(not _inotify_available(), reason="inotify 不可用")
+class TestInotifyWatcher:
+    """測試 inotify 模式"""
+
+    def test_close_write_detected(self, tmp_path, collected):
+        paths, on_ready = collected
+        watcher = DirectoryWatcher([str(tmp_path)], on_ready, mode="inotify", settle=0.1)
+        watcher.start()
+        try:
+            assert _wait_for(lambda: watcher.watch_count == 1)
+            new_file = tmp_path / "new.mkv"
+            new_file.write_text("new")
+
+            assert _wait_for(lambda: paths == [str(new_file)])
+        finally:
+            watcher.stop()
+
+    def test_moved_in_directory_detected(self, tmp_path, collected):
+        paths, on_ready = collected
+        root = tmp_path / "root"
+        root.mkdir()
+        staging = tmp_path / "staging" / "Show"
+        staging.mkdir(parents=True)
+        (staging / "ep01.mkv").write_text("1")
+        watcher = DirectoryWatcher([str(root)], on_ready, mode="inotify", settle=0.1)
+        watcher.start()
+        try:
+            assert _wait_for(lambda: watcher.watch_count == 1)
+            os.rename(staging, root / "Show")
+
+            assert _wait_for(lambda: paths == [str(root / "Show" / "ep01.mkv")])
+        finally:
+            watcher.stop()
+
+    def test_watch_budget_overflow_falls_back_to_polling(self, tmp_path, collected):
+        paths, on_ready = collected
+        for name in ("a", "b", "c"):
+            (tmp_path / name).mkdir()
+        watcher = DirectoryWatcher(
+            [str(tmp_path)], on_ready, mode="inotify", settle=0.1,
+            poll_interval=0.1, max_watches=2,
+        )
+        watcher.start()
+        try:
+            assert _wait_for(lambda: watcher.watch_count == 2)
+            assert len(watcher.polled_directories) == 2
+            polled = sorted(watcher.polled_directories)[0]
+            new_file = os.path.join(polled, "new.mkv")
+            time.sleep(0.3)
+            with open(new_file, "w") as f:
+                f.write("new")
+
+            assert _wait_for(lambda: new_file in paths)
+        finally:
+            watcher.stop()
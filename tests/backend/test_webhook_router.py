@@ -102,6 +102,23 @@ class TestDownloaderOnComplete:
 
             assert response.status_code == 200
 
+    def test_on_complete_forwards_category_and_tags(self, client):
+        """測試類別與標籤會一併交給 Worker 作為路由條件"""
+        payload = {
+            "filepath": "/downloads/routing.mp4",
+            "category": "anime",
+            "tags": "1080p,webrip",
+        }
+
+        with patch("backend.routers.webhook.download_queue") as mock_queue:
+            response = client.post("/webhook/on-complete", json=payload)
+
+        assert response.status_code == 200
+        mock_queue.submit.assert_called_once()
+        args, kwargs = mock_queue.submit.call_args
+        assert args[1] == "/downloads/routing.mp4"
+        assert kwargs == {"category": "anime", "tags": "1080p,webrip"}
+
     @patch("backend.routers.webhook.process_completed_download")
     def test_on_complete_background_task(self, mock_process, client):
         """測試背景任務被正確加入"""
@@ -121,3 +138,24 @@ class TestDownloaderOnComplete:
         )
 
         assert response.status_code == 422
+
+
+class TestWebhookDeduplication:
+    """測試重複 Webhook 事件不會再次排入佇列"""
+
+    @patch("backend.routers.webhook.download_queue")
+    def test_duplicate_event_not_enqueued(self, mock_queue, client, tmp_path):
+        from backend.worker.dedup import WebhookDeduplicator
+
+        media_file = tmp_path / "test.mp4"
+        media_file.write_text("x")
+        with patch("backend.routers.webhook.webhook_deduplicator", WebhookDeduplicator()):
+            first = client.post("/webhook/on-complete", json={"filepath": str(media_file)})
+            submitted = mock_queue.submit.call_count
+            second = client.post("/webhook/on-complete", json={"filepath": str(media_file)})
+            status = client.get("/webhook/status")
+
+        assert first.json()["duplicate"] is False
+        assert second.json()["duplicate"] is True
+        assert mock_queue.submit.call_count == submitted
+        assert status.json()["deduplicated"] == 1
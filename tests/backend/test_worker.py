@@ -5,10 +5,21 @@ Worker 單元測試
 import pytest
 from unittest.mock import patch, MagicMock
 
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend import schemas
+from backend.database import Base
 from backend.exceptions.worker_exception import MoveOperationError, RenameOperationError
+from backend.utils.env_config import get_task_match_mode
+from backend.utils.metrics import DB_POOL_WAIT
+from backend.utils.safe_regex import RegexTimeoutError
+from backend.worker import matcher as matcher_module
+from backend.worker.matcher import TaskMatcher
 from backend.worker.worker import (
     WorkerServices,
     create_worker_services,
+    worker_session,
     is_path_within_allowed,
     web_logger,
     match_task,
@@ -36,18 +47,51 @@ class TestWorkerServices:
     """測試 Worker 服務管理"""
 
     def test_create_worker_services(self):
-        """測試工廠函式建立服務"""
-        with patch("backend.worker.worker.SessionLocal") as mock_session:
-            with patch("backend.worker.worker.TaskRepository"):
-                with patch("backend.worker.worker.LogRepository"):
-                    with patch("backend.worker.worker.SettingRepository"):
-                        with patch("backend.worker.worker.TaskService"):
-                            with patch("backend.worker.worker.LogService"):
-                                with patch("backend.worker.worker.SettingService"):
-                                    services = create_worker_services()
-                                    assert services.task_service is not None
-                                    assert services.log_service is not None
-                                    assert services.setting_service is not None
+        """測試工廠函式以傳入的 session 建立服務"""
+        db = MagicMock()
+
+        services = create_worker_services(db)
+
+        assert services.task_service.repository.db is db
+        assert services.log_service.repository.db is db
+        assert services.setting_service.repository.db is db
+        assert services.trace_service.repository.db is db
+
+    def test_worker_session_commits_and_closes(self):
+        """測試工作 session 結束時提交並關閉"""
+        with patch("backend.worker.worker.SessionLocal") as factory:
+            with worker_session() as db:
+                assert db is factory.return_value
+
+        factory.assert_called_once_with(expire_on_commit=False)
+        db.commit.assert_called_once()
+        db.close.assert_called_once()
+
+    def test_worker_session_rolls_back_on_error(self):
+        """測試工作拋出例外時回滾並仍然關閉"""
+        with patch("backend.worker.worker.SessionLocal") as factory:
+            with pytest.raises(RuntimeError):
+                with worker_session():
+                    raise RuntimeError("boom")
+
+        db = factory.return_value
+        db.rollback.assert_called_once()
+        db.commit.assert_not_called()
+        db.close.assert_called_once()
+
+    def test_jobs_return_connections_to_pool(self, tmp_path):
+        """測試未傳入服務的工作結束後連線皆歸還連線池"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'worker.db'}")
+        Base.metadata.create_all(bind=engine)
+        before = DB_POOL_WAIT.count()
+
+        with patch("backend.worker.worker.SessionLocal", sessionmaker(bind=engine)):
+            for index in range(20):
+                process_completed_download(f"/downloads/{index}.mp4")
+
+        assert engine.pool.checkedout() == 0
+        assert DB_POOL_WAIT.count() - before == 20
+        engine.dispose()
 
     def test_no_global_state(self):
         """確認模組中不存在 global 變數宣告"""
@@ -110,16 +154,18 @@ class TestMatchTask:
         task1.id = "task-1"
         task1.name = "動畫任務"
         task1.include = "動畫名稱"
+        task1.priority = 0
 
         task2 = MagicMock()
         task2.id = "task-2"
         task2.name = "電影任務"
         task2.include = "電影名稱"
+        task2.priority = 0
 
         tasks = [task1, task2]
         filepath = "/downloads/動畫名稱 - 01.mp4"
 
-        result = match_task(mock_services, tasks, filepath)
+        result = match_task(mock_services, TaskMatcher(tasks), filepath)
 
         assert result == task1
         mock_services.log_service.create_log.assert_called_once()
@@ -132,7 +178,7 @@ class TestMatchTask:
         tasks = [task1]
         filepath = "/downloads/不相關的檔案.mp4"
 
-        result = match_task(mock_services, tasks, filepath)
+        result = match_task(mock_services, TaskMatcher(tasks), filepath)
 
         assert result is None
         mock_services.log_service.create_log.assert_not_called()
@@ -143,19 +189,38 @@ class TestMatchTask:
         task1.id = "task-1"
         task1.name = "任務1"
         task1.include = "關鍵字"
+        task1.priority = 0
 
         task2 = MagicMock()
         task2.id = "task-2"
         task2.name = "任務2"
         task2.include = "關鍵字"
+        task2.priority = 0
 
         tasks = [task1, task2]
         filepath = "/downloads/關鍵字檔案.mp4"
 
-        result = match_task(mock_services, tasks, filepath)
+        result = match_task(mock_services, TaskMatcher(tasks), filepath)
 
         assert result == task1
 
+    def test_match_task_regex_timeout(self, mock_services):
+        """測試 regex include 比對逾時時視為無匹配"""
+        task1 = MagicMock()
+        task1.name = "惡意任務"
+        task1.include = r"(a+)+$"
+        task1.include_type = "regex"
+        task1.priority = 0
+
+        with patch(
+            "backend.worker.matcher.safe_search_first",
+            side_effect=RegexTimeoutError(1.0),
+        ):
+            result = match_task(mock_services, TaskMatcher([task1]), "/downloads/" + "a" * 30 + "!")
+
+        assert result is None
+        mock_services.log_service.create_log.assert_not_called()
+
 
 class TestPerformRenameOperation:
     """測試 perform_rename_operation 函數"""
@@ -286,11 +351,27 @@ class TestProcessCompletedDownload:
         result = process_completed_download("/etc/passwd", services=mock_services)
 
         assert result is None
-        mock_services.task_service.get_enabled_tasks.assert_not_called()
+        mock_services.task_service.get_task_matcher.assert_not_called()
         mock_match_task.assert_not_called()
         mock_rename.assert_not_called()
         mock_move.assert_not_called()
 
+    @patch("backend.worker.worker.perform_move_operation")
+    @patch("backend.worker.worker.perform_rename_operation")
+    @patch("backend.worker.worker.match_task")
+    def test_process_completed_download_skips_file_already_in_move_to(
+        self, mock_match_task, mock_rename, mock_move, mock_services,
+    ):
+        """測試檔案已位於任務目標目錄時不重複處理"""
+        task = MagicMock()
+        task.move_to = "/media/anime"
+        mock_match_task.return_value = task
+
+        process_completed_download("/media/anime/test.mp4", services=mock_services)
+
+        mock_rename.assert_not_called()
+        mock_move.assert_not_called()
+
     @patch("backend.worker.worker.perform_move_operation")
     @patch("backend.worker.worker.perform_rename_operation")
     @patch("backend.worker.worker.match_task")
@@ -299,12 +380,12 @@ class TestProcessCompletedDownload:
     ):
         """測試來源路徑在白名單內時正常處理"""
         mock_services.setting_service.get_allowed_source_directories.return_value = ["/downloads"]
-        mock_services.task_service.get_enabled_tasks.return_value = []
+        mock_services.task_service.get_task_matcher.return_value = TaskMatcher([])
         mock_match_task.return_value = None
 
         process_completed_download("/downloads/test.mp4", services=mock_services)
 
-        mock_services.task_service.get_enabled_tasks.assert_called_once()
+        mock_services.task_service.get_task_matcher.assert_called_once()
 
     @patch("backend.worker.worker.perform_move_operation")
     @patch("backend.worker.worker.perform_rename_operation")
@@ -314,12 +395,12 @@ class TestProcessCompletedDownload:
     ):
         """測試白名單為空時允許所有路徑（向後相容）"""
         mock_services.setting_service.get_allowed_source_directories.return_value = []
-        mock_services.task_service.get_enabled_tasks.return_value = []
+        mock_services.task_service.get_task_matcher.return_value = TaskMatcher([])
         mock_match_task.return_value = None
 
         process_completed_download("/any/path/test.mp4", services=mock_services)
 
-        mock_services.task_service.get_enabled_tasks.assert_called_once()
+        mock_services.task_service.get_task_matcher.assert_called_once()
 
     @patch("backend.worker.worker.perform_move_operation")
     @patch("backend.worker.worker.perform_rename_operation")
@@ -328,7 +409,7 @@ class TestProcessCompletedDownload:
         self, mock_match_task, mock_rename, mock_move, mock_services,
     ):
         """測試沒有匹配的任務"""
-        mock_services.task_service.get_enabled_tasks.return_value = []
+        mock_services.task_service.get_task_matcher.return_value = TaskMatcher([])
         mock_match_task.return_value = None
 
         result = process_completed_download("/downloads/test.mp4", services=mock_services)
@@ -337,6 +418,25 @@ class TestProcessCompletedDownload:
         mock_rename.assert_not_called()
         mock_move.assert_not_called()
 
+    @patch("backend.worker.worker.perform_move_operation")
+    @patch("backend.worker.worker.perform_rename_operation")
+    @patch("backend.worker.worker.match_task")
+    def test_process_completed_download_passes_category_and_tags(
+        self, mock_match_task, mock_rename, mock_move, mock_services,
+    ):
+        """測試下載器的類別與標籤會傳給任務比對"""
+        matcher = TaskMatcher([])
+        mock_services.task_service.get_task_matcher.return_value = matcher
+        mock_match_task.return_value = None
+
+        process_completed_download(
+            "/downloads/test.mp4", services=mock_services, category="anime", tags="1080p"
+        )
+
+        mock_match_task.assert_called_once_with(
+            mock_services, matcher, "/downloads/test.mp4", "anime", "1080p"
+        )
+
     @patch("backend.worker.worker.perform_move_operation")
     @patch("backend.worker.worker.perform_rename_operation")
     @patch("backend.worker.worker.match_task")
@@ -348,7 +448,7 @@ class TestProcessCompletedDownload:
         mock_task.include = "關鍵字"
         mock_task.move_to = "/target"
 
-        mock_services.task_service.get_enabled_tasks.return_value = [mock_task]
+        mock_services.task_service.get_task_matcher.return_value = TaskMatcher([])
         mock_match_task.return_value = mock_task
         mock_rename.return_value = "/downloads/renamed.mp4"
 
@@ -368,7 +468,7 @@ class TestProcessCompletedDownload:
         mock_task.include = "關鍵字"
         mock_task.rename_rule = None
 
-        mock_services.task_service.get_enabled_tasks.return_value = [mock_task]
+        mock_services.task_service.get_task_matcher.return_value = TaskMatcher([])
         mock_match_task.return_value = mock_task
         mock_rename.return_value = "/downloads/關鍵字檔案.mp4"
 
@@ -386,7 +486,7 @@ class TestProcessCompletedDownload:
         mock_task = MagicMock()
         mock_task.include = "關鍵字"
 
-        mock_services.task_service.get_enabled_tasks.return_value = [mock_task]
+        mock_services.task_service.get_task_matcher.return_value = TaskMatcher([])
         mock_match_task.return_value = mock_task
         mock_rename.side_effect = RenameOperationError("/downloads/test.mp4", "錯誤")
 
@@ -405,7 +505,7 @@ class TestProcessCompletedDownload:
         mock_task.include = "關鍵字"
         mock_task.move_to = "/target"
 
-        mock_services.task_service.get_enabled_tasks.return_value = [mock_task]
+        mock_services.task_service.get_task_matcher.return_value = TaskMatcher([])
         mock_match_task.return_value = mock_task
         mock_rename.return_value = "/downloads/renamed.mp4"
         mock_move.side_effect = MoveOperationError(
@@ -416,3 +516,65 @@ class TestProcessCompletedDownload:
 
         mock_rename.assert_called_once()
         mock_move.assert_called_once()
+
+
+class TestMatcherReuse:
+    """測試連續的工作沿用快取的任務比對器"""
+
+    @pytest.fixture
+    def services(self, task_service):
+        setting_service = MagicMock()
+        setting_service.get_allowed_source_directories.return_value = []
+        return WorkerServices(
+            task_service=task_service,
+            log_service=MagicMock(),
+            setting_service=setting_service,
+        )
+
+    def test_category_index_reused_across_jobs(self, services, task_service):
+        """測試類別索引與路由後的候選任務在兩次工作之間共用"""
+        task_service.create_task(
+            schemas.TaskCreate(
+                name="動畫", include="動畫", move_to="/media/anime", match_categories="anime"
+            )
+        )
+
+        process_completed_download("/downloads/other.mp4", services=services, category="anime")
+        matcher = task_service.get_task_matcher(get_task_match_mode())
+        assert matcher._routed.cache_info().currsize == 1
+
+        with patch.object(matcher_module, "_TaskSet", wraps=matcher_module._TaskSet) as task_set:
+            process_completed_download(
+                "/downloads/other 2.mp4", services=services, category="anime"
+            )
+
+        task_set.assert_not_called()
+        assert task_service.get_task_matcher(get_task_match_mode()) is matcher
+        assert matcher._routed.cache_info().hits == 1
+
+    def test_includes_compiled_once_per_task_change(self, services, task_service):
+        """測試 include 只在任務變更後重新編譯"""
+        task = task_service.create_task(
+            schemas.TaskCreate(
+                name="動畫", include=r"動畫 - \d+", include_type="regex", move_to="/media/anime"
+            )
+        )
+
+        with patch.object(
+            matcher_module, "compile_include", wraps=matcher_module.compile_include
+        ) as compile_include:
+            process_completed_download("/downloads/other.mp4", services=services)
+            process_completed_download("/downloads/other 2.mp4", services=services)
+            assert compile_include.call_count == 1
+
+            task_service.update_task(
+                task.id,
+                schemas.TaskUpdate(
+                    name="動畫", include=r"動畫 S\d+", include_type="regex", move_to="/media/anime"
+                ),
+            )
+            process_completed_download("/downloads/other 3.mp4", services=services)
+
+        assert compile_include.call_count == 2
+        assert compile_include.call_args.args == ("regex", r"動畫 S\d+")
+